@@ -1,9 +1,11 @@
-from typing import Optional, Union
+from typing import Any, Optional, Union, overload
 
 from fractions import Fraction
+from math import lcm
 
 from musurgia.musurgia_exceptions import DAndSError
 from musurgia.musurgia_types import check_type
+from musurgia.numpy_utils import import_numpy
 
 
 class ArithmeticProgression:
@@ -127,6 +129,20 @@ class ArithmeticProgression:
             "s": self._s,
         }
 
+    def _get_terms(self, indices: range) -> list[Fraction]:
+        # (a1 + index * d) * correction_factor with a1 and d brought to a common denominator, so that each term
+        # needs only one integer multiplication and one Fraction construction.
+        factor = self.get_correction_factor()
+        a1 = self._to_fraction(self.a1 * factor)
+        d = self._to_fraction(self.d * factor)
+        denominator = lcm(a1.denominator, d.denominator)
+        a1_numerator = a1.numerator * (denominator // a1.denominator)
+        d_numerator = d.numerator * (denominator // d.denominator)
+        return [
+            Fraction(a1_numerator + index * d_numerator, denominator)
+            for index in indices
+        ]
+
     def _to_fraction(self, value: Union[int, float, Fraction]) -> Fraction:
         if not isinstance(value, Fraction):
             value = Fraction(value)
@@ -393,10 +409,102 @@ class ArithmeticProgression:
         """
         return {"a1": self.a1, "an": self.an, "n": self.n, "d": self.d, "s": self.s}
 
+    def get_terms(self, start: int = 0, stop: Optional[int] = None) -> list[Fraction]:
+        """
+        Stateless alternative to iterating over the progression. Each term is calculated directly as
+        ``(a1 + index * d) * correction_factor``. ``start`` and ``stop`` are interpreted like slice indices.
+
+        >>> arith = ArithmeticProgression(a1=1, d=2, n=5)
+        >>> arith.get_terms()
+        [Fraction(1, 1), Fraction(3, 1), Fraction(5, 1), Fraction(7, 1), Fraction(9, 1)]
+        >>> arith.get_terms(2, 4)
+        [Fraction(5, 1), Fraction(7, 1)]
+        >>> arith.get_terms(start=-2)
+        [Fraction(7, 1), Fraction(9, 1)]
+
+        >>> arith = ArithmeticProgression(a1= 3, an=6, s=21, correct_s=True)
+        >>> arith.get_terms() == list(arith)
+        True
+        """
+        self._check_args()
+        return self._get_terms(range(self.n)[start:stop])
+
+    def to_array(
+        self, dtype: Any = float, start: int = 0, stop: Optional[int] = None
+    ) -> Any:
+        """
+        Returns terms as a numpy array (numpy must be installed). With ``dtype=object`` the exact
+        :obj:`~fractions.Fraction` terms are returned, otherwise the terms are calculated vectorized in floating point
+        and cast to ``dtype``. An integer ``dtype`` is only possible if all terms are integers.
+
+        >>> arith = ArithmeticProgression(a1=1, d=Fraction(1, 2), n=4)
+        >>> arith.to_array().tolist()
+        [1.0, 1.5, 2.0, 2.5]
+        >>> arith.to_array(dtype=object, start=2).tolist()
+        [Fraction(2, 1), Fraction(5, 2)]
+        >>> ArithmeticProgression(a1=1, d=2, n=3).to_array(dtype=int).tolist()
+        [1, 3, 5]
+        >>> arith.to_array(dtype=int)
+        Traceback (most recent call last):
+            ...
+        ValueError: ArithmeticProgression.to_array: terms are not integers and cannot be converted to an integer dtype
+        """
+        np = import_numpy(f"{self.__class__.__name__}.to_array")
+        if np.dtype(dtype) == np.dtype(object):
+            return np.array(self.get_terms(start, stop), dtype=object)
+        self._check_args()
+        indices = range(self.n)[start:stop]
+        index_array = np.arange(
+            indices.start, indices.stop, indices.step, dtype=np.float64
+        )
+        terms = (float(self.a1) + index_array * float(self.d)) * float(
+            self.get_correction_factor()
+        )
+        if np.dtype(dtype).kind in "iu":
+            rounded_terms = np.round(terms)
+            if not np.allclose(terms, rounded_terms, rtol=0):
+                raise ValueError(
+                    f"{self.__class__.__name__}.to_array: terms are not integers and cannot be converted to an integer "
+                    "dtype"
+                )
+            terms = rounded_terms
+        return terms.astype(dtype)
+
     def reset_iterator(self) -> None:
         del self._current
         del self._index
 
+    @overload
+    def __getitem__(self, index: int) -> Fraction: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Fraction]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Fraction, list[Fraction]]:
+        """
+        Random access to terms without changing the state of the iterator.
+
+        >>> arith = ArithmeticProgression(a1=7, an=15, n=3)
+        >>> arith[1]
+        Fraction(11, 1)
+        >>> arith[-1]
+        Fraction(15, 1)
+        >>> arith[::2]
+        [Fraction(7, 1), Fraction(15, 1)]
+        >>> arith[3]
+        Traceback (most recent call last):
+            ...
+        IndexError: ArithmeticProgression index out of range
+        """
+        self._check_args()
+        if isinstance(index, slice):
+            return self._get_terms(range(self.n)[index])
+        try:
+            position = range(self.n)[index]
+        except IndexError as err:
+            raise IndexError(f"{self.__class__.__name__} index out of range") from err
+        return self._get_terms(range(position, position + 1))[0]
+
     def __iter__(self) -> "ArithmeticProgression":
         return self
 
@@ -1,20 +1,26 @@
 from abc import ABC, ABCMeta, abstractmethod
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from musicscore.chord import Chord
 
 
 class ChordFactoryType(ABCMeta):
     def __new__(mcls, name, bases, namespace, /, **kwargs):  # type: ignore
-        chord_update_methods = {
-            k for k in namespace.keys() if k.startswith("update_chord_")
-        }
-
+        # update methods are ordered: inherited methods first (in order of bases), then the new ones in order of
+        # definition.
+        chord_update_methods = []
         for base in bases:
-            base_methods = getattr(base, "_CHORD_UPDATE_METHODS", set())  # type: ignore
-            chord_update_methods.update(base_methods)
+            for method_name in getattr(base, "_CHORD_UPDATE_METHODS", ()):
+                if method_name not in chord_update_methods:
+                    chord_update_methods.append(method_name)
+        for method_name in namespace.keys():
+            if (
+                method_name.startswith("update_chord_")
+                and method_name not in chord_update_methods
+            ):
+                chord_update_methods.append(method_name)
 
-        namespace["_CHORD_UPDATE_METHODS"] = chord_update_methods
+        namespace["_CHORD_UPDATE_METHODS"] = tuple(chord_update_methods)
         return super().__new__(mcls, name, bases, namespace, **kwargs)
 
 
@@ -23,6 +29,9 @@ class AbstractChordFactory(ABC, metaclass=ChordFactoryType):
         for method_name in self._CHORD_UPDATE_METHODS:  # type: ignore
             getattr(self, method_name)()
 
+    def _create_initial_chord(self) -> Chord:
+        return Chord(60, 1)
+
     @property
     def chord(self) -> None:
         raise AttributeError("Use get_chord() instead.")
@@ -40,6 +49,25 @@ class AbstractChordFactory(ABC, metaclass=ChordFactoryType):
         pass
 
     def create_chord(self) -> "Chord":
-        self._chord = Chord(60, 1)
+        self._chord = self._create_initial_chord()
         self._update_chord()
         return self._chord
+
+
+def iterate_chords(
+    chord_factories: Iterable[AbstractChordFactory],
+) -> Iterator[Chord]:
+    """
+    Creates the chords of many chord factories (for example of all nodes of a tree layer) one after another with
+    :obj:`AbstractChordFactory.create_chord`.
+    """
+    for chord_factory in chord_factories:
+        yield chord_factory.create_chord()
+
+
+def create_chords(chord_factories: Iterable[AbstractChordFactory]) -> list[Chord]:
+    """
+    Creates the chords of many chord factories (for example of all nodes of a tree layer) in one pass. The result is
+    the same as calling :obj:`AbstractChordFactory.create_chord` of each factory.
+    """
+    return list(iterate_chords(chord_factories))
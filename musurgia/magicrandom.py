@@ -1,12 +1,71 @@
+from array import array
+from collections import deque
+from copy import copy
+from hashlib import sha256
+import random
 from typing import Optional, Any, Iterator, Union, TypeVar
 
-from musurgia.musurgia_types import NonNegativeInteger, check_type
+from musurgia.musurgia_types import NonNegativeInteger, PositiveInteger, check_type
 
 __all__ = ["MagicRandom"]
 
 T = TypeVar("T", bound="MagicRandom")
 
 
+_ARRAY_TYPES: dict[str, type] = {"q": int, "d": float}
+
+
+def _get_array_typecode(elements: list[Any]) -> Optional[str]:
+    for typecode, array_type in _ARRAY_TYPES.items():
+        if elements and all(type(element) is array_type for element in elements):
+            return typecode
+    return None
+
+
+class _ElementHistory:
+    """
+    Storage of chosen elements. ``size=None`` keeps all elements, a positive ``size`` keeps only the last ``size``
+    elements in a ring buffer and ``size=0`` keeps none. If a ``typecode`` is given, elements are stored in a compact
+    :obj:`array.array` as long as they fit into it.
+    """
+
+    def __init__(self, size: Optional[int] = None, typecode: Optional[str] = None):
+        self._size = size
+        self._typecode = typecode
+        self._elements: Union[list[Any], array[Any]] = (
+            [] if typecode is None else array(typecode)
+        )
+        self._next_index = 0
+
+    def _convert_to_list(self) -> None:
+        self._elements = self.to_list()
+        self._typecode = None
+        self._next_index = 0
+
+    def append(self, element: Any) -> None:
+        if self._size == 0:
+            return
+        if (
+            self._typecode is not None
+            and type(element) is not _ARRAY_TYPES[self._typecode]
+        ):
+            self._convert_to_list()
+        try:
+            if self._size is None or len(self._elements) < self._size:
+                self._elements.append(element)
+            else:
+                self._elements[self._next_index] = element
+                self._next_index = (self._next_index + 1) % self._size
+        except OverflowError:
+            self._convert_to_list()
+            self.append(element)
+
+    def to_list(self) -> list[Any]:
+        return list(self._elements[self._next_index :]) + list(
+            self._elements[: self._next_index]
+        )
+
+
 class MagicRandom:
     """
     .. code-block:: python
@@ -17,46 +76,124 @@ class MagicRandom:
     called a 'pool' which does not contain any duplicates. The property 'periodicity' defines the minimum number of
     other values which must be given out before a value can appear again.
 
+    Each instance owns its private random stream (see :obj:`current_random`). Instances with the same seed generate
+    the same series independently of each other.
+
     >>> first = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
     >>> second = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
     >>> [first.__next__() for _ in range(20)]
-    [3, 2, 1, 5, 3, 1, 4, 3, 2, 4, 5, 3, 2, 4, 1, 5, 4, 1, 3, 5]
+    [3, 2, 4, 3, 1, 5, 3, 2, 1, 4, 3, 5, 1, 4, 2, 5, 4, 1, 2, 3]
     >>> [second.__next__() for _ in range(20)]
-    [3, 1, 2, 3, 5, 1, 2, 3, 5, 1, 2, 3, 5, 4, 3, 2, 5, 4, 3, 1]
+    [3, 2, 4, 3, 1, 5, 3, 2, 1, 4, 3, 5, 1, 4, 2, 5, 4, 1, 2, 3]
     >>> second.periodicity = 1
     >>> [second.__next__() for _ in range(20)]
-    [3, 5, 4, 2, 3, 1, 5, 1, 5, 3, 4, 3, 1, 2, 1, 2, 4, 5, 1, 3]
+    [2, 4, 3, 2, 3, 1, 3, 1, 2, 5, 1, 3, 2, 5, 3, 1, 4, 3, 1, 4]
     >>> second.periodicity = 0
     >>> [second.__next__() for _ in range(20)]
-    [1, 4, 5, 2, 1, 1, 5, 1, 1, 2, 2, 1, 2, 1, 1, 3, 3, 5, 5, 1]
+    [3, 5, 1, 1, 2, 3, 3, 5, 3, 1, 1, 5, 2, 2, 3, 2, 5, 4, 3, 2]
 
     """
 
-    import random
-
-    current_random = random
-
     def __init__(
         self,
         pool: list[Any],
         periodicity: Optional[NonNegativeInteger] = None,
         forbidden_list: Optional[list[Any]] = None,
         seed: Optional[Union[int, str, bytes, bytearray]] = None,
+        history_size: Optional[NonNegativeInteger] = None,
         *args: Any,
         **kwargs: Any,
     ):
         super().__init__(*args, **kwargs)
         self._pool: list[Any] = []
         self._periodicity: Optional[NonNegativeInteger] = None
-        self._forbidden_list: list[Any] = []
+        self._forbidden_list: deque[Any] = deque()
         self._seed: Optional[Union[int, str, bytes, bytearray]] = None
         self._counter = 0
-        self._previous_elements: list[Any] = []
+        self._history_size: Optional[NonNegativeInteger] = None
+        self._history: _ElementHistory = _ElementHistory()
+        self._element_counts: dict[Any, int] = {}
+        self._random: random.Random = random.Random()
+        self._entropy: Optional[int] = None
+        self._number_of_spawned_children = 0
+        self._allowed_elements: list[Any] = []
+        self._allowed_positions: dict[Any, int] = {}
+        self._forbidden_counts: dict[Any, int] = {}
+        self._pool_set: set[Any] = set()
+        self._sampler_periodicity: NonNegativeInteger = 0
+        self._sampler_is_valid = False
 
         self.pool = pool
         self.periodicity = periodicity  # type: ignore
         self.forbidden_list = forbidden_list if forbidden_list is not None else []
         self.seed = seed
+        self.history_size = history_size
+
+    # private methods
+    def _allow(self, element: Any) -> None:
+        count = self._forbidden_counts[element] - 1
+        if count:
+            self._forbidden_counts[element] = count
+        else:
+            del self._forbidden_counts[element]
+            if element in self._pool_set:
+                self._allowed_positions[element] = len(self._allowed_elements)
+                self._allowed_elements.append(element)
+
+    def _draw(self) -> Any:
+        if not self._sampler_is_valid:
+            self._update_sampler()
+        allowed_elements = self._allowed_elements
+        index = self._random.randrange(len(allowed_elements))
+        element = allowed_elements[index]
+        if self._sampler_periodicity != 0:
+            self._forbid(element, index)
+        self._counter += 1
+        self._element_counts[element] = self._element_counts.get(element, 0) + 1
+        self._history.append(element)
+        return element
+
+    def _forbid(self, element: Any, index: int) -> None:
+        # remove element from allowed elements in O(1) by moving the last allowed element to its place
+        last_element = self._allowed_elements.pop()
+        del self._allowed_positions[element]
+        if index < len(self._allowed_elements):
+            self._allowed_elements[index] = last_element
+            self._allowed_positions[last_element] = index
+        if len(self._forbidden_list) >= self._sampler_periodicity:
+            self._allow(self._forbidden_list.popleft())
+        self._forbidden_list.append(element)
+        self._forbidden_counts[element] = self._forbidden_counts.get(element, 0) + 1
+
+    def _update_sampler(self) -> None:
+        periodicity = self.periodicity
+        if periodicity != 0 and len(self._forbidden_list) > periodicity:
+            self._forbidden_list = deque(list(self._forbidden_list)[-periodicity:])
+        self._pool_set = set(self._pool)
+        self._forbidden_counts = {}
+        if periodicity != 0:
+            for element in self._forbidden_list:
+                self._forbidden_counts[element] = (
+                    self._forbidden_counts.get(element, 0) + 1
+                )
+        self._allowed_elements = [
+            element for element in self._pool if element not in self._forbidden_counts
+        ]
+        self._allowed_positions = {
+            element: index for index, element in enumerate(self._allowed_elements)
+        }
+        self._sampler_periodicity = periodicity
+        self._sampler_is_valid = True
+
+    def _get_child_seed(self, child_index: int) -> int:
+        if self.seed is None:
+            if self._entropy is None:
+                self._entropy = random.SystemRandom().getrandbits(128)
+            parent_seed: Any = self._entropy
+        else:
+            parent_seed = self.seed
+        digest = sha256(repr((parent_seed, child_index)).encode()).digest()
+        return int.from_bytes(digest[:16], "big")
 
     # properties
     @property
@@ -81,44 +218,59 @@ class MagicRandom:
         return self._counter
 
     @property
-    def forbidden_list(self) -> list[Any]:
+    def current_random(self) -> random.Random:
+        """
+        Private :obj:`random.Random` instance of this MagicRandom. It is seeded by :obj:`seed` and not shared with
+        other instances or with python's global random functions.
+
+        >>> r = MagicRandom(pool=[1, 2, 3], seed=10)
+        >>> isinstance(r.current_random, random.Random)
+        True
+        >>> r.current_random is MagicRandom(pool=[1, 2, 3], seed=10).current_random
+        False
+        """
+        return self._random
+
+    @property
+    def forbidden_list(self) -> tuple[Any, ...]:
         """
         Set and get ``forbidden_list`` property which is used internally to keep trace of previous elements and has
         maximum length of :obj:`periodicity`. All elements in this list are forbidden to be chosen from. After
         randomly choose a permitted element, this will be added to the forbidden list and the first element of this
-        list will be removed. This is a naive mechanism which guaranties the appropriate distance between two
-        appearances of an element according for :obj:`periodicity`
+        list will be removed. This mechanism guaranties the appropriate distance between two appearances of an element
+        according for :obj:`periodicity`. Internally the permitted elements are kept apart, so that an element can be
+        chosen directly without retrying.
 
         The ``forbidden_list`` can also be set manually. In this case if its length is larger than
         :obj:`periodicity`, :obj:`permutation_order_iterator` will remove so many elements from the beginning of this list until the
-        right length is achieved.
+        right length is achieved. The getter returns a tuple, a new ``forbidden_list`` must be set as a list.
 
         >>> r = MagicRandom(pool=[1, 3, 2, 4, 5, 6], periodicity=4, seed=20, forbidden_list=[2, 3, 1])
         >>> previous_forbidden_list = r.forbidden_list[:]
         >>> el1 = next(r)
         >>> el1 not in previous_forbidden_list
         True
-        >>> r.forbidden_list == [2, 3, 1] + [el1]
+        >>> r.forbidden_list == (2, 3, 1, el1)
         True
         >>> previous_forbidden_list = r.forbidden_list[:]
         >>> el2 = next(r)
         >>> el2 not in previous_forbidden_list
         True
-        >>> r.forbidden_list == [3, 1] + [el1, el2]
+        >>> r.forbidden_list == (3, 1, el1, el2)
         True
         >>> previous_forbidden_list = r.forbidden_list[:]
         >>> el3 = next(r)
         >>> el3 not in previous_forbidden_list
         True
-        >>> r.forbidden_list == [1] + [el1, el2, el3]
+        >>> r.forbidden_list == (1, el1, el2, el3)
         True
         """
-        return self._forbidden_list
+        return tuple(self._forbidden_list)
 
     @forbidden_list.setter
     def forbidden_list(self, values: Optional[list[Any]]) -> None:
         if not values:
-            self._forbidden_list = []
+            self._forbidden_list = deque()
         else:
             check_type(
                 t=list,
@@ -126,7 +278,51 @@ class MagicRandom:
                 class_name=self.__class__.__name__,
                 property_name="forbidden_list",
             )
-            self._forbidden_list = values
+            self._forbidden_list = deque(values)
+        self._sampler_is_valid = False
+
+    @property
+    def history_size(self) -> Optional[NonNegativeInteger]:
+        """
+        Set and get ``history_size`` property which defines how many chosen values are kept for
+        :obj:`get_previous_elements`. If set to ``None`` (default) all values are kept. If set to a positive integer only
+        the last ``history_size`` values are kept. If set to ``0`` no values are kept and only :obj:`counter` and
+        :obj:`get_element_counts` are updated. Setting this property keeps as many of the already stored values as
+        possible.
+
+        If all elements of :obj:`pool` are integers or all are floats, values are stored in a compact array.
+
+        >>> r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20, history_size=3)
+        >>> r.take(10)
+        [3, 2, 4, 3, 1, 5, 3, 2, 1, 4]
+        >>> r.get_previous_elements()
+        [2, 1, 4]
+        >>> r.history_size = 2
+        >>> r.get_previous_elements()
+        [1, 4]
+        """
+        return self._history_size
+
+    @history_size.setter
+    def history_size(self, value: Optional[NonNegativeInteger]) -> None:
+        if value is not None:
+            check_type(
+                t="NonNegativeInteger",
+                v=value,
+                property_name="history_size",
+                class_name=self.__class__.__name__,
+            )
+        previous_elements = self._history.to_list()
+        if value is not None:
+            previous_elements = previous_elements[
+                max(len(previous_elements) - value, 0) :
+            ]
+        self._history_size = value
+        self._history = _ElementHistory(
+            size=value, typecode=_get_array_typecode(self._pool)
+        )
+        for element in previous_elements:
+            self._history.append(element)
 
     @property
     def periodicity(self) -> NonNegativeInteger:
@@ -148,10 +344,10 @@ class MagicRandom:
         3
         """
         if self._periodicity is None:
-            output = len(self.pool) - 2
+            output = len(self._pool) - 2
             return max(output, 0)
-        elif self._periodicity >= len(self.pool):
-            return len(self.pool) - 1
+        elif self._periodicity >= len(self._pool):
+            return len(self._pool) - 1
         else:
             return self._periodicity
 
@@ -167,17 +363,25 @@ class MagicRandom:
                 class_name=self.__class__.__name__,
             )
             self._periodicity = value
+        self._sampler_is_valid = False
 
     @property
     def pool(self) -> list[Any]:
         """
         Set and get ``pool`` property. This property defines the list of possible elements to be randomly chosen from.
-        Duplicates will be omitted without chaining the order of each element's first appearances.
+        Duplicates will be omitted without chaining the order of each element's first appearances. The returned list
+        can be changed in place, the permitted elements are updated before the next value is chosen.
         :return: ``None`` or ``list``
 
         >>> MagicRandom(pool=[1, 2, 3, 2, 1]).pool
         [1, 2, 3]
+        >>> r = MagicRandom(pool=[1], seed=20)
+        >>> r.pool.append(2)
+        >>> sorted(set(r.take(10)))
+        [1, 2]
         """
+        # the caller can change the list in place
+        self._sampler_is_valid = False
         return self._pool
 
     @pool.setter
@@ -186,11 +390,13 @@ class MagicRandom:
             v=values, t=list, property_name="pool", class_name=self.__class__.__name__
         )
         self._pool = list(dict.fromkeys(values))
+        self._sampler_is_valid = False
 
     @property
     def seed(self) -> Optional[Union[int, str, bytes, bytearray]]:
         """
-        Set and get ``seed.a`` value of python random function which is used to randomly choose an element.
+        Set and get ``seed.a`` value of :obj:`current_random` which is used to randomly choose an element. Setting the
+        seed only affects this instance.
 
         .. seealso:: https://docs.python.org/3/library/random.html#random.seed
 
@@ -206,58 +412,119 @@ class MagicRandom:
     @seed.setter
     def seed(self, value: Optional[Union[int, str, bytes, bytearray]]) -> None:
         self._seed = value
-        self.current_random.seed(value)
+        self._random.seed(value)
 
     # methods
+    def spawn(self: T, number_of_children: PositiveInteger = 1) -> list[T]:
+        """
+        Creates independent copies of this MagicRandom with the same :obj:`pool` and :obj:`periodicity`, each with its
+        own random stream. Child seeds are derived from :obj:`seed` and the number of children spawned so far, so a
+        seeded MagicRandom always spawns the same children. Children can be handed over to worker threads or processes
+        to generate reproducible series in parallel.
+
+        :param number_of_children: number of children to be spawned
+        :return: list of new instances
+
+        >>> r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        >>> first, second = r.spawn(2)
+        >>> first.seed == MagicRandom(pool=[1], seed=20).spawn(1)[0].seed
+        True
+        >>> first.seed == second.seed
+        False
+        >>> same_as_first = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=first.seed)
+        >>> [next(first) for _ in range(10)] == [next(same_as_first) for _ in range(10)]
+        True
+        """
+        check_type(
+            v=number_of_children,
+            t="PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="spawn",
+            argument_name="number_of_children",
+        )
+        children = []
+        for _ in range(number_of_children):
+            child = copy(self)
+            child._pool = self._pool[:]
+            child._forbidden_list = deque()
+            child._sampler_is_valid = False
+            child._counter = 0
+            child._element_counts = {}
+            child._history = _ElementHistory(
+                size=self._history_size, typecode=_get_array_typecode(self._pool)
+            )
+            child._random = random.Random()
+            child._entropy = None
+            child._number_of_spawned_children = 0
+            child.seed = self._get_child_seed(self._number_of_spawned_children)
+            self._number_of_spawned_children += 1
+            children.append(child)
+        return children
+
     def get_previous_elements(self) -> list[Any]:
         """
-        :return: list of all randomly chosen values
+        :return: list of randomly chosen values. Depending on :obj:`history_size` all or only the last values.
 
         >>> r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
         >>> [r.__next__() for _ in range(20)]
-        [3, 2, 1, 5, 3, 1, 4, 3, 2, 4, 5, 3, 2, 4, 1, 5, 4, 1, 3, 5]
+        [3, 2, 4, 3, 1, 5, 3, 2, 1, 4, 3, 5, 1, 4, 2, 5, 4, 1, 2, 3]
         >>> r.get_previous_elements()
-        [3, 2, 1, 5, 3, 1, 4, 3, 2, 4, 5, 3, 2, 4, 1, 5, 4, 1, 3, 5]
+        [3, 2, 4, 3, 1, 5, 3, 2, 1, 4, 3, 5, 1, 4, 2, 5, 4, 1, 2, 3]
         """
-        return self._previous_elements
+        return self._history.to_list()
+
+    def get_element_counts(self) -> dict[Any, int]:
+        """
+        :return: dictionary of chosen values and the number of their appearances. It is independent of
+                 :obj:`history_size`.
+
+        >>> r = MagicRandom(pool=['a', 'b', 'c'], periodicity=1, seed=20, history_size=0)
+        >>> r.take(6)
+        ['c', 'a', 'c', 'b', 'c', 'a']
+        >>> r.get_previous_elements()
+        []
+        >>> r.get_element_counts()
+        {'c': 3, 'a': 2, 'b': 1}
+        """
+        return dict(self._element_counts)
+
+    def take(self, number_of_elements: NonNegativeInteger) -> list[Any]:
+        """
+        :param number_of_elements: number of elements to be chosen
+        :return: list of the next ``number_of_elements`` randomly chosen values
+
+        >>> r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        >>> r.take(5) + r.take(5) == MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20).take(10)
+        True
+        >>> r.counter
+        10
+        """
+        check_type(
+            v=number_of_elements,
+            t="NonNegativeInteger",
+            class_name=self.__class__.__name__,
+            method_name="take",
+            argument_name="number_of_elements",
+        )
+        # subclasses can convert the chosen values in __next__ (e.g. RandomMidiGenerator)
+        next_ = self.__next__
+        return [next_() for _ in range(number_of_elements)]
 
     def __iter__(self) -> Iterator[Any]:
         """
-        The core methode of MagicRandom. This is a generator to generate random values. :obj:`__next__` method calls :obj:`__iter__().__next__()`.
+        The core methode of MagicRandom. This is a generator to generate random values.
+
+        Each value is chosen directly out of the currently permitted elements (elements of :obj:`pool` which are not
+        in :obj:`forbidden_list`), so that the cost of choosing a value does not depend on :obj:`periodicity` or the
+        size of :obj:`pool`.
 
         :return: a random value out of :obj:`pool` considering :obj:`seed`, :obj:`periodicity` and :obj:`forbidden_list`
         """
         while True:
-
-            def check(element: Any) -> bool:
-                def forbid_element(el: Any) -> None:
-                    if len(self.forbidden_list) >= self.periodicity:
-                        self.forbidden_list.pop(0)
-                    self.forbidden_list.append(el)
-
-                if self.periodicity != 0:
-                    if element in self.forbidden_list:
-                        return False
-                    else:
-                        forbid_element(element)
-                        return True
-                else:
-                    return True
-
-            if len(self.forbidden_list) > self.periodicity:
-                self.forbidden_list = self.forbidden_list[(-1 * self.periodicity) :]
-
-            random_element = self.pool[self.current_random.randrange(len(self.pool))]
-            while check(random_element) is False:
-                random_element = self.pool[
-                    self.current_random.randrange(len(self.pool))
-                ]
-            self._counter += 1
-            self._previous_elements.append(random_element)
-            yield random_element
+            yield self._draw()
 
     def __next__(self) -> Any:
         """
-        :return: self.__iter__().__next__()`
+        :return: next random value (see :obj:`__iter__`)
         """
-        return self.__iter__().__next__()
+        return self._draw()
@@ -1,7 +1,9 @@
+from functools import lru_cache
 from typing import Optional, Any, TypeVar
 
 from musurgia.musurgia_exceptions import (
     MatrixIsEmptyError,
+    MatrixIndexOutOfRangeError,
     SquareMatrixDataError,
     PermutationOrderMatrixDataError,
     MatrixIndexEndOfMatrixError,
@@ -21,6 +23,7 @@ from musurgia.musurgia_types import (
     MatrixTransposeMode,
     MatrixReadingDirection,
 )
+from musurgia.numpy_utils import import_numpy, is_ndarray
 from musurgia.permutation.limited_permutation import LimitedPermutationOrders
 
 
@@ -58,6 +61,21 @@ class SimpleMatrix:
         )
         self._matrix_data = val
 
+    def _get_transposed_matrix_data(self, mode: MatrixTransposeMode) -> MatrixData:
+        # transpositions are calculated with direct index arithmetic. They are not cached, since rows of matrix_data
+        # can be changed in place.
+        rows = self.matrix_data
+        if mode == "regular":
+            return [list(column) for column in zip(*rows)]
+        number_of_columns = self.get_row_size()
+        return [
+            [
+                row[(row_index + column_index) % number_of_columns]
+                for row_index, row in enumerate(rows)
+            ]
+            for column_index in range(number_of_columns)
+        ]
+
     def get_row_size(self) -> NonNegativeInteger:
         try:
             return len(self.matrix_data[0])
@@ -97,7 +115,7 @@ class SimpleMatrix:
             raise ValueError(
                 f"{self.__class__.__name__}:get_column:column_number must be less than or equal to {self.get_row_size()}"
             )
-        return self.get_transposed_matrix().matrix_data[column_number - 1]
+        return [row[column_number - 1] for row in self.matrix_data]
 
     def get_element(self, element_index: MatrixIndex) -> Any:
         if self.is_empty:
@@ -126,23 +144,7 @@ class SimpleMatrix:
             method_name="get_transposed_matrix",
             argument_name="mode",
         )
-        controller = MatrixIndexController(
-            number_of_rows=matrix.get_column_size(),
-            number_of_columns=matrix.get_row_size(),
-        )
-        if mode == "regular":
-            controller.reading_direction = "vertical"
-        elif mode == "diagonal":
-            controller.reading_direction = "diagonal"
-        matrix_data = []
-        for c in range(controller.number_of_columns):
-            matrix_data.append(
-                [
-                    matrix.get_element(next(controller))
-                    for _ in range(controller.number_of_rows)
-                ]
-            )
-        return matrix.__class__(matrix_data=matrix_data)
+        return matrix.__class__(matrix_data=matrix._get_transposed_matrix_data(mode))
 
 
 class Matrix(SimpleMatrix):
@@ -179,6 +181,230 @@ class Matrix(SimpleMatrix):
         return self.matrix_data.pop(row_number - 1)
 
 
+class ArrayMatrix(Matrix):
+    """
+    Matrix stored in a two dimensional numpy array (numpy must be installed), meant for large numeric matrices.
+
+    :obj:`matrix_data` is the array itself. It can be set with a list of lists or a two dimensional array. Rows and
+    columns are returned as views into the array without copying, transpositions are calculated in vectorized form
+    and :obj:`get_elements` reads many elements at once. Use :obj:`from_matrix` and :obj:`to_matrix` to convert
+    from and to list based matrices.
+
+    >>> matrix = ArrayMatrix([[1, 2, 3], [4, 5, 6]])
+    >>> matrix.get_column(2)
+    array([2, 5])
+    >>> matrix.get_transposed_matrix(mode="diagonal").matrix_data
+    array([[1, 5],
+           [2, 6],
+           [3, 4]])
+    >>> matrix.to_matrix().matrix_data
+    [[1, 2, 3], [4, 5, 6]]
+    """
+
+    T = TypeVar("T", bound="ArrayMatrix")
+
+    def __init__(
+        self,
+        matrix_data: Optional[Any] = None,
+        dtype: Any = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self._np = import_numpy(self.__class__.__name__)
+        self._dtype = dtype
+        super().__init__(matrix_data, *args, **kwargs)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.get_column_size() == 0
+
+    @property
+    def matrix_data(self) -> Any:
+        return self._matrix_data
+
+    @matrix_data.setter
+    def matrix_data(self, val: Any) -> None:
+        if not is_ndarray(val):
+            check_type(
+                val,
+                "MatrixData",
+                class_name=self.__class__.__name__,
+                property_name="matrix_data",
+            )
+            if not val:
+                val = self._np.empty((0, 0), dtype=self._dtype)
+        array = self._np.asarray(val, dtype=self._dtype)
+        if array.ndim != 2:
+            raise TypeError(
+                f"{self.__class__.__name__}.matrix_data must be two dimensional, got {array.ndim} dimensions"
+            )
+        self._matrix_data = array
+
+    @property
+    def dtype(self) -> Any:
+        """
+        :return: numpy dtype of the matrix
+        """
+        return self.matrix_data.dtype
+
+    @classmethod
+    def from_matrix(cls: type["T"], matrix: SimpleMatrix, dtype: Any = None) -> "T":
+        """
+        :param matrix: list based matrix
+        :param dtype: optional numpy dtype
+        :return: new ArrayMatrix with the data of matrix
+        """
+        return cls(matrix_data=matrix.matrix_data, dtype=dtype)
+
+    def to_matrix(self) -> Matrix:
+        """
+        :return: list based :obj:`Matrix` with a copy of matrix data converted to python objects
+        """
+        return Matrix(matrix_data=self.matrix_data.tolist())
+
+    def get_row_size(self) -> NonNegativeInteger:
+        return int(self.matrix_data.shape[1])
+
+    def get_column_size(self) -> NonNegativeInteger:
+        return int(self.matrix_data.shape[0])
+
+    def get_row(self, row_number: PositiveInteger) -> Any:
+        """
+        :return: view of the row
+        """
+        return super().get_row(row_number)
+
+    def get_column(self, column_number: PositiveInteger) -> Any:
+        """
+        :return: view of the column
+        """
+        check_type(
+            v=column_number,
+            t="PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="get_column",
+            argument_name="column_number",
+        )
+        if self.is_empty:
+            raise MatrixIsEmptyError()
+        if column_number > self.get_row_size():
+            raise ValueError(
+                f"{self.__class__.__name__}:get_column:column_number must be less than or equal to {self.get_row_size()}"
+            )
+        return self.matrix_data[:, column_number - 1]
+
+    def get_element(self, element_index: MatrixIndex) -> Any:
+        if self.is_empty:
+            raise MatrixIsEmptyError()
+        check_type(
+            v=element_index,
+            t="MatrixIndex",
+            class_name=self.__class__.__name__,
+            method_name="get_element",
+            argument_name="element_index",
+        )
+        check_matrix_index_values(
+            element_index,
+            number_of_rows=self.get_column_size(),
+            number_of_columns=self.get_row_size(),
+        )
+        return self.matrix_data[element_index[0] - 1, element_index[1] - 1]
+
+    def get_elements(self, element_indices: Any) -> Any:
+        """
+        Reads many elements at once.
+
+        :param element_indices: sequence of :obj:`~musurgia.musurgia_types.MatrixIndex` or an integer array of shape
+                                (n, 2). Indices start with 1 like in :obj:`get_element`.
+        :return: array of elements
+
+        >>> ArrayMatrix([[1, 2, 3], [4, 5, 6]]).get_elements([(1, 1), (2, 3), (2, 1)])
+        array([1, 6, 4])
+        """
+        if self.is_empty:
+            raise MatrixIsEmptyError()
+        indices = self._np.asarray(element_indices, dtype=self._np.int64).reshape(-1, 2)
+        if (indices < 1).any():
+            raise ValueError(
+                f"{self.__class__.__name__}:get_elements:indices must be positive"
+            )
+        if (indices[:, 0] > self.get_column_size()).any() or (
+            indices[:, 1] > self.get_row_size()
+        ).any():
+            raise MatrixIndexOutOfRangeError(
+                f"{self.__class__.__name__}:get_elements:indices out of range"
+            )
+        return self.matrix_data[indices[:, 0] - 1, indices[:, 1] - 1]
+
+    def get_transposed_matrix(
+        matrix: "T", mode: MatrixTransposeMode = "regular"
+    ) -> "T":
+        """
+        Regular transposition returns a view of the same data. Diagonal transposition returns a new array.
+        """
+        check_type(
+            v=mode,
+            t="MatrixTransposeMode",
+            class_name="MatrixTransposition",
+            method_name="get_transposed_matrix",
+            argument_name="mode",
+        )
+        np = matrix._np
+        if mode == "regular":
+            transposed_matrix_data = matrix.matrix_data.T
+        else:
+            number_of_rows = matrix.get_column_size()
+            number_of_columns = matrix.get_row_size()
+            row_indices = np.arange(number_of_rows)
+            column_indices = (
+                row_indices[np.newaxis, :] + np.arange(number_of_columns)[:, np.newaxis]
+            ) % max(number_of_columns, 1)
+            transposed_matrix_data = matrix.matrix_data[
+                row_indices[np.newaxis, :], column_indices
+            ]
+        return matrix.__class__(matrix_data=transposed_matrix_data)
+
+    def add_row(self, row: Any) -> None:
+        if not is_ndarray(row):
+            check_type(
+                v=row,
+                t=list,
+                class_name=self.__class__.__name__,
+                method_name="add_row",
+                argument_name="row",
+            )
+        row = self._np.asarray(row, dtype=self._dtype)
+        if self.is_empty:
+            self._matrix_data = row.reshape(1, -1)
+            return
+        if row.shape != (self.get_row_size(),):
+            raise ValueError(
+                f"{self.__class__.__name__}:add_row:row must be of size ({self.get_row_size()})"
+            )
+        self._matrix_data = self._np.vstack((self.matrix_data, row))
+
+    def remove_row(self, row_number: NonNegativeInteger) -> Any:
+        """
+        :return: removed row
+        """
+        if self.is_empty:
+            raise MatrixIsEmptyError()
+        check_type(
+            v=row_number,
+            t="PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="remove_row",
+            argument_name="row_number",
+        )
+        if row_number > self.get_column_size():
+            raise ValueError(
+                f"{self.__class__.__name__}:remove_row:row_number must be less than or equal to {self.get_column_size()}"
+            )
+        row = self.matrix_data[row_number - 1].copy()
+        self._matrix_data = self._np.delete(self.matrix_data, row_number - 1, axis=0)
+        return row
+
+
 class SquareMatrix(SimpleMatrix):
     T = TypeVar("T", bound="SimpleMatrix")
 
@@ -209,7 +435,17 @@ class PermutationOrderMatrixGenerator:
     def main_permutation_order(self, value: PermutationOrder) -> None:
         self._lp.main_permutation_order = value
 
-    def generate_permutation_order_matrix(self) -> "PermutationOrderMatrix":
+    def generate_permutation_order_matrix(
+        self, lazy: bool = False
+    ) -> "PermutationOrderMatrix":
+        """
+        :param lazy: If ``True`` a :obj:`LazyPermutationOrderMatrix` is returned which calculates only the elements
+                     which are needed.
+        """
+        if lazy:
+            return LazyPermutationOrderMatrix(
+                main_permutation_order=self.main_permutation_order
+            )
         return PermutationOrderMatrix(matrix_data=self._lp.get_permutation_orders())
 
 
@@ -261,6 +497,160 @@ class PermutationOrderMatrix(SquareMatrix):
         return True
 
 
+class LazyPermutationOrderMatrix(PermutationOrderMatrix):
+    """
+    LazyPermutationOrderMatrix represents the same matrix as :obj:`PermutationOrderMatrix` generated by
+    :obj:`PermutationOrderMatrixGenerator` without calculating all n² permutation orders in advance. Each element is
+    calculated on demand from the main permutation order and kept in a least recently used cache of size
+    ``cache_size`` (``None``: unlimited).
+
+    Element (r, c) is the main permutation order p applied e times to itself, e being the r-1 times permuted column
+    number c: p^(p^(r-1)(c)).
+
+    >>> lpom = LazyPermutationOrderMatrix(main_permutation_order=(3, 1, 4, 2))
+    >>> lpom.get_size()
+    4
+    >>> lpom.get_element((2, 4))
+    (4, 3, 2, 1)
+    >>> lpom.get_row(2)
+    [(2, 4, 1, 3), (3, 1, 4, 2), (1, 2, 3, 4), (4, 3, 2, 1)]
+    >>> lpom.get_cache_info()
+    {'hits': 1, 'misses': 4, 'maxsize': 1024, 'currsize': 4, 'hit_rate': 0.2}
+    """
+
+    def __init__(
+        self,
+        main_permutation_order: PermutationOrder,
+        cache_size: Optional[NonNegativeInteger] = 1024,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        check_type(
+            main_permutation_order,
+            "PermutationOrder",
+            class_name=self.__class__.__name__,
+            method_name="__init__",
+            argument_name="main_permutation_order",
+        )
+        if cache_size is not None:
+            check_type(
+                cache_size,
+                "NonNegativeInteger",
+                class_name=self.__class__.__name__,
+                method_name="__init__",
+                argument_name="cache_size",
+            )
+        self._lp = LimitedPermutationOrders(main_permutation_order)
+        self._matrix_data = []
+        self._get_cached_element = lru_cache(maxsize=cache_size)(
+            self._calculate_element
+        )
+
+    def _calculate_element(
+        self, row_number: PositiveInteger, column_number: PositiveInteger
+    ) -> tuple[int, ...]:
+        return self._lp.get_permutation_order(row_number, column_number)
+
+    @property
+    def main_permutation_order(self) -> PermutationOrder:
+        return self._lp.main_permutation_order
+
+    @property
+    def is_empty(self) -> bool:
+        return False
+
+    @property  # type: ignore[misc]
+    def matrix_data(self) -> MatrixData:
+        # matrix_data is read only and is only materialized if it is requested.
+        if not self._matrix_data:
+            self._matrix_data = self._lp.get_permutation_orders()
+        return self._matrix_data
+
+    def get_row_size(self) -> NonNegativeInteger:
+        return len(self.main_permutation_order)
+
+    def get_column_size(self) -> NonNegativeInteger:
+        return len(self.main_permutation_order)
+
+    def get_row(self, row_number: PositiveInteger) -> list[Any]:
+        check_type(
+            v=row_number,
+            t="PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="get_row",
+            argument_name="row_number",
+        )
+        if row_number > self.get_column_size():
+            raise ValueError(
+                f"{self.__class__.__name__}:get_row:row_number must be less than or equal to {self.get_column_size()}"
+            )
+        return [
+            self._get_cached_element(row_number, c)
+            for c in range(1, self.get_row_size() + 1)
+        ]
+
+    def get_column(self, column_number: PositiveInteger) -> list[Any]:
+        check_type(
+            v=column_number,
+            t="PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="get_column",
+            argument_name="column_number",
+        )
+        if column_number > self.get_row_size():
+            raise ValueError(
+                f"{self.__class__.__name__}:get_column:column_number must be less than or equal to {self.get_row_size()}"
+            )
+        return [
+            self._get_cached_element(r, column_number)
+            for r in range(1, self.get_column_size() + 1)
+        ]
+
+    def get_element(self, element_index: MatrixIndex) -> Any:
+        check_type(
+            v=element_index,
+            t="MatrixIndex",
+            class_name=self.__class__.__name__,
+            method_name="get_element",
+            argument_name="element_index",
+        )
+        check_matrix_index_values(
+            element_index,
+            number_of_rows=self.get_column_size(),
+            number_of_columns=self.get_row_size(),
+        )
+        return self._get_cached_element(element_index[0], element_index[1])
+
+    def get_transposed_matrix(  # type: ignore[override]
+        matrix: "LazyPermutationOrderMatrix", mode: MatrixTransposeMode = "regular"
+    ) -> PermutationOrderMatrix:
+        check_type(
+            v=mode,
+            t="MatrixTransposeMode",
+            class_name="MatrixTransposition",
+            method_name="get_transposed_matrix",
+            argument_name="mode",
+        )
+        return PermutationOrderMatrix(
+            matrix_data=matrix._get_transposed_matrix_data(mode)
+        )
+
+    def get_cache_info(self) -> dict[str, Any]:
+        """
+        :return: statistics of the cache of calculated elements: hits, misses, maxsize, currsize and hit_rate (``None``
+                 if no element has been requested yet)
+        """
+        info = self._get_cached_element.cache_info()
+        number_of_calls = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "maxsize": info.maxsize,
+            "currsize": info.currsize,
+            "hit_rate": info.hits / number_of_calls if number_of_calls else None,
+        }
+
+
 class MatrixIndexController:
     def __init__(
         self,
@@ -419,6 +809,85 @@ class MatrixIndexController:
     def get_next_flatten_index(self) -> int:
         return self._flatten_index
 
+    def get_indices(self, count: Optional[NonNegativeInteger] = None) -> Any:
+        """
+        Bulk counterpart of ``next()`` (numpy must be installed): the next ``count`` indices (``None``: all indices up
+        to the end of matrix) are calculated in one vectorized step and the controller is moved forward accordingly.
+
+        :param count: number of indices
+        :return: integer numpy array of shape (count, 2) with (row, column) pairs starting with 1
+        :raise: :obj:`MatrixIndexEndOfMatrixError` if less than ``count`` indices are left. The controller is not moved.
+
+        >>> controller = MatrixIndexController(number_of_rows=2, number_of_columns=3, reading_direction="diagonal")
+        >>> controller.get_indices(4).tolist()
+        [[1, 1], [2, 2], [1, 2], [2, 3]]
+        >>> next(controller)
+        (1, 3)
+        """
+        np = import_numpy(f"{self.__class__.__name__}.get_indices")
+        number_of_indices = self.number_of_rows * self.number_of_columns
+        remaining = max(number_of_indices - self._flatten_index, 0)
+        if count is None:
+            count = remaining
+        else:
+            check_type(
+                count,
+                "NonNegativeInteger",
+                class_name=self.__class__.__name__,
+                method_name="get_indices",
+                argument_name="count",
+            )
+            if count > remaining:
+                raise MatrixIndexEndOfMatrixError
+        flatten_indices = np.arange(
+            self._flatten_index, self._flatten_index + count, dtype=np.int64
+        )
+        if self.reading_direction == "horizontal":
+            rows = flatten_indices // self.number_of_columns + 1
+            columns = flatten_indices % self.number_of_columns + 1
+        elif self.reading_direction == "vertical":
+            columns = flatten_indices // self.number_of_rows + 1
+            rows = flatten_indices % self.number_of_rows + 1
+        else:
+            rows = (flatten_indices + 1) % self.number_of_rows
+            rows[rows == 0] = self.number_of_rows
+            columns = (
+                rows + flatten_indices // self.number_of_rows
+            ) % self.number_of_columns
+            columns[columns == 0] = self.number_of_columns
+        self._flatten_index += count
+        return np.stack((rows, columns), axis=-1)
+
+    def read(
+        self, matrix: SimpleMatrix, count: Optional[NonNegativeInteger] = None
+    ) -> Any:
+        """
+        Reads the next ``count`` elements of matrix (see :obj:`get_indices`) without a python call per element.
+
+        :param matrix: matrix with ``number_of_rows`` rows and ``number_of_columns`` columns
+        :param count: number of elements
+        :return: numpy array for :obj:`ArrayMatrix`, otherwise list
+
+        >>> controller = MatrixIndexController(number_of_rows=2, number_of_columns=3, reading_direction="vertical")
+        >>> controller.read(Matrix([[1, 2, 3], [4, 5, 6]]))
+        [1, 4, 2, 5, 3, 6]
+        """
+        if (matrix.get_column_size(), matrix.get_row_size()) != (
+            self.number_of_rows,
+            self.number_of_columns,
+        ):
+            raise ValueError(
+                f"{self.__class__.__name__}:read:matrix must have {self.number_of_rows} rows and {self.number_of_columns} columns"
+            )
+        indices = self.get_indices(count) - 1
+        if isinstance(matrix, ArrayMatrix):
+            return matrix.matrix_data[indices[:, 0], indices[:, 1]]
+        matrix_data = matrix.matrix_data
+        return [
+            matrix_data[row][column]
+            for row, column in zip(indices[:, 0].tolist(), indices[:, 1].tolist())
+        ]
+
     def reset(self) -> None:
         try:
             self.first_index = self._first_index
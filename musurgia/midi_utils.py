@@ -0,0 +1,120 @@
+from pathlib import Path
+from typing import Union
+
+from musicscore.metronome import Metronome
+
+__all__ = [
+    "TICKS_PER_QUARTER",
+    "encode_variable_length_quantity",
+    "get_microseconds_per_quarter",
+    "MidiTrack",
+    "write_midi_file",
+]
+
+#: resolution of exported Standard MIDI Files
+TICKS_PER_QUARTER = 960
+
+
+def encode_variable_length_quantity(value: int) -> bytes:
+    """
+    >>> encode_variable_length_quantity(0)
+    b'\\x00'
+    >>> encode_variable_length_quantity(960).hex()
+    '8740'
+    """
+    output = [value & 0x7F]
+    value >>= 7
+    while value:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(output))
+
+
+def get_microseconds_per_quarter(metronome: Metronome) -> int:
+    """
+    :return: tempo of a metronome in microseconds per quarter note as used by the MIDI set tempo event
+
+    >>> get_microseconds_per_quarter(Metronome(60))
+    1000000
+    >>> get_microseconds_per_quarter(Metronome(60, 2))
+    500000
+    """
+    quarters_per_minute = metronome.per_minute * metronome.beat_unit.value
+    return min(max(round(60_000_000 / quarters_per_minute), 1), 0xFFFFFF)
+
+
+class MidiTrack:
+    """
+    Track of a Standard MIDI File. Events are encoded immediately and must be added in chronological order (ticks
+    are absolute).
+
+    >>> track = MidiTrack(channel=1)
+    >>> track.add_note_on(0, 60, 80)
+    >>> track.add_note_off(960, 60)
+    >>> track.to_bytes()[8:].hex()
+    '00913c508740813c0000ff2f00'
+    """
+
+    def __init__(self, channel: int = 0) -> None:
+        self._channel = channel
+        self._data = bytearray()
+        self._tick = 0
+
+    def _add_delta(self, tick: int) -> None:
+        delta = tick - self._tick
+        if delta < 0:
+            raise ValueError(
+                f"{self.__class__.__name__}: events must be added in chronological order: {tick} < {self._tick}"
+            )
+        if delta < 0x80:
+            self._data.append(delta)
+        else:
+            self._data += encode_variable_length_quantity(delta)
+        self._tick = tick
+
+    @property
+    def channel(self) -> int:
+        return self._channel
+
+    def add_note_on(self, tick: int, key: int, velocity: int) -> None:
+        self._add_delta(tick)
+        self._data += bytes((0x90 | self._channel, key, velocity))
+
+    def add_note_off(self, tick: int, key: int) -> None:
+        self._add_delta(tick)
+        self._data += bytes((0x80 | self._channel, key, 0))
+
+    def add_tempo(self, tick: int, microseconds_per_quarter: int) -> None:
+        self._add_delta(tick)
+        self._data += b"\xff\x51\x03" + microseconds_per_quarter.to_bytes(3, "big")
+
+    def add_track_name(self, tick: int, name: str) -> None:
+        text = name.encode("latin-1", "replace")
+        self._add_delta(tick)
+        self._data += b"\xff\x03" + encode_variable_length_quantity(len(text)) + text
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: MTrk chunk including end of track
+        """
+        data = self._data + b"\x00\xff\x2f\x00"
+        return b"MTrk" + len(data).to_bytes(4, "big") + bytes(data)
+
+
+def write_midi_file(
+    path: Union[str, Path],
+    tracks: list[MidiTrack],
+    ticks_per_quarter: int = TICKS_PER_QUARTER,
+) -> None:
+    """
+    Writes a Standard MIDI File of format 1.
+    """
+    with open(path, "wb") as f:
+        f.write(b"MThd" + (6).to_bytes(4, "big"))
+        f.write(
+            (1).to_bytes(2, "big")
+            + len(tracks).to_bytes(2, "big")
+            + ticks_per_quarter.to_bytes(2, "big")
+        )
+        for track in tracks:
+            f.write(track.to_bytes())
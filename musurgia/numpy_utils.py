@@ -0,0 +1,32 @@
+import sys
+from typing import Any
+
+__all__ = ["import_numpy", "is_ndarray"]
+
+
+def import_numpy(feature_name: str) -> Any:
+    """
+    NumPy is an optional dependency of musurgia. Array based features import it through this function.
+
+    :param feature_name: name of the feature which needs numpy. It is used in the error message.
+    :return: numpy module
+    :raise: ``ImportError`` if numpy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as err:
+        raise ImportError(
+            f"{feature_name} requires numpy. Install it with: pip install musurgia[numpy]"
+        ) from err
+    return numpy
+
+
+def is_ndarray(value: Any) -> bool:
+    """
+    Checks if value is a numpy array without importing numpy.
+
+    >>> is_ndarray([1, 2, 3])
+    False
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
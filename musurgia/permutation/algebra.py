@@ -0,0 +1,159 @@
+"""
+Permutation orders as algebraic objects. A permutation order p (a tuple of all integers between 1 and n) is regarded as
+the function which maps k to p[k - 1]. With this convention ``permute(list(first), second)`` is the composition
+``first(second(k))`` and :obj:`~musurgia.permutation.permutation.get_self_permutation_2d` consists of the powers
+p^1 to p^n.
+
+All calculations are based on the decomposition of the permutation order into disjoint cycles which makes powers
+(including negative ones) O(n) independent of the exponent.
+"""
+
+from math import lcm
+
+from musurgia.musurgia_types import PermutationOrder, check_type
+
+
+def _check_permutation_order(
+    permutation_order: PermutationOrder, function_name: str, argument_name: str
+) -> None:
+    check_type(
+        permutation_order,
+        "PermutationOrder",
+        function_name=function_name,
+        argument_name=argument_name,
+    )
+
+
+def _get_cycles(permutation_order: tuple[int, ...]) -> list[tuple[int, ...]]:
+    visited = [False] * len(permutation_order)
+    cycles = []
+    for start in range(1, len(permutation_order) + 1):
+        if visited[start - 1]:
+            continue
+        cycle = []
+        element = start
+        while not visited[element - 1]:
+            visited[element - 1] = True
+            cycle.append(element)
+            element = permutation_order[element - 1]
+        cycles.append(tuple(cycle))
+    return cycles
+
+
+def _get_power_of_cycles(
+    cycles: list[tuple[int, ...]], size: int, exponent: int
+) -> tuple[int, ...]:
+    output = [0] * size
+    for cycle in cycles:
+        cycle_length = len(cycle)
+        shift = exponent % cycle_length
+        for index, element in enumerate(cycle):
+            output[element - 1] = cycle[(index + shift) % cycle_length]
+    return tuple(output)
+
+
+def _get_period_of_cycles(cycles: list[tuple[int, ...]]) -> int:
+    return lcm(*(len(cycle) for cycle in cycles)) if cycles else 1
+
+
+def get_permutation_cycles(
+    permutation_order: PermutationOrder,
+) -> list[tuple[int, ...]]:
+    """
+    :return: disjoint cycles of ``permutation_order``. Each cycle starts with its smallest element and is followed by
+             its images. Fixed points are returned as cycles of length 1.
+
+    >>> get_permutation_cycles((3, 1, 4, 2))
+    [(1, 3, 4, 2)]
+    >>> get_permutation_cycles((2, 1, 4, 5, 3, 6))
+    [(1, 2), (3, 4, 5), (6,)]
+    """
+    _check_permutation_order(
+        permutation_order, "get_permutation_cycles", "permutation_order"
+    )
+    return _get_cycles(tuple(permutation_order))
+
+
+def get_permutation_period(permutation_order: PermutationOrder) -> int:
+    """
+    :return: order of the permutation in the group-theoretic sense: the smallest positive exponent which returns the
+             natural order, i.e. the least common multiple of all cycle lengths. Powers of the permutation order repeat
+             with this period.
+
+    >>> get_permutation_period((3, 1, 4, 2))
+    4
+    >>> get_permutation_period((2, 1, 4, 5, 3, 6))
+    6
+    >>> get_permutation_period((1, 2, 3))
+    1
+    """
+    _check_permutation_order(
+        permutation_order, "get_permutation_period", "permutation_order"
+    )
+    return _get_period_of_cycles(_get_cycles(tuple(permutation_order)))
+
+
+def get_permutation_power(
+    permutation_order: PermutationOrder, exponent: int
+) -> tuple[int, ...]:
+    """
+    Applies the `permutation_order` `exponent` times to itself. The result is equal to the element with index
+    `exponent - 1` of :obj:`~musurgia.permutation.permutation.get_self_permutation_2d` without calculating the preceding
+    ones.
+
+    :param permutation_order: A tuple consisting of all integers between 1 and a higher integer
+    :param exponent: An integer. 0 returns the natural order, negative exponents return powers of the inverse.
+
+    >>> get_permutation_power((3, 1, 4, 2), 2)
+    (4, 3, 2, 1)
+    >>> get_permutation_power((3, 1, 4, 2), 4)
+    (1, 2, 3, 4)
+    >>> get_permutation_power((3, 1, 4, 2), 0)
+    (1, 2, 3, 4)
+    >>> get_permutation_power((3, 1, 4, 2), -1)
+    (2, 4, 1, 3)
+    """
+    _check_permutation_order(
+        permutation_order, "get_permutation_power", "permutation_order"
+    )
+    check_type(
+        exponent, int, function_name="get_permutation_power", argument_name="exponent"
+    )
+    return _get_power_of_cycles(
+        _get_cycles(tuple(permutation_order)), len(permutation_order), exponent
+    )
+
+
+def compose_permutation_orders(
+    first: PermutationOrder, second: PermutationOrder
+) -> tuple[int, ...]:
+    """
+    :return: composition of two permutation orders of the same size: ``first`` applied after ``second``. The result is
+             equal to ``tuple(permute(list(first), second))``.
+
+    >>> compose_permutation_orders((3, 1, 4, 2), (2, 1, 4, 3))
+    (1, 3, 2, 4)
+    """
+    _check_permutation_order(first, "compose_permutation_orders", "first")
+    _check_permutation_order(second, "compose_permutation_orders", "second")
+    if len(first) != len(second):
+        raise ValueError(
+            f"compose_permutation_orders: first and second must have the same size: {len(first)} != {len(second)}"
+        )
+    return tuple(first[m - 1] for m in second)
+
+
+def invert_permutation_order(permutation_order: PermutationOrder) -> tuple[int, ...]:
+    """
+    :return: inverse permutation order. Composing it with ``permutation_order`` returns the natural order.
+
+    >>> invert_permutation_order((3, 1, 4, 2))
+    (2, 4, 1, 3)
+    """
+    _check_permutation_order(
+        permutation_order, "invert_permutation_order", "permutation_order"
+    )
+    output = [0] * len(permutation_order)
+    for index, element in enumerate(permutation_order, start=1):
+        output[element - 1] = index
+    return tuple(output)
@@ -0,0 +1,239 @@
+"""
+Enumeration of all permutation orders of a size n in lexicographic order. Each permutation order has a rank between 0
+and n! - 1 which makes it possible to iterate or search any part of the search space directly and to split it across
+worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from math import factorial
+from typing import Callable, Generator, Optional
+
+from musurgia.musurgia_types import (
+    PermutationOrder,
+    PositiveInteger,
+    NonNegativeInteger,
+    check_type,
+)
+from musurgia.permutation.algebra import _get_cycles
+from musurgia.permutation.limited_permutation import (
+    LimitedPermutationOrdersProperties,
+    _get_properties_of_cycles,
+)
+
+PropertiesCondition = Callable[[LimitedPermutationOrdersProperties], bool]
+
+
+def _check_rank_range(
+    size: int, start: int, stop: Optional[int], function_name: str
+) -> int:
+    check_type(
+        size, "PositiveInteger", function_name=function_name, argument_name="size"
+    )
+    check_type(
+        start, "NonNegativeInteger", function_name=function_name, argument_name="start"
+    )
+    number_of_permutation_orders = factorial(size)
+    if stop is None:
+        return number_of_permutation_orders
+    check_type(
+        stop, "NonNegativeInteger", function_name=function_name, argument_name="stop"
+    )
+    return min(stop, number_of_permutation_orders)
+
+
+def get_permutation_order_rank(permutation_order: PermutationOrder) -> int:
+    """
+    :return: lexicographic rank of ``permutation_order`` among all permutation orders of the same size (0-based)
+
+    >>> get_permutation_order_rank((1, 2, 3))
+    0
+    >>> get_permutation_order_rank((3, 1, 2))
+    4
+    """
+    check_type(
+        permutation_order,
+        "PermutationOrder",
+        function_name="get_permutation_order_rank",
+        argument_name="permutation_order",
+    )
+    size = len(permutation_order)
+    remaining = list(range(1, size + 1))
+    rank = 0
+    for index, element in enumerate(permutation_order):
+        position = remaining.index(element)
+        rank += position * factorial(size - index - 1)
+        del remaining[position]
+    return rank
+
+
+def get_permutation_order_by_rank(
+    size: PositiveInteger, rank: NonNegativeInteger
+) -> tuple[int, ...]:
+    """
+    :return: permutation order of size ``size`` with lexicographic rank ``rank``. Inverse of
+             :obj:`get_permutation_order_rank`.
+
+    >>> get_permutation_order_by_rank(3, 4)
+    (3, 1, 2)
+    >>> get_permutation_order_by_rank(4, 23)
+    (4, 3, 2, 1)
+    """
+    check_type(
+        size,
+        "PositiveInteger",
+        function_name="get_permutation_order_by_rank",
+        argument_name="size",
+    )
+    check_type(
+        rank,
+        "NonNegativeInteger",
+        function_name="get_permutation_order_by_rank",
+        argument_name="rank",
+    )
+    if rank >= factorial(size):
+        raise ValueError(
+            f"get_permutation_order_by_rank: rank must be less than {factorial(size)}, got {rank}"
+        )
+    remaining = list(range(1, size + 1))
+    output = []
+    for index in range(size - 1, -1, -1):
+        position, rank = divmod(rank, factorial(index))
+        output.append(remaining.pop(position))
+    return tuple(output)
+
+
+def _iterate_rank_range(
+    elements: list[int], start: int, stop: int, prefix: tuple[int, ...]
+) -> Generator[tuple[int, ...], None, None]:
+    # The ranks of all permutations with the same first element build a block of (n - 1)! ranks. Blocks which are
+    # completely inside the range are generated with itertools.permutations, the others are split recursively.
+    if not elements:
+        if start <= 0 < stop:
+            yield prefix
+        return
+    block_size = factorial(len(elements) - 1)
+    for index, element in enumerate(elements):
+        block_start = index * block_size
+        block_stop = block_start + block_size
+        if block_stop <= start:
+            continue
+        if block_start >= stop:
+            break
+        rest = elements[:index] + elements[index + 1 :]
+        if start <= block_start and block_stop <= stop:
+            first = prefix + (element,)
+            for permutation in permutations(rest):
+                yield first + permutation
+        else:
+            yield from _iterate_rank_range(
+                rest,
+                max(start - block_start, 0),
+                min(stop - block_start, block_size),
+                prefix + (element,),
+            )
+
+
+def iterate_permutation_orders(
+    size: PositiveInteger,
+    start: NonNegativeInteger = 0,
+    stop: Optional[NonNegativeInteger] = None,
+) -> Generator[tuple[int, ...], None, None]:
+    """
+    Iterates all permutation orders of ``size`` with ranks from ``start`` to ``stop`` (excluded) in lexicographic
+    order. Iteration starts directly at ``start`` without generating the preceding permutation orders.
+
+    >>> list(iterate_permutation_orders(3, start=2, stop=5))
+    [(2, 1, 3), (2, 3, 1), (3, 1, 2)]
+    """
+    stop = _check_rank_range(size, start, stop, "iterate_permutation_orders")
+    return _iterate_rank_range(list(range(1, size + 1)), start, stop, ())
+
+
+def iterate_limited_permutation_orders_properties(
+    size: PositiveInteger,
+    start: NonNegativeInteger = 0,
+    stop: Optional[NonNegativeInteger] = None,
+) -> Generator[LimitedPermutationOrdersProperties, None, None]:
+    """
+    Iterates :obj:`~musurgia.permutation.limited_permutation.LimitedPermutationOrdersProperties` of all main
+    permutation orders of ``size`` in lexicographic order. Properties are derived from cycle structures, no matrix is
+    calculated.
+
+    >>> [p.period for p in iterate_limited_permutation_orders_properties(3)]
+    [1, 2, 2, 3, 3, 2]
+    """
+    for permutation_order in iterate_permutation_orders(size, start, stop):
+        yield _get_properties_of_cycles(
+            permutation_order, _get_cycles(permutation_order)
+        )
+
+
+def _search_rank_range(
+    size: int, start: int, stop: int, condition: PropertiesCondition
+) -> list[tuple[int, ...]]:
+    return [
+        permutation_order
+        for permutation_order in _iterate_rank_range(
+            list(range(1, size + 1)), start, stop, ()
+        )
+        if condition(
+            _get_properties_of_cycles(permutation_order, _get_cycles(permutation_order))
+        )
+    ]
+
+
+def search_main_permutation_orders(
+    size: PositiveInteger,
+    condition: PropertiesCondition,
+    start: NonNegativeInteger = 0,
+    stop: Optional[NonNegativeInteger] = None,
+    max_workers: Optional[int] = None,
+    number_of_chunks: Optional[PositiveInteger] = None,
+) -> list[tuple[int, ...]]:
+    """
+    Searches all main permutation orders of ``size`` with ranks from ``start`` to ``stop`` (excluded) whose
+    :obj:`~musurgia.permutation.limited_permutation.LimitedPermutationOrdersProperties` fulfill ``condition``.
+
+    :param condition: function which gets the properties and returns a boolean. If ``max_workers`` is greater than 1 it
+                      must be picklable (e.g. a function defined at module level).
+    :param max_workers: if greater than 1 the rank range is split into ``number_of_chunks`` (default: 4 *
+                        ``max_workers``) consecutive chunks which are searched in a process pool.
+    :return: found permutation orders in lexicographic order
+
+    >>> search_main_permutation_orders(4, lambda properties: properties.period == 4)
+    [(2, 3, 4, 1), (2, 4, 1, 3), (3, 1, 4, 2), (3, 4, 2, 1), (4, 1, 2, 3), (4, 3, 1, 2)]
+    """
+    stop = _check_rank_range(size, start, stop, "search_main_permutation_orders")
+    if not callable(condition):
+        raise TypeError(
+            f"search_main_permutation_orders: condition must be callable, got {condition}"
+        )
+    if max_workers is None or max_workers <= 1 or stop - start <= 1:
+        return _search_rank_range(size, start, stop, condition)
+    if number_of_chunks is None:
+        number_of_chunks = 4 * max_workers
+    check_type(
+        number_of_chunks,
+        "PositiveInteger",
+        function_name="search_main_permutation_orders",
+        argument_name="number_of_chunks",
+    )
+    chunk_size = -(-(stop - start) // number_of_chunks)
+    chunk_starts = range(start, stop, chunk_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _search_rank_range,
+                size,
+                chunk_start,
+                min(chunk_start + chunk_size, stop),
+                condition,
+            )
+            for chunk_start in chunk_starts
+        ]
+        return [
+            permutation_order
+            for future in futures
+            for permutation_order in future.result()
+        ]
@@ -1,12 +1,83 @@
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional
 
-from musurgia.musurgia_types import PermutationOrder, check_type, MatrixData
+from musurgia.musurgia_types import (
+    PermutationOrder,
+    check_type,
+    MatrixData,
+    PositiveInteger,
+)
+from musurgia.permutation.algebra import (
+    _get_cycles,
+    _get_period_of_cycles,
+    _get_power_of_cycles,
+)
 from musurgia.permutation.permutation import get_self_permutation_3d
 
 
+@dataclass(frozen=True)
+class LimitedPermutationOrdersProperties:
+    """
+    Properties of the matrix of :obj:`LimitedPermutationOrders.get_permutation_orders` which are derived from the cycle
+    structure of the main permutation order without calculating the matrix.
+
+    * ``cycle_lengths``: lengths of the disjoint cycles of the main permutation order
+    * ``period``: least common multiple of the cycle lengths
+    * ``has_repetitions``: rows and columns contain repeated permutation orders (``period`` smaller than size)
+    * ``number_of_natural_orders``: number of natural orders (1, 2, 3, ...) in the whole matrix. Each row and each
+      column contains ``size // period`` of them.
+    """
+
+    main_permutation_order: tuple[int, ...]
+    cycle_lengths: tuple[int, ...]
+    period: int
+    has_repetitions: bool
+    number_of_natural_orders: int
+
+    @property
+    def size(self) -> int:
+        return len(self.main_permutation_order)
+
+    @property
+    def max_cycle_length(self) -> int:
+        return max(self.cycle_lengths)
+
+    @property
+    def number_of_fixed_points(self) -> int:
+        return self.cycle_lengths.count(1)
+
+
+def _get_properties_of_cycles(
+    main_permutation_order: tuple[int, ...], cycles: list[tuple[int, ...]]
+) -> LimitedPermutationOrdersProperties:
+    size = len(main_permutation_order)
+    period = _get_period_of_cycles(cycles)
+    return LimitedPermutationOrdersProperties(
+        main_permutation_order=main_permutation_order,
+        cycle_lengths=tuple(len(cycle) for cycle in cycles),
+        period=period,
+        has_repetitions=period < size,
+        number_of_natural_orders=size * (size // period),
+    )
+
+
 class LimitedPermutationOrders:
     """
     LimitedPermutationOrders is inspired from Gérard Grisey's permutation technique.
+
+    Permutation orders are powers of the main permutation order p: the permutation order in row r and column c is
+    p^(p^(r-1)(c)). Single rows, columns and permutation orders are calculated directly from the cycle decomposition
+    of p without calculating the whole matrix of :obj:`get_permutation_orders`.
+
+    >>> lp = LimitedPermutationOrders(main_permutation_order=(3, 1, 4, 2))
+    >>> lp.get_permutation_order(3, 2)
+    (2, 4, 1, 3)
+    >>> lp.get_column(2)
+    [(4, 3, 2, 1), (3, 1, 4, 2), (2, 4, 1, 3), (1, 2, 3, 4)]
+    >>> lp.get_period(), lp.has_repetitions()
+    (4, False)
+    >>> LimitedPermutationOrders(main_permutation_order=(4, 2, 3, 1)).has_repetitions()
+    True
     """
 
     def __init__(
@@ -14,9 +85,36 @@ class LimitedPermutationOrders:
     ) -> None:
         super().__init__(*args, **kwargs)
         self._main_permutation_order: tuple[int, ...]
-        self._permutation_orders: MatrixData
+        self._permutation_orders: Optional[MatrixData] = None
+        self._cycles: list[tuple[int, ...]] = []
+        self._cycle_positions: dict[int, tuple[int, int]] = {}
         self.main_permutation_order = main_permutation_order
 
+    def _get_power(self, exponent: int) -> tuple[int, ...]:
+        return _get_power_of_cycles(
+            self._cycles, len(self.main_permutation_order), exponent
+        )
+
+    def _apply_power(self, element: int, exponent: int) -> int:
+        cycle_index, index = self._cycle_positions[element]
+        cycle = self._cycles[cycle_index]
+        return cycle[(index + exponent) % len(cycle)]
+
+    def _check_number(
+        self, number: PositiveInteger, method_name: str, argument_name: str
+    ) -> None:
+        check_type(
+            number,
+            "PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name=method_name,
+            argument_name=argument_name,
+        )
+        if number > len(self.main_permutation_order):
+            raise ValueError(
+                f"{self.__class__.__name__}:{method_name}:{argument_name} must be less than or equal to {len(self.main_permutation_order)}"
+            )
+
     @property
     def main_permutation_order(self) -> PermutationOrder:
         return self._main_permutation_order
@@ -30,7 +128,61 @@ class LimitedPermutationOrders:
             property_name="main_permutation_order",
         )
         self._main_permutation_order = val
-        self._permutation_orders = get_self_permutation_3d(self.main_permutation_order)
+        self._permutation_orders = None
+        self._cycles = _get_cycles(val)
+        self._cycle_positions = {
+            element: (cycle_index, index)
+            for cycle_index, cycle in enumerate(self._cycles)
+            for index, element in enumerate(cycle)
+        }
 
     def get_permutation_orders(self) -> MatrixData:
+        # permutation orders are only calculated if they are needed (O(n^3) memory)
+        if self._permutation_orders is None:
+            self._permutation_orders = get_self_permutation_3d(
+                self.main_permutation_order
+            )
         return self._permutation_orders
+
+    def get_permutation_order(
+        self, row_number: PositiveInteger, column_number: PositiveInteger
+    ) -> tuple[int, ...]:
+        self._check_number(row_number, "get_permutation_order", "row_number")
+        self._check_number(column_number, "get_permutation_order", "column_number")
+        return self._get_power(self._apply_power(column_number, row_number - 1))
+
+    def get_row(self, row_number: PositiveInteger) -> list[tuple[int, ...]]:
+        self._check_number(row_number, "get_row", "row_number")
+        return [
+            self._get_power(exponent) for exponent in self._get_power(row_number - 1)
+        ]
+
+    def get_column(self, column_number: PositiveInteger) -> list[tuple[int, ...]]:
+        self._check_number(column_number, "get_column", "column_number")
+        return [
+            self._get_power(self._apply_power(column_number, row_index))
+            for row_index in range(len(self.main_permutation_order))
+        ]
+
+    def get_period(self) -> int:
+        """
+        :return: least common multiple of the cycle lengths of the main permutation order. Powers of the main permutation
+                 order repeat with this period.
+        """
+        return _get_period_of_cycles(self._cycles)
+
+    def has_repetitions(self) -> bool:
+        """
+        :return: ``True`` if permutation orders are repeated in the rows and columns of :obj:`get_permutation_orders`,
+                 i.e. if the period of the main permutation order is smaller than its size.
+        """
+        return self.get_period() < len(self.main_permutation_order)
+
+    def get_properties(self) -> LimitedPermutationOrdersProperties:
+        """
+        >>> LimitedPermutationOrders(main_permutation_order=(2, 1, 4, 5, 3)).get_properties()
+        LimitedPermutationOrdersProperties(main_permutation_order=(2, 1, 4, 5, 3), cycle_lengths=(2, 3), period=6, has_repetitions=False, number_of_natural_orders=0)
+        """
+        return _get_properties_of_cycles(
+            tuple(self.main_permutation_order), self._cycles
+        )
@@ -1,5 +1,6 @@
+from operator import itemgetter
 from pprint import pprint  # noqa
-from typing import Any
+from typing import Any, Iterable, Optional
 
 from musurgia.musurgia_exceptions import (
     PermutationOrderTypeError,
@@ -11,6 +12,12 @@ from musurgia.musurgia_types import (
     check_permutation_order_values,
     MatrixData,
 )
+from musurgia.numpy_utils import import_numpy, is_ndarray
+from musurgia.permutation.algebra import (
+    _get_cycles,
+    _get_power_of_cycles,
+    _get_period_of_cycles,
+)
 
 
 def permute(input_list: list[Any], permutation_order: PermutationOrder) -> list[Any]:
@@ -32,16 +39,118 @@ def permute(input_list: list[Any], permutation_order: PermutationOrder) -> list[
             argument_name="permutation_order",
         )
     except TypeError as err:
-        raise PermutationOrderTypeError(err)
+        raise PermutationOrderTypeError(err) from err
 
     try:
         check_permutation_order_values(permutation_order, len(input_list))
     except ValueError as err:
-        raise PermutationOrderValueError(err)
+        raise PermutationOrderValueError(err) from err
 
     return [input_list[m - 1] for m in permutation_order]
 
 
+class Permuter:
+    """
+    Permuter applies the same permutation order to many values. In contrast to :obj:`permute` the permutation order is
+    validated only once, and lists, tuples and numpy arrays can be permuted. Arrays are permuted with fancy indexing
+    along ``axis`` (default: last axis), so that a 2-D array of rows is permuted as a batch in one call.
+
+    >>> permuter = Permuter((3, 2, 4, 1))
+    >>> permuter.permute([10, 20, 30, 40])
+    [30, 20, 40, 10]
+    >>> permuter.permute(("a", "b", "c", "d"))
+    ('c', 'b', 'd', 'a')
+    >>> permuter.permute_many([[1, 2, 3, 4], [5, 6, 7, 8]])
+    [[3, 2, 4, 1], [7, 6, 8, 5]]
+    """
+
+    def __init__(self, permutation_order: PermutationOrder) -> None:
+        self._permutation_order: tuple[int, ...]
+        self._getter: Any
+        self._array_indices: Optional[Any] = None
+        self.permutation_order = permutation_order
+
+    @property
+    def permutation_order(self) -> tuple[int, ...]:
+        return self._permutation_order
+
+    @permutation_order.setter
+    def permutation_order(self, value: PermutationOrder) -> None:
+        try:
+            check_type(
+                value,
+                "PermutationOrder",
+                class_name=self.__class__.__name__,
+                property_name="permutation_order",
+            )
+        except TypeError as err:
+            raise PermutationOrderTypeError(err) from err
+        self._permutation_order = tuple(value)
+        getter = itemgetter(*(m - 1 for m in self._permutation_order))
+        if len(self._permutation_order) == 1:
+            self._getter = lambda values: (getter(values),)
+        else:
+            self._getter = getter
+        self._array_indices = None
+
+    def _get_array_indices(self) -> Any:
+        if self._array_indices is None:
+            np = import_numpy(f"{self.__class__.__name__}.permute")
+            self._array_indices = np.array(self._permutation_order, dtype=np.intp) - 1
+        return self._array_indices
+
+    def _check_size(self, size: int) -> None:
+        if size != self.get_size():
+            raise PermutationOrderValueError(
+                f"{self.__class__.__name__}:permute: size of values {size} must be equal to size of permutation_order "
+                f"{self.get_size()}"
+            )
+
+    def get_size(self) -> int:
+        return len(self._permutation_order)
+
+    def permute(self, values: Any, axis: int = -1) -> Any:
+        """
+        :param values: list, tuple or numpy array
+        :param axis: axis of numpy arrays which is permuted. It is ignored for lists and tuples.
+        :return: permuted values of the same type
+
+        >>> import numpy as np
+        >>> Permuter((2, 3, 1)).permute(np.array([[1, 2, 3], [4, 5, 6]]))
+        array([[2, 3, 1],
+               [5, 6, 4]])
+        >>> Permuter((2, 1)).permute(np.array([[1, 2, 3], [4, 5, 6]]), axis=0)
+        array([[4, 5, 6],
+               [1, 2, 3]])
+        """
+        if is_ndarray(values):
+            if values.ndim == 0:
+                raise TypeError(
+                    f"{self.__class__.__name__}:permute: values must have at least one dimension"
+                )
+            self._check_size(values.shape[axis])
+            return values.take(self._get_array_indices(), axis=axis)
+        if isinstance(values, tuple):
+            self._check_size(len(values))
+            return self._getter(values)
+        check_type(
+            values,
+            list,
+            class_name=self.__class__.__name__,
+            method_name="permute",
+            argument_name="values",
+        )
+        self._check_size(len(values))
+        return list(self._getter(values))
+
+    def permute_many(self, list_of_values: Iterable[Any]) -> list[Any]:
+        """
+        :return: a list of all permuted values. For many values of the same size a 2-D numpy array and :obj:`permute` is
+                 the fastest option.
+        """
+        return [self.permute(values) for values in list_of_values]
+
+
 def get_self_permutation_2d(
     permutation_order: tuple[int, ...],
 ) -> list[tuple[int, ...]]:
@@ -71,12 +180,24 @@ def get_self_permutation_2d(
     [(4, 2, 3, 1), (1, 2, 3, 4), (4, 2, 3, 1), (1, 2, 3, 4)]
 
     """
-    output = [permutation_order]
-
-    for i in range(1, len(permutation_order)):
-        output.append(tuple(permute(list(output[i - 1]), permutation_order)))
-
-    return output
+    try:
+        check_type(
+            permutation_order,
+            "PermutationOrder",
+            function_name="get_self_permutation_2d",
+            argument_name="permutation_order",
+        )
+    except TypeError as err:
+        raise PermutationOrderTypeError(err) from err
+    # powers are calculated directly from the cycle decomposition and are only calculated once per period.
+    size = len(permutation_order)
+    cycles = _get_cycles(permutation_order)
+    period = _get_period_of_cycles(cycles)
+    powers = [permutation_order] + [
+        _get_power_of_cycles(cycles, size, exponent)
+        for exponent in range(2, min(period, size) + 1)
+    ]
+    return [powers[exponent % period - 1] for exponent in range(1, size + 1)]
 
 
 def get_self_permutation_3d(permutation_order: tuple[int, ...]) -> MatrixData:
@@ -123,9 +244,11 @@ def get_self_permutation_3d(permutation_order: tuple[int, ...]) -> MatrixData:
      [(1, 2, 3, 4), (1, 2, 3, 4), (4, 2, 3, 1), (4, 2, 3, 1)]]
     """
 
+    # row r consists of the powers of permutation_order in the order of permutation_order to the power of r - 1:
+    # element (r, c) = p^(p^(r-1)(c))
     self_permuted_order = get_self_permutation_2d(permutation_order)
     output = [self_permuted_order]
-
-    for i in range(1, len(self_permuted_order)):
-        output.append(permute(list(output[i - 1]), permutation_order))
+    for row_index in range(1, len(self_permuted_order)):
+        exponents = self_permuted_order[row_index - 1]
+        output.append([self_permuted_order[exponent - 1] for exponent in exponents])
     return output
@@ -1,77 +1,246 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from math import floor, ceil
 
 from fractions import Fraction
-from typing import Literal
+from typing import Any, Generator, Iterable, Iterator, Optional
 
-from musurgia.musurgia_types import ConvertibleToFraction, convert_to_fraction
+from musurgia.musurgia_types import (
+    ConvertibleToFraction,
+    check_type,
+    convert_to_fraction,
+)
+from musurgia.numpy_utils import import_numpy, is_ndarray
 
 
-def _find_nearest_quantized_value(
-    quantized_values: list[Fraction], values: list[Fraction]
-) -> list[tuple[Fraction, Fraction]]:
+def _get_quantized_location_indices(
+    positions: list[Fraction], grid_size: Fraction
+) -> tuple[int, int]:
+    factor = Fraction(1, grid_size)
+    first_index = ceil(min(positions) * factor)
+    last_index = max(first_index, floor(max(positions) * factor))
+    return first_index, last_index
+
+
+def _get_nearest_grid_index(value: Fraction, grid_size: Fraction) -> int:
+    # ties are resolved in favour of the smaller index
+    if isinstance(value, (Fraction, int)):
+        value_numerator, value_denominator = value.as_integer_ratio()
+        divisor = value_denominator * grid_size.numerator
+        index, remainder = divmod(value_numerator * grid_size.denominator, divisor)
+        # remainder / divisor is the distance to the lower location in grid units
+        if 2 * remainder > divisor:
+            index += 1
+    else:
+        exact_value = Fraction(value)
+        index = (exact_value.numerator * grid_size.denominator) // (
+            exact_value.denominator * grid_size.numerator
+        )
+        lower = index * grid_size
+        if abs(lower - value) > abs(lower + grid_size - value):
+            index += 1
+    return index
+
+
+def _find_nearest_grid_values(
+    values: list[Fraction], grid_size: Fraction, first_index: int, last_index: int
+) -> list[Fraction]:
+    first_location = first_index * grid_size
+    last_location = last_index * grid_size
     output = []
     for value in values:
-        nearest_quantized = min(
-            enumerate(quantized_values), key=lambda x: abs(x[1] - value)
-        )[1]
-        delta = nearest_quantized - value
-        output.append((nearest_quantized, delta))
+        index = _get_nearest_grid_index(value, grid_size)
+        if index <= first_index:
+            nearest_quantized = first_location
+        elif index >= last_index:
+            nearest_quantized = last_location
+        else:
+            nearest_quantized = index * grid_size
+        output.append(nearest_quantized)
     return output
 
 
-def _find_quantized_locations(
-    positions: list[Fraction], grid_size: ConvertibleToFraction
-) -> list[Fraction]:
+def _get_array_grid_size(values: Any, grid_size: ConvertibleToFraction) -> Any:
     grid_size = convert_to_fraction(grid_size)
+    if values.dtype.kind in "iu" and grid_size.denominator == 1:
+        return grid_size.numerator
+    return float(grid_size)
 
-    def get_quantized(val: Fraction, key: Literal["min", "max"]) -> Fraction:
-        factor = Fraction(1, grid_size)
-        if key == "min":
-            output = Fraction(ceil(val * factor), factor)
-        elif key == "max":
-            output = Fraction(floor(val * factor), factor)
-        else:
-            raise ValueError()
-        return output
 
-    min_location = Fraction(get_quantized(min(positions), "min"))
-    output = [min_location]
-    max_location = Fraction(get_quantized(max(positions), "max"))
+def _quantize_positions_array(np: Any, positions: Any, grid_sizes: Any) -> Any:
+    # positions are quantized along the last axis, grid_sizes must be broadcastable against positions
+    if positions.dtype.kind in "iu" and np.asarray(grid_sizes).dtype.kind in "iu":
+        first_indices = -(-positions.min(axis=-1, keepdims=True) // grid_sizes)
+        last_indices = positions.max(axis=-1, keepdims=True) // grid_sizes
+        # ceil((position - grid_size / 2) / grid_size): ties are moved to the smaller location
+        indices = -((grid_sizes - 2 * positions) // (2 * grid_sizes))
+    else:
+        scaled_positions = positions / grid_sizes
+        first_indices = np.ceil(scaled_positions.min(axis=-1, keepdims=True))
+        last_indices = np.floor(scaled_positions.max(axis=-1, keepdims=True))
+        indices = np.ceil(scaled_positions - 0.5)
+    last_indices = np.maximum(first_indices, last_indices)
+    return np.clip(indices, first_indices, last_indices) * grid_sizes
 
-    while output[-1] < max_location:
-        output.append(output[-1] + Fraction(grid_size))
 
-    return output
+def _quantize_positions_tuple(
+    positions: tuple[Fraction, ...], grid_size: Fraction
+) -> tuple[Fraction, ...]:
+    first_index, last_index = _get_quantized_location_indices(
+        list(positions), grid_size
+    )
+    return tuple(
+        _find_nearest_grid_values(list(positions), grid_size, first_index, last_index)
+    )
+
+
+_cached_quantize_positions_tuple = lru_cache(maxsize=1024)(_quantize_positions_tuple)
+
+
+def _get_cached_quantized_positions(
+    positions: list[Fraction], grid_size: Fraction
+) -> list[Fraction]:
+    if all(isinstance(position, (Fraction, int)) for position in positions):
+        # quantization is scale invariant for exact values: positions and grid are normalized to a grid of size 1
+        normalized_positions = tuple(position / grid_size for position in positions)
+        return [
+            index * grid_size
+            for index in _cached_quantize_positions_tuple(
+                normalized_positions, Fraction(1)
+            )
+        ]
+    return list(_cached_quantize_positions_tuple(tuple(positions), grid_size))
+
+
+def get_quantization_cache_info() -> dict[str, Any]:
+    """
+    :return: statistics of the cache used by :obj:`get_quantized_positions` and :obj:`get_quantized_values` if
+             ``cache`` is ``True``: hits, misses, maxsize, currsize and hit_rate (``None`` if the cache has not been
+             used yet)
+
+    >>> clear_quantization_cache()
+    >>> get_quantized_positions([Fraction(0), Fraction(1, 3), Fraction(1)], Fraction(1, 4), cache=True)
+    [Fraction(0, 1), Fraction(1, 4), Fraction(1, 1)]
+    >>> get_quantized_positions([Fraction(0), Fraction(2, 3), Fraction(2)], Fraction(1, 2), cache=True)
+    [Fraction(0, 1), Fraction(1, 2), Fraction(2, 1)]
+    >>> get_quantization_cache_info()
+    {'hits': 1, 'misses': 1, 'maxsize': 1024, 'currsize': 1, 'hit_rate': 0.5}
+    """
+    info = _cached_quantize_positions_tuple.cache_info()
+    number_of_calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "currsize": info.currsize,
+        "hit_rate": info.hits / number_of_calls if number_of_calls else None,
+    }
+
+
+def clear_quantization_cache() -> None:
+    """
+    Clears the quantization cache and resets its statistics.
+    """
+    _cached_quantize_positions_tuple.cache_clear()
+
+
+def set_quantization_cache_size(maxsize: Optional[int]) -> None:
+    """
+    Replaces the quantization cache with an empty least recently used cache of ``maxsize`` entries (``None``: unbounded).
+    """
+    global _cached_quantize_positions_tuple
+    _cached_quantize_positions_tuple = lru_cache(maxsize=maxsize)(
+        _quantize_positions_tuple
+    )
 
 
 def get_quantized_positions(
-    positions: list[Fraction], grid_size: ConvertibleToFraction
+    positions: list[Fraction],
+    grid_size: ConvertibleToFraction,
+    exact: bool = False,
+    cache: bool = False,
 ) -> list[Fraction]:
-    def _get_quantized_locations() -> list[Fraction]:
-        return _find_quantized_locations(positions, grid_size)
+    """
+    Moves each position to its nearest location on a grid of ``grid_size``, limited to the grid locations between the
+    smallest and the largest position. The nearest location is computed arithmetically, so the cost grows linearly
+    with the number of positions and not with the number of grid locations. Positions lying exactly halfway between
+    two locations are moved to the smaller one.
+
+    numpy arrays are quantized in vectorized form and a numpy array is returned: integer arrays (e.g. ticks) stay
+    integer if ``grid_size`` is an integer, otherwise the calculation is done in floating point. If ``exact`` is
+    ``True`` arrays are converted to lists and quantized exactly like lists.
+
+    If ``cache`` is ``True`` results of lists are memoized in a least recently used cache (see
+    :obj:`get_quantization_cache_info`). Exact positions are normalized by ``grid_size`` before lookup, so that
+    positions and grid scaled by the same factor share one entry.
+
+    >>> get_quantized_positions([Fraction(0), Fraction(1, 4), Fraction(3, 4), Fraction(2)], 1 / 2)
+    [Fraction(0, 1), Fraction(0, 1), Fraction(1, 2), Fraction(2, 1)]
+    """
+    if is_ndarray(positions):
+        if not exact:
+            np = import_numpy("get_quantized_positions")
+            return _quantize_positions_array(
+                np, positions, _get_array_grid_size(positions, grid_size)
+            )
+        positions = positions.tolist()  # type: ignore
+    grid_size = convert_to_fraction(grid_size)
+    if cache:
+        return _get_cached_quantized_positions(positions, grid_size)
+    first_index, last_index = _get_quantized_location_indices(positions, grid_size)
+    return _find_nearest_grid_values(positions, grid_size, first_index, last_index)
 
-    quantized_positions = [
-        f[0]
-        for f in _find_nearest_quantized_value(_get_quantized_locations(), positions)
-    ]
 
-    return quantized_positions
+def _get_positions_array(np: Any, values: Any) -> Any:
+    return np.concatenate((np.zeros(1, dtype=values.dtype), np.cumsum(values)))
 
 
 def get_quantized_values(
-    values: list[Fraction], grid_size: ConvertibleToFraction
+    values: list[Fraction],
+    grid_size: ConvertibleToFraction,
+    exact: bool = False,
+    cache: bool = False,
 ) -> list[Fraction]:
-    # print("vals", vals)
-    def _get_positions() -> list[Fraction]:
-        positions = [Fraction(0)]
-        for val in values:
-            positions.append(positions[-1] + val)
-        return positions
-
-    positions = _get_positions()
-    quantized_positions = get_quantized_positions(positions, grid_size)
+    """
+    Quantizes the positions resulting from the cumulative sum of values and returns the differences of the quantized
+    positions.
+
+    numpy arrays are processed in vectorized form (see :obj:`get_quantized_positions`) and a numpy array is returned.
+    If ``exact`` is ``True`` arrays are converted to lists and quantized exactly like lists. For ``cache`` see
+    :obj:`get_quantized_positions`.
+
+    >>> get_quantized_values([Fraction(1, 3), Fraction(1, 3), Fraction(1, 3)], Fraction(1, 4))
+    [Fraction(1, 4), Fraction(1, 2), Fraction(1, 4)]
+    """
+    if is_ndarray(values):
+        if not exact:
+            np = import_numpy("get_quantized_values")
+            positions = _get_positions_array(np, values)
+            return np.diff(
+                _quantize_positions_array(
+                    np, positions, _get_array_grid_size(positions, grid_size)
+                )
+            )
+        values = values.tolist()  # type: ignore
+
+    return _get_quantized_values_of_positions(_get_positions(values), grid_size, cache)
+
+
+def _get_positions(values: list[Fraction]) -> list[Fraction]:
+    positions = [Fraction(0)]
+    for val in values:
+        positions.append(positions[-1] + val)
+    return positions
+
+
+def _get_quantized_values_of_positions(
+    positions: list[Fraction], grid_size: ConvertibleToFraction, cache: bool = False
+) -> list[Fraction]:
+    quantized_positions = get_quantized_positions(positions, grid_size, cache=cache)
     quantized_vals = []
-    for index in range(len(values)):
+    for index in range(len(positions) - 1):
         quantized_val = Fraction(
             quantized_positions[index + 1] - quantized_positions[index]
         ).limit_denominator(1000)
@@ -80,31 +249,290 @@ def get_quantized_values(
     return quantized_vals
 
 
+def _evaluate_grid(
+    values: list[Fraction], positions: list[Fraction], grid: ConvertibleToFraction
+) -> tuple[list[Fraction], Fraction]:
+    quantized_values = _get_quantized_values_of_positions(positions, grid)
+    delta = sum(
+        [
+            abs(quantized - original)
+            for quantized, original in zip(quantized_values, values)
+        ],
+        Fraction(0),
+    )
+    return quantized_values, delta
+
+
+# values and positions of a worker process of _iterate_grid_evaluations
+_worker_values: list[Fraction] = []
+_worker_positions: list[Fraction] = []
+
+
+def _set_worker_values(values: list[Fraction], positions: list[Fraction]) -> None:
+    global _worker_values, _worker_positions
+    _worker_values = values
+    _worker_positions = positions
+
+
+def _evaluate_worker_grid(
+    grid: ConvertibleToFraction,
+) -> tuple[list[Fraction], Fraction]:
+    return _evaluate_grid(_worker_values, _worker_positions, grid)
+
+
+def _iterate_grid_evaluations(
+    values: list[Fraction],
+    list_of_grids: list[ConvertibleToFraction],
+    max_workers: Optional[int],
+) -> Generator[tuple[list[Fraction], Fraction], None, None]:
+    # positions are calculated once and shared by all grids. Evaluations are yielded in the order of list_of_grids.
+    positions = _get_positions(values)
+    if max_workers is None or max_workers <= 1 or len(list_of_grids) <= 1:
+        for grid in list_of_grids:
+            yield _evaluate_grid(values, positions, grid)
+        return
+    # values and positions are sent once to each worker process instead of with each grid. Workers are spawned, since
+    # forking a multi-threaded process may lead to deadlocks.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_set_worker_values,
+        initargs=(values, positions),
+    ) as executor:
+        futures = [
+            executor.submit(_evaluate_worker_grid, grid) for grid in list_of_grids
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # pending evaluations are not needed anymore if the caller stops early
+            for future in futures:
+                future.cancel()
+
+
+def _get_checked_grids(
+    values: list[Fraction], list_of_grids: list[ConvertibleToFraction]
+) -> list[ConvertibleToFraction]:
+    values_sum = sum(values)
+    checked_grids = [grid for grid in list_of_grids if values_sum % grid == 0]  # type: ignore
+    if not checked_grids:
+        raise AttributeError("all duration_units failed check_sum")
+    return checked_grids
+
+
+def _get_array_grid_deltas(
+    values: Any, list_of_grids: list[ConvertibleToFraction], check_sum: bool
+) -> tuple[list[int], Any, Any]:
+    np = import_numpy("find_best_quantized_values")
+    positions = _get_positions_array(np, values)
+    grid_sizes = np.array(
+        [_get_array_grid_size(positions, grid) for grid in list_of_grids]
+    )
+    if check_sum:
+        if grid_sizes.dtype.kind in "iu":
+            remainders = positions[-1] % grid_sizes
+            is_valid = remainders == 0
+        else:
+            remainders = np.remainder(positions[-1], grid_sizes)
+            is_valid = np.isclose(remainders, 0) | np.isclose(remainders, grid_sizes)
+        if not is_valid.any():
+            raise AttributeError("all duration_units failed check_sum")
+    else:
+        is_valid = np.ones(len(grid_sizes), dtype=bool)
+    # one row of quantized values per grid
+    quantized_values = np.diff(
+        _quantize_positions_array(np, positions, grid_sizes[is_valid, np.newaxis]),
+        axis=-1,
+    )
+    deltas = np.abs(quantized_values - values).sum(axis=-1)
+    return np.flatnonzero(is_valid).tolist(), quantized_values, deltas
+
+
 def find_best_quantized_values(
     values: list[Fraction],
     list_of_grids: list[ConvertibleToFraction],
     check_sum: bool = True,
+    exact: bool = False,
+    max_workers: Optional[int] = None,
 ) -> list[Fraction]:
+    """
+    Quantizes values with each grid of ``list_of_grids`` and returns the quantized values with the smallest sum of
+    absolute deviations from values. If ``check_sum`` is ``True`` only grids which divide the sum of values are
+    considered. If several grids have the same deviation the first one wins, hence the search stops as soon as a grid
+    without any deviation is found.
+
+    The positions of values are calculated only once for all grids. With ``max_workers`` greater than 1 the grids are
+    evaluated concurrently in a process pool of spawned workers, each receiving values and positions once. This pays
+    off only for large lists of values.
+
+    numpy arrays are evaluated for all grids at once in one broadcast operation and a numpy array is returned. Floating
+    point sums are checked with a tolerance. If ``exact`` is ``True`` arrays are converted to lists and quantized
+    exactly like lists.
+
+    >>> find_best_quantized_values([Fraction(1, 3), Fraction(2, 3), Fraction(1, 2)], [Fraction(1, 2), Fraction(1, 6)])
+    [Fraction(1, 3), Fraction(2, 3), Fraction(1, 2)]
+    """
+    if is_ndarray(values):
+        if not exact:
+            _, quantized_values, deltas = _get_array_grid_deltas(
+                values, list_of_grids, check_sum
+            )
+            return quantized_values[deltas.argmin()]  # type: ignore
+        values = values.tolist()  # type: ignore
     if check_sum:
-        new_value_grids = []
-        for grid in list_of_grids:
-            if sum(values) % grid == 0:
-                new_value_grids.append(grid)
-        if not new_value_grids:
-            raise AttributeError("all duration_units failed check_sum")
-    else:
-        new_value_grids = list_of_grids
+        list_of_grids = _get_checked_grids(values, list_of_grids)
     output = values
     old_delta = None
-    for grid in new_value_grids:
-        quantized_values = get_quantized_values(values, grid)
-        new_delta = sum(
-            [
-                abs(quantized - original)
-                for quantized, original in zip(quantized_values, values)
+    with closing(_iterate_grid_evaluations(values, list_of_grids, max_workers)) as (
+        evaluations
+    ):
+        for quantized_values, new_delta in evaluations:
+            if old_delta is None or new_delta < old_delta:
+                old_delta = new_delta
+                output = quantized_values
+            if new_delta == 0:
+                break
+    return output
+
+
+def get_quantization_ranking(
+    values: list[Fraction],
+    list_of_grids: list[ConvertibleToFraction],
+    check_sum: bool = True,
+    exact: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[tuple[ConvertibleToFraction, Fraction]]:
+    """
+    Like :obj:`find_best_quantized_values` but evaluates all grids and returns a list of tuples (grid, deviation)
+    sorted by deviation. Grids with the same deviation keep their order in ``list_of_grids``.
+
+    >>> get_quantization_ranking([Fraction(1, 3), Fraction(2, 3)], [Fraction(1, 2), Fraction(1, 3), 1], check_sum=False)
+    [(Fraction(1, 3), Fraction(0, 1)), (Fraction(1, 2), Fraction(1, 3)), (1, Fraction(2, 3))]
+    """
+    if is_ndarray(values):
+        if not exact:
+            grid_indices, _, deltas = _get_array_grid_deltas(
+                values, list_of_grids, check_sum
+            )
+            ranking = [
+                (list_of_grids[index], delta)
+                for index, delta in zip(grid_indices, deltas.tolist())
             ]
+            return sorted(ranking, key=lambda grid_and_delta: grid_and_delta[1])
+        values = values.tolist()  # type: ignore
+    if check_sum:
+        list_of_grids = _get_checked_grids(values, list_of_grids)
+    ranking = [
+        (grid, delta)
+        for grid, (_, delta) in zip(
+            list_of_grids,
+            _iterate_grid_evaluations(values, list_of_grids, max_workers),
         )
-        if old_delta is None or new_delta < old_delta:
-            old_delta = new_delta
-            output = quantized_values
-    return output
+    ]
+    return sorted(ranking, key=lambda grid_and_delta: grid_and_delta[1])
+
+
+class StreamingQuantizer:
+    """
+    Quantizes a stream of values one at a time. Like :obj:`get_quantized_values` not the values themselves but their
+    accumulated positions are moved to the nearest location on the grid, so that the rounding error of each value is
+    carried forward and the sum of quantized values never deviates more than half a grid from the sum of values. Only
+    the current position and its quantized counterpart are stored.
+
+    Unlike :obj:`get_quantized_values` the last position is not limited to the grid locations below the largest
+    position, since the stream does not know which value is the last one.
+
+    >>> quantizer = StreamingQuantizer(grid_size=Fraction(1, 4))
+    >>> list(quantizer.iterate([Fraction(1, 3), Fraction(1, 3), Fraction(1, 3), Fraction(1, 5)]))
+    [Fraction(1, 4), Fraction(1, 2), Fraction(1, 4), Fraction(1, 4)]
+    >>> quantizer.position
+    Fraction(6, 5)
+    >>> quantizer.quantized_position
+    Fraction(5, 4)
+    >>> quantizer.error
+    Fraction(1, 20)
+    """
+
+    def __init__(self, grid_size: ConvertibleToFraction):
+        self._grid_size: Fraction
+        self._position: Fraction = Fraction(0)
+        self._quantized_position: Fraction = Fraction(0)
+        self.grid_size = grid_size
+
+    @property
+    def grid_size(self) -> Fraction:
+        """
+        Set and get grid size. It can be changed while streaming: following positions are quantized to the new grid.
+
+        :type: ConvertibleToFraction, must be positive
+        :rtype: Fraction
+        """
+        return self._grid_size
+
+    @grid_size.setter
+    def grid_size(self, value: ConvertibleToFraction) -> None:
+        check_type(
+            value,
+            "ConvertibleToFraction",
+            class_name=self.__class__.__name__,
+            property_name="grid_size",
+        )
+        value = convert_to_fraction(value)
+        if value <= 0:
+            raise ValueError(
+                f"{self.__class__.__name__}.grid_size must be positive, got {value}"
+            )
+        self._grid_size = value
+
+    @property
+    def position(self) -> Fraction:
+        """
+        :return: sum of all values quantized so far
+        """
+        return self._position
+
+    @property
+    def quantized_position(self) -> Fraction:
+        """
+        :return: sum of all quantized values so far
+        """
+        return self._quantized_position
+
+    @property
+    def error(self) -> Fraction:
+        """
+        :return: accumulated rounding error (quantized position minus position), which will be carried forward to the
+                 next value
+        """
+        return self._quantized_position - self._position
+
+    def quantize(self, value: ConvertibleToFraction) -> Fraction:
+        """
+        :param value: next value of the stream
+        :return: quantized value
+        """
+        self._position += value  # type: ignore
+        quantized_position = (
+            _get_nearest_grid_index(self._position, self.grid_size) * self.grid_size
+        )
+        quantized_value = quantized_position - self._quantized_position
+        self._quantized_position = quantized_position
+        return quantized_value
+
+    def iterate(self, values: Iterable[ConvertibleToFraction]) -> Iterator[Fraction]:
+        """
+        Lazily quantizes values of an iterable (e.g. a generator of durations).
+
+        :param values: iterable of values
+        :return: iterator of quantized values
+        """
+        for value in values:
+            yield self.quantize(value)
+
+    def reset(self) -> None:
+        """
+        Sets position and quantized position back to zero.
+        """
+        self._position = Fraction(0)
+        self._quantized_position = Fraction(0)
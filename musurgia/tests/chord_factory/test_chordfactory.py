@@ -1,8 +1,9 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 from musicscore.chord import XMLWords
 
-from musurgia.chordfactory.chordfactory import AbstractChordFactory
+from musurgia.chordfactory.chordfactory import AbstractChordFactory, create_chords
 
 
 class SimpleDemoChordFactory(AbstractChordFactory):
@@ -16,6 +17,17 @@ class SimpleDemoChordFactory(AbstractChordFactory):
         self._chord.add_x(XMLWords("something"))
 
 
+class OrderedDemoChordFactory(SimpleDemoChordFactory):
+    def update_chord_midis(self):
+        self._chord.midis = 60
+
+    def update_chord_b(self):
+        self._chord.add_x(XMLWords("b"))
+
+    def update_chord_a(self):
+        self._chord.add_x(XMLWords("a"))
+
+
 class ChordFactoryTestCase(TestCase):
     def test_simple_demo_chord_factory(self):
         chf = SimpleDemoChordFactory()
@@ -23,3 +35,41 @@ class ChordFactoryTestCase(TestCase):
         self.assertEqual(ch.midis[0].value, 72)
         self.assertEqual(ch.quarter_duration, 4)
         self.assertEqual(ch.get_words()[0].value_, "something")
+
+    def test_update_methods_order(self):
+        self.assertEqual(
+            OrderedDemoChordFactory._CHORD_UPDATE_METHODS,
+            (
+                "update_chord_quarter_duration",
+                "update_chord_midis",
+                "update_chord_words",
+                "update_chord_b",
+                "update_chord_a",
+            ),
+        )
+        ch = OrderedDemoChordFactory().create_chord()
+        self.assertEqual(ch.midis[0].value, 60)
+        self.assertEqual([w.value_ for w in ch.get_words()], ["something", "b", "a"])
+
+    def test_create_chords(self):
+        chord_factories = [SimpleDemoChordFactory(), OrderedDemoChordFactory()]
+        chords = create_chords(chord_factories)
+        self.assertEqual([ch.midis[0].value for ch in chords], [72, 60])
+        self.assertEqual([ch.quarter_duration for ch in chords], [4, 4])
+        for chord_factory, chord in zip(chord_factories, chords):
+            self.assertIs(chord_factory._chord, chord)
+
+    def test_update_methods_are_looked_up_on_the_factory(self):
+        def update_chord_midis(self):
+            self._chord.midis = 61
+
+        with patch.object(
+            SimpleDemoChordFactory, "update_chord_midis", update_chord_midis
+        ):
+            self.assertEqual(SimpleDemoChordFactory().create_chord().midis[0].value, 61)
+            self.assertEqual(
+                OrderedDemoChordFactory().create_chord().midis[0].value, 60
+            )
+        chf = SimpleDemoChordFactory()
+        chf.update_chord_words = lambda: None
+        self.assertEqual(create_chords([chf])[0].get_words(), [])
@@ -19,7 +19,15 @@ class RandomMidiGeneratorTestCase(TestCase):
         for midi in random_midis:
             self.assertTrue(isinstance(midi, Midi))
         self.assertListEqual(
-            [m.value for m in random_midis], [52, 60, 64, 52, 60, 61, 64, 62.5, 61, 60]
+            [m.value for m in random_midis], [52, 60, 61, 62.5, 60, 64, 61, 52, 60, 64]
+        )
+
+    def test_take_random_midis(self):
+        random_midis = self.rmg.take(5) + self.rmg.take(5)
+        for midi in random_midis:
+            self.assertTrue(isinstance(midi, Midi))
+        self.assertListEqual(
+            [m.value for m in random_midis], [52, 60, 61, 62.5, 60, 64, 61, 52, 60, 64]
         )
 
 
@@ -1,3 +1,4 @@
 from .svg import *
 from .utils_for_tests import *
 from .xml import *
+from .midi import *
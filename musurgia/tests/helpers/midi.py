@@ -0,0 +1,47 @@
+__all__ = ["read_midi_file"]
+
+
+def _read_variable_length_quantity(data, index):
+    value = 0
+    while True:
+        byte = data[index]
+        index += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, index
+
+
+def read_midi_file(path):
+    """
+    Minimal reader of Standard MIDI Files without running status.
+
+    :return: ticks per quarter and list of tracks. Each track is a list of (absolute tick, event bytes) tuples
+             without end of track.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:4] == b"MThd"
+    number_of_tracks = int.from_bytes(data[10:12], "big")
+    ticks_per_quarter = int.from_bytes(data[12:14], "big")
+    index = 14
+    tracks = []
+    for _ in range(number_of_tracks):
+        assert data[index : index + 4] == b"MTrk"
+        end = index + 8 + int.from_bytes(data[index + 4 : index + 8], "big")
+        index += 8
+        tick = 0
+        events = []
+        while index < end:
+            delta, index = _read_variable_length_quantity(data, index)
+            tick += delta
+            status = data[index]
+            if status == 0xFF:
+                length, data_index = _read_variable_length_quantity(data, index + 2)
+                event_end = data_index + length
+            else:
+                event_end = index + 3
+            if data[index : index + 2] != b"\xff\x2f":
+                events.append((tick, data[index:event_end]))
+            index = event_end
+        tracks.append(events)
+    return ticks_per_quarter, tracks
@@ -0,0 +1,91 @@
+import itertools
+import random
+from unittest import TestCase
+
+from musurgia.permutation.algebra import (
+    get_permutation_cycles,
+    get_permutation_period,
+    get_permutation_power,
+    compose_permutation_orders,
+    invert_permutation_order,
+)
+from musurgia.permutation.permutation import permute
+
+
+def _get_power_by_iteration(permutation_order, exponent):
+    output = tuple(range(1, len(permutation_order) + 1))
+    for _ in range(exponent):
+        output = tuple(permute(list(output), permutation_order))
+    return output
+
+
+class TestPermutationAlgebra(TestCase):
+    def setUp(self):
+        self.random = random.Random(11)
+
+    def get_random_permutation_order(self, size):
+        permutation_order = list(range(1, size + 1))
+        self.random.shuffle(permutation_order)
+        return tuple(permutation_order)
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            get_permutation_cycles([2, 1])
+        with self.assertRaises(TypeError):
+            get_permutation_period((1, 3))
+        with self.assertRaises(TypeError):
+            get_permutation_power((2, 1), 1.0)
+        with self.assertRaises(TypeError):
+            invert_permutation_order((2, 2))
+        with self.assertRaises(ValueError):
+            compose_permutation_orders((2, 1), (1, 2, 3))
+
+    def test_cycles(self):
+        assert get_permutation_cycles((1,)) == [(1,)]
+        assert get_permutation_cycles((4, 3, 2, 1)) == [(1, 4), (2, 3)]
+        for size in range(1, 10):
+            permutation_order = self.get_random_permutation_order(size)
+            cycles = get_permutation_cycles(permutation_order)
+            assert sorted(itertools.chain(*cycles)) == list(range(1, size + 1))
+            for cycle in cycles:
+                for index, element in enumerate(cycle):
+                    assert (
+                        permutation_order[element - 1]
+                        == cycle[(index + 1) % len(cycle)]
+                    )
+
+    def test_power(self):
+        for size in range(1, 10):
+            permutation_order = self.get_random_permutation_order(size)
+            for exponent in range(2 * size + 2):
+                assert get_permutation_power(
+                    permutation_order, exponent
+                ) == _get_power_by_iteration(permutation_order, exponent)
+            inverse = invert_permutation_order(permutation_order)
+            assert get_permutation_power(permutation_order, -3) == (
+                get_permutation_power(inverse, 3)
+            )
+
+    def test_period(self):
+        assert get_permutation_period((2, 3, 1, 5, 4)) == 6
+        for size in range(1, 10):
+            permutation_order = self.get_random_permutation_order(size)
+            period = get_permutation_period(permutation_order)
+            natural_order = tuple(range(1, size + 1))
+            assert get_permutation_power(permutation_order, period) == natural_order
+            for exponent in range(1, period):
+                assert (
+                    get_permutation_power(permutation_order, exponent) != natural_order
+                )
+
+    def test_compose_and_invert(self):
+        for size in range(1, 10):
+            first = self.get_random_permutation_order(size)
+            second = self.get_random_permutation_order(size)
+            assert compose_permutation_orders(first, second) == tuple(
+                permute(list(first), second)
+            )
+            natural_order = tuple(range(1, size + 1))
+            inverse = invert_permutation_order(first)
+            assert compose_permutation_orders(first, inverse) == natural_order
+            assert compose_permutation_orders(inverse, first) == natural_order
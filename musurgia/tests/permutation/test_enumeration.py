@@ -0,0 +1,137 @@
+import itertools
+from unittest import TestCase
+
+from musurgia.permutation.enumeration import (
+    get_permutation_order_rank,
+    get_permutation_order_by_rank,
+    iterate_permutation_orders,
+    iterate_limited_permutation_orders_properties,
+    search_main_permutation_orders,
+)
+from musurgia.permutation.limited_permutation import LimitedPermutationOrders
+
+
+def _has_maximal_period_without_natural_orders(properties):
+    return properties.number_of_natural_orders == 0 and properties.period > 4
+
+
+class TestRank(TestCase):
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            get_permutation_order_rank([1, 2])
+        with self.assertRaises(TypeError):
+            get_permutation_order_by_rank(0, 0)
+        with self.assertRaises(ValueError):
+            get_permutation_order_by_rank(3, 6)
+
+    def test_rank_and_unrank(self):
+        for size in range(1, 7):
+            for rank, permutation_order in enumerate(
+                itertools.permutations(range(1, size + 1))
+            ):
+                assert get_permutation_order_rank(permutation_order) == rank
+                assert get_permutation_order_by_rank(size, rank) == permutation_order
+
+    def test_large_size(self):
+        permutation_order = tuple(range(20, 0, -1))
+        rank = get_permutation_order_rank(permutation_order)
+        assert rank == 2432902008176640000 - 1
+        assert get_permutation_order_by_rank(20, rank) == permutation_order
+
+
+class TestIteratePermutationOrders(TestCase):
+    def test_all(self):
+        for size in range(1, 6):
+            assert list(iterate_permutation_orders(size)) == list(
+                itertools.permutations(range(1, size + 1))
+            )
+
+    def test_ranges(self):
+        all_permutation_orders = list(itertools.permutations(range(1, 6)))
+        for start, stop in [(0, 1), (7, 8), (3, 50), (24, 48), (100, 1000), (5, 5)]:
+            assert (
+                list(iterate_permutation_orders(5, start=start, stop=stop))
+                == all_permutation_orders[start:stop]
+            )
+
+    def test_start_of_large_size(self):
+        iterator = iterate_permutation_orders(12, start=479001599)
+        assert list(iterator) == [tuple(range(12, 0, -1))]
+
+
+class TestLimitedPermutationOrdersProperties(TestCase):
+    def test_properties_from_cycles(self):
+        for properties in iterate_limited_permutation_orders_properties(5):
+            lp = LimitedPermutationOrders(properties.main_permutation_order)
+            permutation_orders = lp.get_permutation_orders()
+            natural_order = tuple(range(1, 6))
+            assert properties == lp.get_properties()
+            assert properties.number_of_natural_orders == sum(
+                permutation_order == natural_order
+                for row in permutation_orders
+                for permutation_order in row
+            )
+            assert properties.has_repetitions == any(
+                len(set(row)) < len(row) for row in permutation_orders
+            )
+            assert sum(properties.cycle_lengths) == properties.size
+
+    def test_derived_properties(self):
+        properties = LimitedPermutationOrders((2, 1, 3, 5, 6, 4)).get_properties()
+        assert properties.size == 6
+        assert properties.cycle_lengths == (2, 1, 3)
+        assert properties.max_cycle_length == 3
+        assert properties.number_of_fixed_points == 1
+        assert properties.period == 6
+        assert properties.number_of_natural_orders == 6
+
+
+class TestSearchMainPermutationOrders(TestCase):
+    def setUp(self):
+        self.expected = [
+            permutation_order
+            for permutation_order in itertools.permutations(range(1, 6))
+            if _has_maximal_period_without_natural_orders(
+                LimitedPermutationOrders(permutation_order).get_properties()
+            )
+        ]
+
+    def test_search(self):
+        assert (
+            search_main_permutation_orders(
+                5, _has_maximal_period_without_natural_orders
+            )
+            == self.expected
+        )
+        assert len(self.expected) == 20
+
+    def test_search_range(self):
+        assert search_main_permutation_orders(
+            5, _has_maximal_period_without_natural_orders, start=30, stop=90
+        ) == [
+            permutation_order
+            for permutation_order in self.expected
+            if 30 <= get_permutation_order_rank(permutation_order) < 90
+        ]
+
+    def test_search_with_workers(self):
+        assert (
+            search_main_permutation_orders(
+                5,
+                _has_maximal_period_without_natural_orders,
+                max_workers=2,
+                number_of_chunks=7,
+            )
+            == self.expected
+        )
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            search_main_permutation_orders(5, None)
+        with self.assertRaises(TypeError):
+            search_main_permutation_orders(
+                5,
+                _has_maximal_period_without_natural_orders,
+                max_workers=2,
+                number_of_chunks=0,
+            )
@@ -1,5 +1,6 @@
 import unittest
 from musurgia.musurgia_types import check_matrix_data_type
+from musurgia.permutation.permutation import get_self_permutation_3d
 from musurgia.permutation.limited_permutation import LimitedPermutationOrders
 
 
@@ -30,3 +31,35 @@ class TestLimitedPermutationOrders(unittest.TestCase):
             [(1, 2, 3), (3, 1, 2), (2, 3, 1)],
             [(2, 3, 1), (1, 2, 3), (3, 1, 2)],
         ]
+
+    def test_direct_access(self):
+        for main_permutation_order in [
+            (3, 1, 4, 2),
+            (4, 2, 3, 1),
+            (2, 3, 1, 5, 4),
+            (5, 7, 1, 2, 6, 3, 4),
+        ]:
+            lt = LimitedPermutationOrders(main_permutation_order=main_permutation_order)
+            expected = get_self_permutation_3d(main_permutation_order)
+            size = len(main_permutation_order)
+            for number in range(1, size + 1):
+                assert lt.get_row(number) == expected[number - 1]
+                assert lt.get_column(number) == [row[number - 1] for row in expected]
+                for column_number in range(1, size + 1):
+                    assert (
+                        lt.get_permutation_order(number, column_number)
+                        == expected[number - 1][column_number - 1]
+                    )
+            assert lt.has_repetitions() == (len(set(expected[0])) < len(expected[0]))
+        with self.assertRaises(ValueError):
+            lt.get_row(8)
+        with self.assertRaises(TypeError):
+            lt.get_column(0)
+
+    def test_period(self):
+        lt = LimitedPermutationOrders(main_permutation_order=(2, 3, 1, 5, 4))
+        assert lt.get_period() == 6
+        assert not lt.has_repetitions()
+        lt.main_permutation_order = (2, 1, 3, 5, 4)
+        assert lt.get_period() == 2
+        assert lt.has_repetitions()
@@ -1,7 +1,19 @@
-from unittest import TestCase
+import timeit
+from unittest import TestCase, skipIf
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from musurgia.musurgia_exceptions import (
+    PermutationOrderTypeError,
+    PermutationOrderValueError,
+)
+from musurgia.permutation.algebra import get_permutation_power
 from musurgia.permutation.permutation import (
     permute,
+    Permuter,
     get_self_permutation_2d,
     get_self_permutation_3d,
 )
@@ -92,3 +104,113 @@ class TestPermutation(TestCase):
         [(4, 2, 3, 1), (1, 2, 3, 4), (4, 2, 3, 1), (1, 2, 3, 4)],
         [(1, 2, 3, 4), (1, 2, 3, 4), (4, 2, 3, 1), (4, 2, 3, 1)],
     ]
+
+    def test_get_permutation_power(self):
+        permutation_order = (3, 5, 1, 6, 2, 4)
+        self_permutations = get_self_permutation_2d(permutation_order)
+        for exponent in range(1, len(permutation_order) + 1):
+            assert (
+                get_permutation_power(permutation_order, exponent)
+                == self_permutations[exponent - 1]
+            )
+        assert get_permutation_power(permutation_order, 0) == (1, 2, 3, 4, 5, 6)
+        assert get_permutation_power(permutation_order, 6 * 1000 + 1) == (
+            permutation_order
+        )
+        assert get_permutation_power(permutation_order, -1) == (3, 5, 1, 6, 2, 4)
+        with self.assertRaises(TypeError):
+            get_permutation_power((1, 3), 2)
+
+
+class TestPermuter(TestCase):
+    def setUp(self):
+        self.permutation_order = (3, 2, 4, 1)
+        self.permuter = Permuter(self.permutation_order)
+
+    def test_errors(self):
+        with self.assertRaises(PermutationOrderTypeError) as context:
+            Permuter([3, 2, 4, 1])
+        assert isinstance(context.exception.__cause__, TypeError)
+        with self.assertRaises(PermutationOrderTypeError):
+            Permuter((3, 2, 4, 5))
+        with self.assertRaises(PermutationOrderValueError):
+            self.permuter.permute([1, 2, 3])
+        with self.assertRaises(PermutationOrderValueError):
+            self.permuter.permute((1, 2, 3, 4, 5))
+        with self.assertRaises(TypeError):
+            self.permuter.permute("abcd")
+
+    def test_permute_lists_and_tuples(self):
+        values = [10, 20, 30, 40]
+        assert self.permuter.permute(values) == permute(values, self.permutation_order)
+        assert self.permuter.permute(tuple(values)) == (30, 20, 40, 10)
+        assert Permuter((1,)).permute(["a"]) == ["a"]
+        assert Permuter((1,)).permute(("a",)) == ("a",)
+
+    def test_set_permutation_order(self):
+        self.permuter.permutation_order = (2, 1)
+        assert self.permuter.get_size() == 2
+        assert self.permuter.permute([1, 2]) == [2, 1]
+
+    def test_permute_many(self):
+        list_of_values = [[r * 10 + c for c in range(4)] for r in range(5)]
+        assert self.permuter.permute_many(list_of_values) == [
+            permute(values, self.permutation_order) for values in list_of_values
+        ]
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestPermuterArrays(TestCase):
+    def setUp(self):
+        self.permutation_order = (3, 2, 4, 1)
+        self.permuter = Permuter(self.permutation_order)
+        self.batch = np.arange(20).reshape(5, 4)
+
+    def test_permute_1d(self):
+        result = self.permuter.permute(np.array([10, 20, 30, 40]))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [30, 20, 40, 10]
+
+    def test_permute_batch(self):
+        result = self.permuter.permute(self.batch)
+        assert result.tolist() == [
+            permute(row, self.permutation_order) for row in self.batch.tolist()
+        ]
+
+    def test_permute_along_axis(self):
+        permuter = Permuter((5, 1, 2, 4, 3))
+        result = permuter.permute(self.batch, axis=0)
+        assert result.tolist() == permute(self.batch.tolist(), (5, 1, 2, 4, 3))
+        with self.assertRaises(PermutationOrderValueError):
+            self.permuter.permute(self.batch, axis=0)
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            self.permuter.permute(np.array(1))
+
+
+class TestPermuterTiming(TestCase):
+    def setUp(self):
+        self.permutation_order = tuple(range(20, 0, -1))
+        self.list_of_values = [list(range(r, r + 20)) for r in range(2000)]
+
+    def test_permute_many_timing(self):
+        permuter = Permuter(self.permutation_order)
+        permuter_duration = timeit.timeit(
+            lambda: permuter.permute_many(self.list_of_values), number=5
+        )
+        permute_duration = timeit.timeit(
+            lambda: [
+                permute(values, self.permutation_order)
+                for values in self.list_of_values
+            ],
+            number=5,
+        )
+        self.assertLess(permuter_duration, permute_duration)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_permute_array_timing(self):
+        permuter = Permuter(self.permutation_order)
+        batch = np.array(self.list_of_values)
+        duration = timeit.timeit(lambda: permuter.permute(batch), number=100)
+        self.assertLess(duration, 0.1)
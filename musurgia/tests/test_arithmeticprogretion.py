@@ -1,9 +1,15 @@
 from fractions import Fraction
-from unittest import TestCase
+import timeit
+from unittest import TestCase, skipIf
 
 from musurgia.arithmeticprogression import ArithmeticProgression
 from musurgia.musurgia_exceptions import DAndSError
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestArithmeticProgression(TestCase):
     def test_a1(self):
@@ -141,3 +147,86 @@ class TestArithmeticProgression(TestCase):
 
         with self.assertRaises(AttributeError):
             ArithmeticProgression(n=15, a1=1, an=20, d=10).__next__()
+
+    def test_get_terms(self):
+        for arith in [
+            ArithmeticProgression(a1=7, an=15, n=3),
+            ArithmeticProgression(a1=1, an=5, n=7),
+            ArithmeticProgression(a1=3, an=6, s=21, correct_s=True),
+            ArithmeticProgression(a1=15, n=1, an=30),
+        ]:
+            terms = list(arith)
+            assert arith.get_terms() == terms
+            assert arith.get_terms(1) == terms[1:]
+
+        arith = ArithmeticProgression(a1=1, d=2, n=5)
+        assert arith.get_terms(1, 3) == [Fraction(3, 1), Fraction(5, 1)]
+        assert arith.get_terms(-1) == [Fraction(9, 1)]
+        assert arith.get_terms(4, 10) == [Fraction(9, 1)]
+        assert arith.get_terms(5) == []
+
+        with self.assertRaises(AttributeError):
+            ArithmeticProgression(n=15, a1=1).get_terms()
+
+    def test_get_terms_does_not_change_iterator(self):
+        arith = ArithmeticProgression(a1=1, d=2, n=5)
+        assert next(arith) == Fraction(1, 1)
+        assert arith.get_terms() == [Fraction(x) for x in [1, 3, 5, 7, 9]]
+        assert arith[3] == Fraction(7, 1)
+        assert next(arith) == Fraction(3, 1)
+        assert arith.get_current_index() == 1
+
+    def test_get_item(self):
+        arith = ArithmeticProgression(a1=1, d=2, n=5)
+        assert arith[0] == Fraction(1, 1)
+        assert arith[4] == Fraction(9, 1)
+        assert arith[-2] == Fraction(7, 1)
+        assert arith[1:3] == [Fraction(3, 1), Fraction(5, 1)]
+        assert arith[::-2] == [Fraction(9, 1), Fraction(5, 1), Fraction(1, 1)]
+        with self.assertRaises(IndexError):
+            arith[5]
+        with self.assertRaises(IndexError):
+            arith[-6]
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_to_array(self):
+        arith = ArithmeticProgression(a1=3, an=6, s=21, correct_s=True)
+        array = arith.to_array()
+        assert array.dtype == np.float64
+        assert np.allclose(array, [float(x) for x in arith.get_terms()])
+        assert arith.to_array(dtype=object).tolist() == arith.get_terms()
+        assert np.allclose(
+            arith.to_array(start=1, stop=3), [float(x) for x in arith.get_terms(1, 3)]
+        )
+        assert ArithmeticProgression(a1=1, d=1, n=4).to_array(
+            dtype=np.int64
+        ).tolist() == [1, 2, 3, 4]
+        with self.assertRaises(ValueError):
+            arith.to_array(dtype=np.int64)
+
+
+class ArithmeticProgressionTiming(TestCase):
+    def setUp(self):
+        self.arith = ArithmeticProgression(a1=1, an=Fraction(1000, 7), n=10**4)
+
+    def test_get_terms_timing(self):
+        def iterate():
+            return list(ArithmeticProgression(a1=1, an=Fraction(1000, 7), n=10**4))
+
+        def get_terms():
+            return self.arith.get_terms()
+
+        assert iterate() == get_terms()
+        iterator_time = timeit.timeit(iterate, number=1)
+        get_terms_time = timeit.timeit(get_terms, number=1)
+        self.assertLess(get_terms_time, iterator_time)
+
+    def test_random_access_timing(self):
+        execution_time = timeit.timeit(lambda: self.arith[-1], number=100)
+        self.assertLess(execution_time, 0.1)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_to_array_timing(self):
+        arith = ArithmeticProgression(a1=1, an=Fraction(1000, 7), n=10**6)
+        execution_time = timeit.timeit(arith.to_array, number=1)
+        self.assertLess(execution_time, 1)
@@ -1,10 +1,18 @@
-from unittest import TestCase
+import timeit
+from unittest import TestCase, skipIf
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 from musurgia.matrix.matrix import (
+    ArrayMatrix,
     Matrix,
     MatrixIsEmptyError,
     SquareMatrix,
     PermutationOrderMatrix,
+    LazyPermutationOrderMatrix,
     PermutationOrderMatrixGenerator,
     MatrixIndexController,
 )
@@ -16,7 +24,7 @@ from musurgia.musurgia_exceptions import (
     PermutationOrderMatrixDataError,
     MatrixIndexControllerReadingDirectionError,
 )
-from musurgia.permutation.permutation import permute
+from musurgia.permutation.permutation import permute, get_self_permutation_3d
 
 
 class TestMatrix(TestCase):
@@ -172,6 +180,173 @@ class TestMatrix(TestCase):
     # def test_permute_columns(self):
     #     assert False
 
+    def test_transpose_matches_index_controller(self):
+        for number_of_rows, number_of_columns in [
+            (1, 1),
+            (1, 4),
+            (4, 1),
+            (3, 5),
+            (6, 4),
+        ]:
+            matrix = Matrix(
+                [
+                    [(r, c) for c in range(1, number_of_columns + 1)]
+                    for r in range(1, number_of_rows + 1)
+                ]
+            )
+            for mode, reading_direction in [
+                ("regular", "vertical"),
+                ("diagonal", "diagonal"),
+            ]:
+                controller = MatrixIndexController(
+                    number_of_rows=number_of_rows,
+                    number_of_columns=number_of_columns,
+                    reading_direction=reading_direction,
+                )
+                expected = [
+                    [next(controller) for _ in range(number_of_rows)]
+                    for _ in range(number_of_columns)
+                ]
+                assert matrix.get_transposed_matrix(mode=mode).matrix_data == expected
+        assert Matrix().get_transposed_matrix().matrix_data == []
+        with self.assertRaises(TypeError):
+            self.mat.get_transposed_matrix(mode="vertical")
+
+    def test_transposed_matrix_after_row_is_changed_in_place(self):
+        matrix = Matrix([[1, 2], [3, 4]])
+        assert matrix.get_transposed_matrix().matrix_data == [[1, 3], [2, 4]]
+        matrix.get_row(1)[0] = 99
+        assert matrix.get_transposed_matrix().matrix_data == [[99, 3], [2, 4]]
+        assert matrix.get_transposed_matrix(mode="diagonal").matrix_data == [
+            [99, 4],
+            [2, 3],
+        ]
+        matrix.matrix_data[1][1] = 100
+        assert matrix.get_transposed_matrix().matrix_data == [[99, 3], [2, 100]]
+
+    def test_transposed_matrix_after_changes(self):
+        transposed = self.mat.get_transposed_matrix()
+        transposed.add_row([7, 8])
+        transposed.matrix_data[0][0] = 100
+        assert self.mat.get_transposed_matrix().matrix_data == [[1, 4], [2, 5], [3, 6]]
+        self.mat.add_row([7, 8, 9])
+        assert self.mat.get_transposed_matrix().matrix_data == [
+            [1, 4, 7],
+            [2, 5, 8],
+            [3, 6, 9],
+        ]
+        assert self.mat.get_transposed_matrix(mode="diagonal").matrix_data == [
+            [1, 5, 9],
+            [2, 6, 7],
+            [3, 4, 8],
+        ]
+        self.mat.remove_row(1)
+        assert self.mat.get_transposed_matrix().matrix_data == [[4, 7], [5, 8], [6, 9]]
+        self.mat.matrix_data = [[1], [2]]
+        assert self.mat.get_transposed_matrix().matrix_data == [[1, 2]]
+        assert self.mat.get_column(1) == [1, 2]
+
+
+class TestMatrixTiming(TestCase):
+    def setUp(self):
+        self.matrix = Matrix([[(r, c) for c in range(1000)] for r in range(1000)])
+
+    def test_transpose_timing(self):
+        for mode in ["regular", "diagonal"]:
+            duration = timeit.timeit(
+                lambda: self.matrix.get_transposed_matrix(mode=mode), number=1
+            )
+            self.assertLess(duration, 1)
+
+    def test_get_column_timing(self):
+        duration = timeit.timeit(lambda: self.matrix.get_column(500), number=100)
+        self.assertLess(duration, 0.1)
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestArrayMatrix(TestCase):
+    def setUp(self):
+        self.mat = ArrayMatrix([[1, 2, 3], [4, 5, 6]])
+        self.list_mat = Matrix([[(r, c) for c in range(1, 5)] for r in range(1, 6)])
+        self.index_mat = ArrayMatrix(
+            [[10 * r + c for c in range(1, 5)] for r in range(1, 6)]
+        )
+
+    def test_init(self):
+        assert ArrayMatrix().is_empty
+        assert ArrayMatrix(np.zeros((2, 3))).get_row_size() == 3
+        assert ArrayMatrix([[1, 2]], dtype=float).dtype == np.float64
+        with self.assertRaises(TypeError):
+            ArrayMatrix([[1, 2], [3]])
+        with self.assertRaises(TypeError):
+            ArrayMatrix(np.zeros(3))
+
+    def test_rows_and_columns_are_views(self):
+        row = self.mat.get_row(2)
+        column = self.mat.get_column(3)
+        assert row.tolist() == [4, 5, 6]
+        assert column.tolist() == [3, 6]
+        assert np.shares_memory(row, self.mat.matrix_data)
+        assert np.shares_memory(column, self.mat.matrix_data)
+        with self.assertRaises(TypeError):
+            self.mat.get_column(0)
+        with self.assertRaises(ValueError):
+            self.mat.get_column(4)
+        with self.assertRaises(MatrixIsEmptyError):
+            ArrayMatrix().get_row(1)
+
+    def test_get_element(self):
+        assert self.mat.get_element((2, 2)) == 5
+        with self.assertRaises(MatrixIndexOutOfRangeError):
+            self.mat.get_element((3, 3))
+        assert self.index_mat.get_elements([(1, 1), (5, 4), (3, 2)]).tolist() == [
+            11,
+            54,
+            32,
+        ]
+        assert self.index_mat.get_elements(np.array([[2, 3]])).tolist() == [23]
+        with self.assertRaises(MatrixIndexOutOfRangeError):
+            self.index_mat.get_elements([(6, 1)])
+        with self.assertRaises(ValueError):
+            self.index_mat.get_elements([(0, 1)])
+
+    def test_transpose(self):
+        for mode in ["regular", "diagonal"]:
+            expected = [
+                [10 * r + c for r, c in row]
+                for row in self.list_mat.get_transposed_matrix(mode=mode).matrix_data
+            ]
+            transposed = self.index_mat.get_transposed_matrix(mode=mode)
+            assert isinstance(transposed, ArrayMatrix)
+            assert transposed.matrix_data.tolist() == expected
+        assert ArrayMatrix().get_transposed_matrix(mode="diagonal").is_empty
+
+    def test_add_and_remove_rows(self):
+        matrix = ArrayMatrix()
+        matrix.add_row([1, 2])
+        matrix.add_row(np.array([3, 4]))
+        assert matrix.matrix_data.tolist() == [[1, 2], [3, 4]]
+        with self.assertRaises(ValueError):
+            matrix.add_row([1, 2, 3])
+        with self.assertRaises(TypeError):
+            matrix.add_row((1, 2))
+        assert matrix.remove_row(1).tolist() == [1, 2]
+        assert matrix.matrix_data.tolist() == [[3, 4]]
+
+    def test_conversion(self):
+        array_matrix = ArrayMatrix.from_matrix(self.mat.to_matrix(), dtype=np.int32)
+        assert array_matrix.dtype == np.int32
+        assert array_matrix.to_matrix().matrix_data == [[1, 2, 3], [4, 5, 6]]
+        assert isinstance(array_matrix.to_matrix(), Matrix)
+
+    def test_transpose_timing(self):
+        matrix = ArrayMatrix(np.arange(10**6).reshape(1000, 1000))
+        for mode in ["regular", "diagonal"]:
+            duration = timeit.timeit(
+                lambda: matrix.get_transposed_matrix(mode=mode), number=1
+            )
+            self.assertLess(duration, 0.1)
+
 
 class TestSquareMatrix(TestCase):
     def test_init_errors(self):
@@ -253,6 +428,79 @@ class TestPermutationOrderMatrix(TestCase):
         PermutationOrderMatrix(matrix_data=[[(1, 2), (1, 2)], [(2, 1), (1, 2)]])
 
 
+class TestLazyPermutationOrderMatrix(TestCase):
+    def setUp(self):
+        self.main_permutation_order = (4, 7, 1, 6, 2, 3, 5)
+        self.expected = get_self_permutation_3d(self.main_permutation_order)
+        self.lpom = LazyPermutationOrderMatrix(
+            main_permutation_order=self.main_permutation_order
+        )
+
+    def test_init_errors(self):
+        with self.assertRaises(TypeError):
+            LazyPermutationOrderMatrix(main_permutation_order=(1, 3))
+        with self.assertRaises(TypeError):
+            LazyPermutationOrderMatrix(main_permutation_order=(2, 1), cache_size=-1)
+
+    def test_generator(self):
+        lpom = PermutationOrderMatrixGenerator(
+            main_permutation_order=self.main_permutation_order
+        ).generate_permutation_order_matrix(lazy=True)
+        assert isinstance(lpom, LazyPermutationOrderMatrix)
+        assert isinstance(lpom, PermutationOrderMatrix)
+
+    def test_get_element(self):
+        for r in range(1, 8):
+            for c in range(1, 8):
+                assert self.lpom.get_element((r, c)) == self.expected[r - 1][c - 1]
+        with self.assertRaises(MatrixIndexOutOfRangeError):
+            self.lpom.get_element((8, 1))
+
+    def test_only_touched_elements_are_calculated(self):
+        self.lpom.get_element((3, 5))
+        self.lpom.get_element((3, 5))
+        self.lpom.get_element((7, 1))
+        info = self.lpom.get_cache_info()
+        assert info["misses"] == 2
+        assert info["hits"] == 1
+        assert info["currsize"] == 2
+        assert self.lpom._matrix_data == []
+
+    def test_cache_size(self):
+        lpom = LazyPermutationOrderMatrix(
+            main_permutation_order=self.main_permutation_order, cache_size=2
+        )
+        assert lpom.get_row(1) == self.expected[0]
+        assert lpom.get_cache_info()["currsize"] == 2
+
+    def test_get_row_and_column(self):
+        assert self.lpom.get_size() == 7
+        assert self.lpom.get_row(4) == self.expected[3]
+        assert self.lpom.get_column(2) == [row[1] for row in self.expected]
+        with self.assertRaises(ValueError):
+            self.lpom.get_row(8)
+        with self.assertRaises(ValueError):
+            self.lpom.get_column(8)
+
+    def test_matrix_data(self):
+        assert self.lpom.matrix_data == self.expected
+        with self.assertRaises(AttributeError):
+            self.lpom.matrix_data = self.expected
+
+    def test_transposed_matrix(self):
+        pom = PermutationOrderMatrix(matrix_data=self.expected)
+        for mode in ["regular", "diagonal"]:
+            transposed = self.lpom.get_transposed_matrix(mode=mode)
+            assert type(transposed) is PermutationOrderMatrix
+            assert transposed.matrix_data == pom.get_transposed_matrix(mode).matrix_data
+
+    def test_large_size(self):
+        main_permutation_order = tuple(range(2, 51)) + (1,)
+        lpom = LazyPermutationOrderMatrix(main_permutation_order=main_permutation_order)
+        assert lpom.get_element((1, 1)) == main_permutation_order
+        assert lpom.get_element((50, 50)) == (50,) + tuple(range(1, 50))
+
+
 class TestMatrixIndexController(TestCase):
     def test_get_next(self):
         with self.assertRaises(MatrixIndexOutOfRangeError):
@@ -420,6 +668,59 @@ class TestMatrixIndexController(TestCase):
             assert controller.get_next_flatten_index() == x
             next(controller)
 
+    @skipIf(np is None, "numpy is not installed")
+    def test_get_indices(self):
+        for number_of_rows, number_of_columns in [(1, 1), (2, 3), (5, 4), (4, 7)]:
+            for reading_direction in ["horizontal", "vertical", "diagonal"]:
+                for first_index in [(1, 1), (number_of_rows, 1)]:
+                    controller = MatrixIndexController(
+                        number_of_rows=number_of_rows,
+                        number_of_columns=number_of_columns,
+                        reading_direction=reading_direction,
+                        first_index=first_index,
+                    )
+                    bulk_controller = MatrixIndexController(
+                        number_of_rows=number_of_rows,
+                        number_of_columns=number_of_columns,
+                        reading_direction=reading_direction,
+                        first_index=first_index,
+                    )
+                    expected = [list(index) for index in controller]
+                    assert bulk_controller.get_indices(1).tolist() == expected[:1]
+                    assert bulk_controller.get_indices().tolist() == expected[1:]
+                    assert bulk_controller.get_indices().tolist() == []
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_get_indices_errors(self):
+        controller = MatrixIndexController(number_of_rows=2, number_of_columns=2)
+        with self.assertRaises(TypeError):
+            controller.get_indices(-1)
+        with self.assertRaises(MatrixIndexEndOfMatrixError):
+            controller.get_indices(5)
+        assert controller.get_indices(4).tolist() == [[1, 1], [1, 2], [2, 1], [2, 2]]
+        with self.assertRaises(MatrixIndexEndOfMatrixError):
+            next(controller)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_read(self):
+        matrix = Matrix([[1, 2, 3], [4, 5, 6]])
+        controller = MatrixIndexController(
+            number_of_rows=2, number_of_columns=3, reading_direction="diagonal"
+        )
+        assert controller.read(matrix, 2) == [1, 5]
+        assert controller.read(ArrayMatrix(matrix.matrix_data)).tolist() == [2, 6, 3, 4]
+        with self.assertRaises(ValueError):
+            controller.read(Matrix([[1, 2], [3, 4]]))
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_read_timing(self):
+        matrix = ArrayMatrix(np.arange(10**6).reshape(1000, 1000))
+        controller = MatrixIndexController(
+            number_of_rows=1000, number_of_columns=1000, reading_direction="diagonal"
+        )
+        duration = timeit.timeit(lambda: controller.read(matrix), number=1)
+        self.assertLess(duration, 0.5)
+
     def test_reading_direction(self):
         controller = MatrixIndexController(2, 3)
         assert controller.reading_direction == "horizontal"
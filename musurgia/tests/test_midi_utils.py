@@ -0,0 +1,58 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from musicscore.metronome import Metronome
+
+from musurgia.midi_utils import (
+    MidiTrack,
+    encode_variable_length_quantity,
+    get_microseconds_per_quarter,
+    write_midi_file,
+)
+from musurgia.tests.helpers import read_midi_file
+
+
+class TestMidiUtils(TestCase):
+    def test_variable_length_quantity(self):
+        for value, expected in [
+            (0, "00"),
+            (0x7F, "7f"),
+            (0x80, "8100"),
+            (0x2000, "c000"),
+            (0x3FFF, "ff7f"),
+            (0x4000, "818000"),
+            (0x0FFFFFFF, "ffffff7f"),
+        ]:
+            assert encode_variable_length_quantity(value).hex() == expected
+
+    def test_microseconds_per_quarter(self):
+        assert get_microseconds_per_quarter(Metronome(120)) == 500000
+        assert get_microseconds_per_quarter(Metronome(90, 1.5)) == 444444
+
+    def test_track_order(self):
+        track = MidiTrack()
+        track.add_note_on(10, 60, 80)
+        with self.assertRaises(ValueError):
+            track.add_note_off(5, 60)
+
+    def test_write_midi_file(self):
+        tempo_track = MidiTrack()
+        tempo_track.add_tempo(0, 500000)
+        track = MidiTrack(channel=2)
+        track.add_track_name(0, "part")
+        track.add_note_on(0, 60, 80)
+        track.add_note_off(1000, 60)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "test.mid"
+            write_midi_file(path, [tempo_track, track])
+            ticks_per_quarter, tracks = read_midi_file(path)
+        assert ticks_per_quarter == 960
+        assert tracks == [
+            [(0, b"\xff\x51\x03\x07\xa1\x20")],
+            [
+                (0, b"\xff\x03\x04part"),
+                (0, b"\x92\x3c\x50"),
+                (1000, b"\x82\x3c\x00"),
+            ],
+        ]
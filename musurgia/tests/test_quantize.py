@@ -1,10 +1,42 @@
-from unittest import TestCase
+import itertools
+import math
+import random
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
 from fractions import Fraction
 
 from musicscore.util import dToX, xToD
 
-from musurgia.quantize import get_quantized_values, find_best_quantized_values
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from musurgia.quantize import (
+    get_quantized_values,
+    find_best_quantized_values,
+    get_quantized_positions,
+    _evaluate_grid,
+    _get_positions,
+    get_quantization_ranking,
+    StreamingQuantizer,
+    clear_quantization_cache,
+    get_quantization_cache_info,
+    set_quantization_cache_size,
+)
+from musurgia.musurgia_types import convert_to_fraction
+from musurgia.utils import RelativeValueGenerator
+
+
+def _get_brute_force_quantized_positions(positions, grid_size):
+    grid_size = convert_to_fraction(grid_size)
+    first_index = math.ceil(min(positions) / grid_size)
+    last_index = max(first_index, math.floor(max(positions) / grid_size))
+    grid = [index * grid_size for index in range(first_index, last_index + 1)]
+    return [min(grid, key=lambda location: abs(location - p)) for p in positions]
 
 
 class Test(TestCase):
@@ -73,3 +105,298 @@ class Test(TestCase):
         ]
 
         self.assertEqual(expected, actual)
+
+    def test_quantized_positions_ties(self):
+        assert get_quantized_positions(
+            [Fraction(0), Fraction(1, 2), 1.5, 2, Fraction(5, 2), 3], 1
+        ) == [0, 0, 1, 2, 2, 3]
+
+    def test_quantized_positions_match_brute_force(self):
+        r = random.Random(1)
+        for _ in range(500):
+            grid_size = r.choice([1, 0.5, 0.6, Fraction(1, 3), Fraction(1, 32), 2])
+            positions = [
+                r.choice(
+                    [
+                        Fraction(r.randint(-40, 40), r.choice([1, 2, 3, 4, 8])),
+                        round(r.uniform(-5, 5), r.randint(0, 3)),
+                        r.randint(-5, 5),
+                    ]
+                )
+                for _ in range(r.randint(1, 12))
+            ]
+            assert get_quantized_positions(
+                positions, grid_size
+            ) == _get_brute_force_quantized_positions(positions, grid_size)
+
+    def test_find_best_stops_at_zero_delta(self):
+        values = [Fraction(1, 4), Fraction(1, 2), Fraction(1, 4)]
+        with patch(
+            "musurgia.quantize._evaluate_grid", side_effect=_evaluate_grid
+        ) as evaluate_grid:
+            actual = find_best_quantized_values(
+                values, [1, Fraction(1, 4), Fraction(1, 8), Fraction(1, 16)]
+            )
+        assert actual == values
+        assert evaluate_grid.call_count == 2
+
+    def test_find_best_with_max_workers(self):
+        r = random.Random(3)
+        values = [Fraction(r.randint(1, 100), 60) for _ in range(200)]
+        grids = [Fraction(1, n) for n in range(1, 9)]
+        for check_sum in [False, True]:
+            try:
+                expected = find_best_quantized_values(values, grids, check_sum)
+            except AttributeError:
+                continue
+            assert (
+                find_best_quantized_values(values, grids, check_sum, max_workers=2)
+                == expected
+            )
+        assert (
+            find_best_quantized_values(
+                [Fraction(1, 2)] * 4, [1, Fraction(1, 2), Fraction(1, 4)], max_workers=2
+            )
+            == [Fraction(1, 2)] * 4
+        )
+
+    def test_max_workers_get_values_once(self):
+        values = [Fraction(1, 3), Fraction(2, 3), Fraction(1, 2)]
+        with patch(
+            "musurgia.quantize.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as executor_class:
+            get_quantization_ranking(
+                values, [Fraction(1, 2), Fraction(1, 3)], check_sum=False, max_workers=2
+            )
+        kwargs = executor_class.call_args.kwargs
+        assert kwargs["initargs"] == (values, _get_positions(values))
+        assert kwargs["mp_context"].get_start_method() == "spawn"
+
+    def test_quantization_ranking(self):
+        values = [0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+        units = [0.5, 0.7, 0.2]
+        ranking = get_quantization_ranking(values, units, check_sum=False)
+        assert [grid for grid, _ in ranking] == [0.2, 0.5, 0.7]
+        assert [float(delta) for _, delta in ranking] == [
+            float(
+                sum(
+                    abs(q - v)
+                    for q, v in zip(get_quantized_values(values, grid), values)
+                )
+            )
+            for grid in [0.2, 0.5, 0.7]
+        ]
+        assert (
+            get_quantization_ranking(values, units, check_sum=False, max_workers=2)
+            == ranking
+        )
+        ranking = get_quantization_ranking(
+            [Fraction(1, 2), Fraction(1, 2)], [Fraction(1, 2), 1, Fraction(1, 3)]
+        )
+        assert ranking == [
+            (Fraction(1, 2), 0),
+            (Fraction(1, 3), Fraction(1, 3)),
+            (1, 1),
+        ]
+
+
+class TestStreamingQuantizer(TestCase):
+    def test_grid_size(self):
+        with self.assertRaises(TypeError):
+            StreamingQuantizer(grid_size="1/4")
+        with self.assertRaises(ValueError):
+            StreamingQuantizer(grid_size=0)
+        quantizer = StreamingQuantizer(grid_size=0.5)
+        assert quantizer.grid_size == Fraction(1, 2)
+
+    def test_matches_get_quantized_values(self):
+        r = random.Random(4)
+        for grid_size in [Fraction(1, 4), Fraction(1, 3), Fraction(1, 8)]:
+            values = [Fraction(r.randint(1, 24), 12) for _ in range(50)]
+            # the sum must lie on the grid, otherwise get_quantized_values rounds the last position down
+            values.append(grid_size - sum(values) % grid_size)
+            quantizer = StreamingQuantizer(grid_size=grid_size)
+            assert list(quantizer.iterate(values)) == get_quantized_values(
+                values, grid_size
+            )
+            assert quantizer.error == 0
+
+    def test_error_is_carried_forward(self):
+        r = random.Random(5)
+        quantizer = StreamingQuantizer(grid_size=Fraction(1, 4))
+        values = [Fraction(r.randint(1, 100), 70) for _ in range(200)]
+        quantized_sum = Fraction(0)
+        for value in values:
+            quantized_sum += quantizer.quantize(value)
+            assert quantized_sum == quantizer.quantized_position
+            assert abs(quantizer.error) <= Fraction(1, 8)
+        assert quantizer.position == sum(values)
+        quantizer.reset()
+        assert quantizer.position == quantizer.quantized_position == 0
+
+    def test_float_values(self):
+        quantizer = StreamingQuantizer(grid_size=1)
+        assert list(quantizer.iterate([0.5, 0.5, 0.5, 0.5, 1.4])) == [0, 1, 0, 1, 1]
+
+    def test_change_grid_size(self):
+        quantizer = StreamingQuantizer(grid_size=1)
+        assert quantizer.quantize(Fraction(3, 4)) == 1
+        quantizer.grid_size = Fraction(1, 4)
+        assert quantizer.quantize(Fraction(1, 3)) == 0
+        assert quantizer.error == Fraction(-1, 12)
+
+    def test_infinite_stream(self):
+        durations = itertools.cycle([Fraction(1, 3), Fraction(1, 5), Fraction(2, 7)])
+        quantizer = StreamingQuantizer(grid_size=Fraction(1, 8))
+        quantized = list(itertools.islice(quantizer.iterate(durations), 10000))
+        assert len(quantized) == 10000
+        assert abs(sum(quantized) - quantizer.position) <= Fraction(1, 16)
+
+
+class TestQuantizationCache(TestCase):
+    def setUp(self):
+        clear_quantization_cache()
+
+    def tearDown(self):
+        set_quantization_cache_size(1024)
+
+    def test_cached_results(self):
+        r = random.Random(6)
+        for _ in range(200):
+            grid_size = r.choice([1, 0.5, 0.6, Fraction(1, 3), Fraction(1, 32)])
+            positions = [
+                r.choice(
+                    [
+                        Fraction(r.randint(-40, 40), r.choice([1, 2, 3, 8])),
+                        r.uniform(-5, 5),
+                    ]
+                )
+                for _ in range(r.randint(1, 10))
+            ]
+            expected = get_quantized_positions(positions, grid_size)
+            assert get_quantized_positions(positions, grid_size, cache=True) == expected
+            assert get_quantized_positions(positions, grid_size, cache=True) == expected
+        values = [Fraction(1, 3), Fraction(1, 5), Fraction(2, 7)]
+        assert get_quantized_values(values, 0.25, cache=True) == get_quantized_values(
+            values, 0.25
+        )
+
+    def test_scaled_inputs_share_entries(self):
+        positions = [Fraction(0), Fraction(1, 3), Fraction(5, 6), Fraction(2)]
+        for factor in [1, 2, Fraction(1, 3), 10]:
+            scaled_positions = [position * factor for position in positions]
+            grid_size = Fraction(1, 4) * factor
+            assert get_quantized_positions(
+                scaled_positions, grid_size, cache=True
+            ) == get_quantized_positions(scaled_positions, grid_size)
+        info = get_quantization_cache_info()
+        assert (info["hits"], info["misses"], info["currsize"]) == (3, 1, 1)
+        assert info["hit_rate"] == 0.75
+
+    def test_cache_size(self):
+        set_quantization_cache_size(2)
+        assert get_quantization_cache_info()["hit_rate"] is None
+        for grid_size in [1, 2, 3, 1]:
+            get_quantized_positions([0.5, 1.5, 7.5], grid_size, cache=True)
+        info = get_quantization_cache_info()
+        assert (info["hits"], info["misses"], info["currsize"]) == (0, 4, 2)
+        clear_quantization_cache()
+        assert get_quantization_cache_info()["currsize"] == 0
+
+    def test_relative_value_generator_uses_cache(self):
+        for _ in range(5):
+            RelativeValueGenerator(
+                value_range=(60, 72),
+                directions=[1, -1, 1, 1],
+                proportions=[1, 3, 2, 4],
+                value_grid=0.5,
+            ).get_values()
+        info = get_quantization_cache_info()
+        assert (info["hits"], info["misses"]) == (4, 1)
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestQuantizeArray(TestCase):
+    def test_quantized_positions_of_float_array(self):
+        r = random.Random(1)
+        for grid_size in [1, 0.6, Fraction(1, 3), Fraction(1, 32)]:
+            positions = [r.uniform(-5, 5) for _ in range(50)]
+            actual = get_quantized_positions(np.array(positions), grid_size)
+            assert isinstance(actual, np.ndarray)
+            expected = [float(p) for p in get_quantized_positions(positions, grid_size)]
+            assert np.allclose(actual, expected)
+
+    def test_quantized_positions_of_tick_array(self):
+        ticks = np.array([0, 5, 12, 15, 20, 31, 33], dtype=np.int64)
+        actual = get_quantized_positions(ticks, 10)
+        assert actual.dtype == np.int64
+        assert actual.tolist() == get_quantized_positions(ticks.tolist(), 10)
+        assert actual.tolist() == [0, 0, 10, 10, 20, 30, 30]
+
+    def test_exact(self):
+        values = np.array([0.2, 0.333, 0.6, 0.99, 0.1, 0.5])
+        actual = get_quantized_values(values, 0.6, exact=True)
+        assert actual == get_quantized_values(values.tolist(), 0.6)
+        assert all(isinstance(value, Fraction) for value in actual)
+        actual = find_best_quantized_values(values, [0.5, 0.7], False, exact=True)
+        assert actual == find_best_quantized_values(values.tolist(), [0.5, 0.7], False)
+
+    def test_quantized_values_of_array(self):
+        values = [0.2, 0.333, 0.6, 0.99, 0.1, 0.5]
+        actual = get_quantized_values(np.array(values), 0.6)
+        assert np.allclose(actual, [0, 0.6, 0.6, 1.2, 0, 0])
+        ticks = np.array([3, 7, 7, 2, 1, 12])
+        actual = get_quantized_values(ticks, 4)
+        assert actual.tolist() == get_quantized_values(ticks.tolist(), 4)
+        assert actual.sum() == 32
+
+    def test_find_best_quantized_values_of_array(self):
+        values = [0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+        units = [0.5, 0.7, 0.2]
+        actual = find_best_quantized_values(
+            np.array(values), list_of_grids=units, check_sum=False
+        )
+        assert np.allclose(actual, [0.2, 0.2, 0.4, 0.6, 0.6, 0.6, 0.8])
+        actual = find_best_quantized_values(np.array([0.3, 0.3, 0.4]), [0.3, 0.5])
+        assert np.allclose(actual, [0.5, 0.0, 0.5])
+        ticks = np.array([5, 10, 20, 45])
+        actual = find_best_quantized_values(ticks, [7, 4, 10, 5])
+        assert actual.tolist() == [5, 10, 20, 45]
+        with self.assertRaises(AttributeError):
+            find_best_quantized_values(ticks, [7, 3])
+
+    def test_quantization_ranking_of_array(self):
+        ticks = np.array([5, 10, 20, 45])
+        ranking = get_quantization_ranking(ticks, [7, 4, 10, 5])
+        assert ranking == get_quantization_ranking(ticks.tolist(), [7, 4, 10, 5])
+        assert [grid for grid, _ in ranking] == [5, 4, 10]
+
+    def test_find_best_quantized_values_of_array_matches_lists(self):
+        r = random.Random(2)
+        for _ in range(50):
+            ticks = [r.randint(1, 40) for _ in range(20)]
+            grids = [r.randint(1, 12) for _ in range(5)]
+            actual = find_best_quantized_values(np.array(ticks), grids, check_sum=False)
+            assert actual.tolist() == find_best_quantized_values(
+                ticks, grids, check_sum=False
+            )
+
+
+class TestQuantizeTiming(TestCase):
+    def test_quantize_positions_timing(self):
+        r = random.Random(1)
+        positions = [Fraction(r.randint(0, 10**6), 1000) for _ in range(10**5)]
+        duration = timeit.timeit(
+            lambda: get_quantized_positions(positions, Fraction(1, 32)), number=1
+        )
+        self.assertLess(duration, 3)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_find_best_quantized_values_array_timing(self):
+        values = np.random.default_rng(1).uniform(0, 1, 10**5)
+        grids = [Fraction(1, n) for n in range(1, 33)]
+        duration = timeit.timeit(
+            lambda: find_best_quantized_values(values, grids, check_sum=False),
+            number=1,
+        )
+        self.assertLess(duration, 1)
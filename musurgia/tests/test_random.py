@@ -1,3 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import random
+import timeit
+import tracemalloc
 import unittest
 from musurgia.magicrandom import MagicRandom
 
@@ -22,15 +27,15 @@ class TestRandom(unittest.TestCase):
         previous_forbidden_list = r.forbidden_list[:]
         el1 = next(r)
         assert el1 not in previous_forbidden_list
-        assert r.forbidden_list == [2, 3, 1] + [el1]
+        assert r.forbidden_list == (2, 3, 1, el1)
         previous_forbidden_list = r.forbidden_list[:]
         el2 = next(r)
         assert r not in previous_forbidden_list
-        assert r.forbidden_list == [3, 1] + [el1, el2]
+        assert r.forbidden_list == (3, 1, el1, el2)
         previous_forbidden_list = r.forbidden_list[:]
         el3 = next(r)
         assert el3 not in previous_forbidden_list
-        assert r.forbidden_list == [1] + [el1, el2, el3]
+        assert r.forbidden_list == (1, el1, el2, el3)
 
     def test_periodicity(self):
         with self.assertRaises(TypeError):
@@ -62,45 +67,242 @@ class TestRandom(unittest.TestCase):
         assert [r.__next__() for _ in range(20)] == [
             3,
             2,
+            4,
+            3,
             1,
             5,
             3,
+            2,
             1,
             4,
             3,
-            2,
-            4,
             5,
-            3,
-            2,
-            4,
             1,
+            4,
+            2,
             5,
             4,
             1,
+            2,
             3,
-            5,
         ]
 
         assert r.get_previous_elements() == [
             3,
             2,
+            4,
+            3,
             1,
             5,
             3,
+            2,
             1,
             4,
             3,
-            2,
-            4,
             5,
-            3,
-            2,
-            4,
             1,
+            4,
+            2,
             5,
             4,
             1,
+            2,
             3,
-            5,
         ]
+
+    def test_independent_streams(self):
+        first = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        second = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        first_values = []
+        second_values = []
+        for _ in range(20):
+            first_values.append(next(first))
+            second_values.append(next(second))
+        assert first_values == second_values
+        assert first.current_random is not second.current_random
+
+    def test_seed_does_not_change_global_random(self):
+        random.seed(1)
+        expected = [random.random() for _ in range(3)]
+        random.seed(1)
+        r = MagicRandom(pool=[1, 2, 3], seed=20)
+        [next(r) for _ in range(10)]
+        r.seed = 30
+        assert [random.random() for _ in range(3)] == expected
+
+    def test_spawn(self):
+        with self.assertRaises(TypeError):
+            MagicRandom(pool=[1, 2, 3]).spawn(0)
+        r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        children = r.spawn(3)
+        assert len({child.seed for child in children}) == 3
+        for child in children:
+            assert child.pool == r.pool
+            assert child.periodicity == r.periodicity
+            assert child.counter == 0
+            assert child.pool is not r.pool
+        # spawning again creates new children
+        assert r.spawn(1)[0].seed not in [child.seed for child in children]
+        # same seed spawns same children
+        assert [
+            child.seed
+            for child in MagicRandom(
+                pool=[1, 3, 2, 4, 5], periodicity=2, seed=20
+            ).spawn(3)
+        ] == [child.seed for child in children]
+        # spawning does not change parent's series
+        not_spawned = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        assert [next(r) for _ in range(20)] == [next(not_spawned) for _ in range(20)]
+
+    def test_spawn_without_seed(self):
+        r = MagicRandom(pool=[1, 2, 3, 4])
+        first, second = r.spawn(2)
+        assert first.seed != second.seed
+        assert first.seed is not None
+
+    def test_spawn_parallel_reproducible(self):
+        def generate(magic_random):
+            return [next(magic_random) for _ in range(1000)]
+
+        def generate_in_parallel():
+            children = MagicRandom(pool=list(range(12)), seed=5).spawn(4)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                return list(executor.map(generate, children))
+
+        first_run = generate_in_parallel()
+        second_run = generate_in_parallel()
+        assert first_run == second_run
+        sequential_run = [
+            generate(child)
+            for child in MagicRandom(pool=list(range(12)), seed=5).spawn(4)
+        ]
+        assert first_run == sequential_run
+
+    def test_pickle(self):
+        r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        [next(r) for _ in range(5)]
+        copied = pickle.loads(pickle.dumps(r))
+        assert [next(copied) for _ in range(10)] == [next(r) for _ in range(10)]
+
+    def test_take(self):
+        with self.assertRaises(TypeError):
+            MagicRandom(pool=[1, 2, 3]).take(-1)
+        r = MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20)
+        assert r.take(0) == []
+        values = r.take(10) + r.take(10)
+        assert values == MagicRandom(pool=[1, 3, 2, 4, 5], periodicity=2, seed=20).take(
+            20
+        )
+        assert r.counter == 20
+        assert r.get_previous_elements() == values
+
+    def test_periodicity_is_respected(self):
+        for pool_size, periodicity in [(5, 2), (6, 4), (10, 9), (7, 0), (8, 3)]:
+            forbidden_list = [0, 1, 2][:periodicity]
+            r = MagicRandom(
+                pool=list(range(pool_size)),
+                periodicity=periodicity,
+                forbidden_list=forbidden_list,
+                seed=1,
+            )
+            values = forbidden_list + r.take(2000)
+            for index, value in enumerate(values):
+                assert value not in values[max(0, index - periodicity) : index]
+            assert set(values) == set(range(pool_size))
+
+    def test_change_periodicity_and_pool(self):
+        r = MagicRandom(pool=[1, 2, 3, 4, 5, 6], periodicity=4, seed=3)
+        r.take(10)
+        r.periodicity = 2
+        values = r.get_previous_elements()[-4:] + r.take(100)
+        assert len(r.forbidden_list) == 2
+        for index, value in enumerate(values[4:], 4):
+            assert value not in values[index - 2 : index]
+        r.pool = [7, 8, 9]
+        assert set(r.take(10)) == {7, 8, 9}
+
+    def test_change_pool_and_forbidden_list_in_place(self):
+        r = MagicRandom(pool=[1, 2, 3], periodicity=1, seed=3)
+        r.take(10)
+        r.pool.remove(1)
+        r.pool.append(4)
+        assert set(r.take(20)) == {2, 3, 4}
+        with self.assertRaises(AttributeError):
+            r.forbidden_list.append(1)
+
+    def test_history_size(self):
+        with self.assertRaises(TypeError):
+            MagicRandom(pool=[1, 2, 3], history_size=-1)
+        unbounded = MagicRandom(pool=list(range(10)), seed=4)
+        bounded = MagicRandom(pool=list(range(10)), seed=4, history_size=7)
+        assert unbounded.history_size is None
+        assert bounded.history_size == 7
+        for number_of_elements in [0, 3, 4, 10, 100]:
+            unbounded.take(number_of_elements)
+            bounded.take(number_of_elements)
+            assert (
+                bounded.get_previous_elements()
+                == (unbounded.get_previous_elements()[-7:])
+            )
+            assert bounded.get_element_counts() == unbounded.get_element_counts()
+            assert bounded.counter == unbounded.counter
+
+        all_elements = unbounded.get_previous_elements()
+        unbounded.history_size = 20
+        assert unbounded.get_previous_elements() == all_elements[-20:]
+        bounded.history_size = None
+        bounded.take(5)
+        assert len(bounded.get_previous_elements()) == 12
+
+    def test_history_size_zero(self):
+        r = MagicRandom(pool=["a", "b", "c"], periodicity=1, seed=20, history_size=0)
+        r.take(100)
+        assert r.get_previous_elements() == []
+        assert r.counter == 100
+        assert sum(r.get_element_counts().values()) == 100
+
+    def test_history_with_changing_pool_types(self):
+        r = MagicRandom(pool=[1, 2, 3], seed=1, history_size=4)
+        values = r.take(3)
+        r.pool = ["a", "b"]
+        values += r.take(2)
+        r.pool = [0.5, 1.5]
+        values += r.take(1)
+        r.pool = [2**70, 2**71]
+        values += r.take(1)
+        assert r.get_previous_elements() == values[-4:]
+        assert [type(value) for value in r.get_previous_elements()] == [
+            type(value) for value in values[-4:]
+        ]
+
+    def test_history_of_float_pool(self):
+        r = MagicRandom(pool=[60.0, 61.5, 63.0], seed=1)
+        values = r.take(20)
+        assert r.get_previous_elements() == values
+        assert all(isinstance(value, float) for value in values)
+
+    def test_bounded_history_memory(self):
+        def get_peak_memory(number_of_elements):
+            r = MagicRandom(pool=list(range(60, 85)), seed=1, history_size=100)
+            tracemalloc.start()
+            for _ in range(number_of_elements // 1000):
+                r.take(1000)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+
+        assert get_peak_memory(100000) < 2 * get_peak_memory(10000)
+
+
+class TestRandomTiming(unittest.TestCase):
+    def test_take_timing_with_large_pool(self):
+        for pool_size in [1000, 5000]:
+            r = MagicRandom(
+                pool=list(range(pool_size)), periodicity=pool_size - 1, seed=1
+            )
+            execution_time = timeit.timeit(lambda: r.take(10000), number=1)
+            self.assertLess(execution_time, 1)
+            values = r.get_previous_elements()
+            # periodicity len(pool) - 1 repeats permutations of the pool
+            assert sorted(values[:pool_size]) == list(range(pool_size))
+            assert sorted(values[pool_size : 2 * pool_size]) == list(range(pool_size))
@@ -1,10 +1,61 @@
 from fractions import Fraction
 import math
-from unittest import TestCase
+import random
+import timeit
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
 from musicscore.util import xToD
 
-from musurgia.utils import Normalizer, RelativeValueGenerator
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from musurgia.quantize import get_quantized_positions
+from musurgia.utils import (
+    dToX,
+    xToD as musurgia_xToD,
+    convert_to_ticks,
+    convert_ticks_to_fractions,
+    Normalizer,
+    RelativeValueGenerator,
+    get_relative_values_batch,
+    flatten,
+    iterate_flatten,
+)
+
+
+def _get_random_generator_arguments(number_of_generators, seed=1):
+    r = random.Random(seed)
+    arguments = []
+    for _ in range(number_of_generators):
+        number_of_values = r.randint(2, 7)
+        arguments.append(
+            (
+                (r.choice([48, 60, Fraction(121, 2)]), r.choice([72, 84, 73.5])),
+                [r.choice([1, -1]) for _ in range(number_of_values)],
+                [
+                    Fraction(r.randint(1, 9), r.randint(1, 5))
+                    for _ in range(number_of_values)
+                ],
+                r.choice([None, 1, 0.5, Fraction(1, 4)]),
+                r.random() < 0.3,
+            )
+        )
+    return arguments
+
+
+def _get_generator_values(
+    value_range, directions, proportions, value_grid, include_last
+):
+    return RelativeValueGenerator(
+        value_range=value_range,
+        directions=directions,
+        proportions=proportions,
+        value_grid=value_grid,
+        include_last_midi_in_range=include_last,
+    ).get_values()
 
 
 class NormalizeTestCase(TestCase):
@@ -29,6 +80,68 @@ class NormalizeTestCase(TestCase):
             self.assertEqual(normalize.get_normalized_value(x), Fraction(x, 10))
 
 
+@skipIf(np is None, "numpy is not installed")
+class ArrayUtilsTestCase(TestCase):
+    def setUp(self):
+        r = random.Random(7)
+        self.durations = [
+            Fraction(r.randint(1, 16), r.choice([1, 2, 3, 4, 8])) for _ in range(200)
+        ]
+
+    def test_dToX_and_xToD_of_float_arrays(self):
+        durations = np.array([float(d) for d in self.durations])
+        positions = dToX(durations, first_element=2)
+        assert isinstance(positions, np.ndarray)
+        assert np.allclose(positions, [float(p) for p in dToX(self.durations, 2)])
+        assert np.allclose(musurgia_xToD(positions), durations)
+        assert dToX(np.array([], dtype=float)).tolist() == [0]
+
+    def test_dToX_and_xToD_of_ticks(self):
+        ticks, denominator = convert_to_ticks(self.durations)
+        assert ticks.dtype == np.int64
+        assert convert_ticks_to_fractions(ticks, denominator) == self.durations
+        positions = dToX(ticks, first_element=Fraction(3))
+        assert positions.dtype == np.int64
+        assert convert_ticks_to_fractions(positions - 3, denominator) == dToX(
+            self.durations
+        )
+        assert musurgia_xToD(positions).tolist() == ticks.tolist()
+        with self.assertRaises(OverflowError):
+            convert_to_ticks([Fraction(1, 2**40), Fraction(2**30, 3)])
+
+    def test_normalized_values_of_arrays(self):
+        normalizer = Normalizer(
+            input_value_range=(Fraction(1, 3), 40), normalization_range=(48, 84)
+        )
+        values = dToX(self.durations)[:100]
+        expected = normalizer.get_normalized_values(values)
+        assert expected == [normalizer.get_normalized_value(v) for v in values]
+        actual = normalizer.get_normalized_values(np.array([float(v) for v in values]))
+        assert np.allclose(actual, [float(v) for v in expected])
+        ticks, denominator = normalizer.get_normalized_values(*convert_to_ticks(values))
+        assert convert_ticks_to_fractions(ticks, denominator) == expected
+
+    def test_large_arrays_timing(self):
+        durations = np.random.default_rng(1).integers(1, 32, 10**6)
+        normalizer = Normalizer(
+            input_value_range=(0, 32 * 10**6), normalization_range=(0, 1)
+        )
+        duration = timeit.timeit(
+            lambda: normalizer.get_normalized_values(
+                musurgia_xToD(dToX(durations)), denominator=8
+            ),
+            number=1,
+        )
+        self.assertLess(duration, 0.5)
+
+    def test_normalized_ticks_overflow(self):
+        normalizer = Normalizer(
+            input_value_range=(0, Fraction(1, 2**31 - 1)), normalization_range=(0, 1)
+        )
+        with self.assertRaises(OverflowError):
+            normalizer.get_normalized_values(np.array([2**40]), denominator=1)
+
+
 class RelativeValueGeneratorTestCase(TestCase):
     def setUp(self):
         self.rvr = RelativeValueGenerator(
@@ -81,3 +194,162 @@ class RelativeValueGeneratorTestCase(TestCase):
         self.assertListEqual(
             self._get_proportions(relative_values), self.rvr.proportions
         )
+
+    def test_descending_value_range(self):
+        rvr = RelativeValueGenerator(
+            value_range=(72, 60), directions=[1, -1], proportions=[1, 3], value_grid=1
+        )
+        self.assertEqual(rvr.get_values(), [64, 60, 72])
+        self.assertEqual(
+            get_relative_values_batch(
+                value_ranges=[(72, 60)],
+                directions=[[1, -1]],
+                proportions=[[1, 3]],
+                value_grids=[1],
+            ),
+            [[64, 60, 72]],
+        )
+
+
+class RelativeValueGeneratorLazyTestCase(TestCase):
+    def _get_generator(self):
+        return RelativeValueGenerator(
+            value_range=(60, 72),
+            directions=[1, -1, 1, 1],
+            proportions=[1, 3, 2, 4],
+            value_grid=0.5,
+        )
+
+    def test_values_are_calculated_on_demand(self):
+        with patch("musurgia.utils.dToX", wraps=dToX) as calculate_input_values:
+            generator = self._get_generator()
+            generator.value_range = (48, 60)
+            generator.proportions = [1, 2, 2, 4]
+            generator.directions = [1, 1, -1, 1]
+            generator.value_grid = 1
+            assert calculate_input_values.call_count == 0
+            values = generator.get_values()
+            assert list(generator) == values
+            assert calculate_input_values.call_count == 1
+        assert values == _get_generator_values(
+            (48, 60), [1, 1, -1, 1], [1, 2, 2, 4], 1, False
+        )
+
+    def test_unchanged_stages_are_reused(self):
+        generator = self._get_generator()
+        generator.get_values()
+        expected_with_grid = _get_generator_values(
+            (60, 72), [1, -1, 1, 1], [1, 3, 2, 4], 1, False
+        )
+        expected_with_range = _get_generator_values(
+            (40, 50), [1, -1, 1, 1], [1, 3, 2, 4], 1, False
+        )
+        with (
+            patch("musurgia.utils.dToX", wraps=dToX) as calculate_input_values,
+            patch(
+                "musurgia.utils.get_quantized_positions",
+                wraps=get_quantized_positions,
+            ) as quantize,
+        ):
+            generator.value_grid = 1
+            assert generator.get_values() == expected_with_grid
+            assert (calculate_input_values.call_count, quantize.call_count) == (0, 1)
+            generator.value_range = (40, 50)
+            assert generator.get_values() == expected_with_range
+            assert (calculate_input_values.call_count, quantize.call_count) == (0, 2)
+            generator.get_values()
+            assert (calculate_input_values.call_count, quantize.call_count) == (0, 2)
+
+    def test_directions_change_renormalizes(self):
+        generator = self._get_generator()
+        generator.get_values()
+        generator.directions = [-1, -1, -1, -1]
+        values = generator.get_values()
+        assert (min(values), max(values)) == (60, 72)
+
+
+class RelativeValuesBatchTestCase(TestCase):
+    def test_exact_batch_matches_generators(self):
+        arguments = _get_random_generator_arguments(200)
+        expected = [_get_generator_values(*args) for args in arguments]
+        assert get_relative_values_batch(*zip(*arguments)) == expected
+
+    def test_defaults(self):
+        actual = get_relative_values_batch(
+            value_ranges=[(1, 10)],
+            directions=[[-1, -1, 1, 1]],
+            proportions=[[2, 4, 3, 2]],
+        )
+        assert actual == [
+            RelativeValueGenerator(
+                value_range=(1, 10), directions=[-1, -1, 1, 1], proportions=[2, 4, 3, 2]
+            ).get_values()
+        ]
+        assert get_relative_values_batch([], [], []) == []
+
+    def test_directions_and_proportions_of_different_lengths(self):
+        arguments = [
+            ((60, 72), [1, -1, 1], [1, 3, 2, 4], 0.5, True),
+            ((60, 72), [1, -1, 1, 1, -1], [1, 3, 2, 4], 0.5, True),
+            ((48, 60), [-1, 1], [2, 1, 1], None, False),
+        ]
+        expected = [_get_generator_values(*args) for args in arguments]
+        assert get_relative_values_batch(*zip(*arguments)) == expected
+        if np is not None:
+            actual = get_relative_values_batch(*zip(*arguments), exact=False)
+            for values, expected_values in zip(actual, expected):
+                assert np.allclose(values, [float(value) for value in expected_values])
+
+    def test_wrong_lengths(self):
+        with self.assertRaises(ValueError):
+            get_relative_values_batch(
+                value_ranges=[(1, 10), (1, 5)],
+                directions=[[1, 1]],
+                proportions=[[1, 2]],
+            )
+
+    def test_equal_extremes(self):
+        with self.assertRaises(ZeroDivisionError):
+            get_relative_values_batch(
+                value_ranges=[(1, 10)],
+                directions=[[1]],
+                proportions=[[1]],
+                include_last_in_range=[True],
+            )
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_vectorized_batch(self):
+        arguments = _get_random_generator_arguments(300, seed=2)
+        actual = get_relative_values_batch(*zip(*arguments), exact=False)
+        assert len(actual) == 300
+        for values, args in zip(actual, arguments):
+            expected = [float(value) for value in _get_generator_values(*args)]
+            assert isinstance(values, np.ndarray)
+            assert len(values) == len(expected)
+            value_grid = args[3]
+            # float rounding can move values lying halfway between two grid locations to the other location
+            tolerance = float(value_grid) if value_grid else 1e-9
+            assert np.allclose(values, expected, atol=tolerance)
+        with self.assertRaises(ZeroDivisionError):
+            get_relative_values_batch(
+                value_ranges=[(1, 10)],
+                directions=[[1]],
+                proportions=[[1]],
+                include_last_in_range=[True],
+                exact=False,
+            )
+
+
+class FlattenTestCase(TestCase):
+    def test_deep_nesting(self):
+        nested = [0]
+        for index in range(1, 5000):
+            nested = [nested, index]
+        assert flatten(nested) == list(range(5000))
+
+    def test_lazy(self):
+        iterator = iterate_flatten([1, [2, [3]], [[[]]], 4])
+        assert next(iterator) == 1
+        assert list(iterator) == [2, 3, 4]
+        assert flatten([]) == []
+        assert flatten([(1, 2), [[(3,)]]]) == [(1, 2), (3,)]
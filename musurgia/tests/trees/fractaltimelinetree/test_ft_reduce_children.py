@@ -1,5 +1,9 @@
 from unittest import TestCase
-from musurgia.trees.fractaltimelinetree import FractalTimelineTree
+from musurgia.arithmeticprogression import ArithmeticProgression
+from musurgia.trees.fractaltimelinetree import (
+    FractalTimelineTree,
+    _get_sieve_selection,
+)
 from musurgia.tests.helpers.utils_for_tests import fractal_node_info
 from musurgia.trees.timelinetree import TimelineDuration
 from musurgia.utils import flatten
@@ -151,6 +155,24 @@ class TestFractalTreeReduceChildrenByNumberOfChildren(TestCase):
 """
         )
 
+    def test_sieve_selection(self):
+        for size in range(2, 12):
+            for number_of_children in range(2, size + 1):
+                ap = ArithmeticProgression(a1=1, an=size, n=number_of_children)
+                assert _get_sieve_selection(size, number_of_children) == {
+                    int(round(x)) for x in ap
+                }
+        assert _get_sieve_selection(5, 1) == {1}
+
+    def test_sieve_selection_is_cached(self):
+        _get_sieve_selection.cache_clear()
+        self.ft.reduce_children_by_size(size=3, mode="sieve")
+        for child in self.ft.get_children():
+            child.reduce_children_by_size(size=3, mode="sieve")
+        cache_info = _get_sieve_selection.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 3
+
     def test_merge(self):
         ft_1 = FractalTimelineTree(
             proportions=(1, 2, 3, 4),
@@ -88,3 +88,12 @@ class TestSimpleFractalMusicalTree(XMLTestCase):
         score.get_quantized = True
         with self.file_path(path, "simple") as xml_path:
             score.export_xml(xml_path)
+
+    def test_simple_fractal_musical_tree_export_xml_with_workers(self):
+        with self.file_path(path, "simple") as xml_path:
+            self.ft.export_xml(xml_path, max_workers=2, get_quantized=True)
+
+    def test_simple_fractal_musical_tree_write_xml(self):
+        with self.file_path(path, "simple") as xml_path:
+            with open(xml_path, "w") as file:
+                self.ft.write_xml(file, get_quantized=True)
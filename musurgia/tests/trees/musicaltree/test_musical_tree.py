@@ -1,14 +1,28 @@
+import io
+import tempfile
+import timeit
+from fractions import Fraction
 from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+from musicscore.metronome import Metronome
 
 from musurgia.tests.helpers import (
     XMLTestCase,
+    read_midi_file,
     test_fractal_structur_list,
 )
 
 from musurgia.trees.musicaltree import (
     MagicRandomTreeMidiGenerator,
     MusicalTree,
+    TreeChordFactory,
+    _XML_HEADER,
+    _StreamedPart,
+    _merge_score_strings,
 )
+from musurgia.trees.timelinetree import TimelineDuration
 
 path = Path(__file__)
 
@@ -27,6 +41,43 @@ class TestMusicalTree(XMLTestCase):
         )
         self.assertEqual(chord.metronome, self.mt.get_duration().get_metronome())
 
+    def test_chord_without_metronome(self):
+        chord_factory = self.mt.get_chord_factory()
+        chord_factory.create_chord()
+        chord_factory.show_metronome = False
+        self.assertIsNone(chord_factory.create_chord().metronome)
+
+    def test_create_layer_chords(self):
+        MagicRandomTreeMidiGenerator(
+            self.mt, pool=list(range(60, 85)), seed=10, periodicity=7
+        ).set_musical_tree_midis()
+        for level, layer in enumerate(self.mt.iterate_layers(), start=1):
+            chords = self.mt.create_layer_chords(layer)
+            expected = [
+                node.get_chord_factory().create_chord()
+                for node in self.mt.get_layer(level)
+            ]
+            self.assertEqual(
+                [(ch.quarter_duration, [m.value for m in ch.midis]) for ch in chords],
+                [(ch.quarter_duration, [m.value for m in ch.midis]) for ch in expected],
+            )
+
+    def test_chord_data(self):
+        factory = self.mt.get_chord_factory()
+        self.assertEqual(factory.get_chord_data()[2], (60, 1))
+        with patch.object(TreeChordFactory, "update_chord_midis", lambda self: None):
+            self.assertIsNone(factory.get_chord_data())
+        factory.update_chord_metronome = lambda: None
+        self.assertIsNone(factory.get_chord_data())
+
+    def test_chord_does_not_share_quarter_duration_and_midis(self):
+        factory = self.mt.get_chord_factory()
+        chord = factory.create_chord()
+        self.assertIsNot(
+            chord.quarter_duration, self.mt.get_duration().get_quarter_duration()
+        )
+        self.assertIsNot(chord.midis[0], factory.midis[0])
+
 
 class TestTreeMidiGenerator(XMLTestCase):
     def setUp(self):
@@ -43,3 +94,207 @@ class TestTreeMidiGenerator(XMLTestCase):
         score.get_quantized = True
         with self.file_path(path, "random") as xml_path:
             score.export_xml(xml_path)
+
+    def test_random_midis_export_xml_with_workers(self):
+        MagicRandomTreeMidiGenerator(
+            self.mt, pool=list(range(60, 85)), seed=10, periodicity=7
+        ).set_musical_tree_midis()
+        with self.file_path(path, "random") as xml_path:
+            self.mt.export_xml(xml_path, max_workers=2, get_quantized=True)
+
+    def test_merge_score_strings_does_not_depend_on_formatting(self):
+        # worker output may be formatted differently than the sequential export, e.g. after changes of musicscore
+        def get_unformatted_score_string(layer_number):
+            score = self.mt.export_score(layers=[layer_number])
+            score.get_quantized = True
+            element = ElementTree.fromstring(score.to_string())
+            for sub_element in element.iter():
+                if sub_element.text is not None and not sub_element.text.strip():
+                    sub_element.text = None
+                sub_element.tail = None
+            return ElementTree.tostring(element, encoding="unicode")
+
+        score_strings = [get_unformatted_score_string(layer) for layer in [1, 3]]
+        self.assertNotIn("\n", score_strings[0])
+        score = self.mt.export_score(layers=[1, 3])
+        score.get_quantized = True
+        self.assertEqual(_merge_score_strings(score_strings), score.to_string())
+
+    def test_random_midis_write_xml(self):
+        MagicRandomTreeMidiGenerator(
+            self.mt, pool=list(range(60, 85)), seed=10, periodicity=7
+        ).set_musical_tree_midis()
+        with self.file_path(path, "random") as xml_path:
+            with open(xml_path, "w") as file:
+                self.mt.write_xml(file, get_quantized=True)
+
+    def test_write_xml_layers(self):
+        score = self.mt.export_score(layers=[2])
+        score.get_quantized = True
+        expected = score.to_string()
+        file = io.StringIO()
+        self.mt.write_xml(file, layers=[2], get_quantized=True)
+        self.assertEqual(file.getvalue(), _XML_HEADER + expected)
+
+    def _export_midi(self, **kwargs):
+        with tempfile.TemporaryDirectory() as directory:
+            midi_path = Path(directory) / "test.mid"
+            self.mt.export_midi(midi_path, **kwargs)
+            return read_midi_file(midi_path)
+
+    def test_export_midi(self):
+        MagicRandomTreeMidiGenerator(
+            self.mt, pool=list(range(60, 85)), seed=10, periodicity=7
+        ).set_musical_tree_midis()
+        ticks_per_quarter, tracks = self._export_midi()
+        self.assertEqual(len(tracks), self.mt.get_number_of_layers() + 1)
+        self.assertEqual(tracks[0], [(0, b"\xff\x51\x03\x0f\x42\x40")])
+        for layer, track in zip(self.mt.iterate_layers(), tracks[1:]):
+            expected = []
+            position = 0
+            for node in layer:
+                start = round(position * ticks_per_quarter)
+                position += node.get_duration().get_quarter_duration().value
+                key = node.get_chord_factory().get_midis()
+                expected.append((start, 0x90, key))
+                expected.append((round(position * ticks_per_quarter), 0x80, key))
+            self.assertEqual(
+                [(tick, event[0] & 0xF0, event[1]) for tick, event in track[1:]],
+                expected,
+            )
+
+    def test_export_midi_microtones(self):
+        for node, midi in zip(self.mt.get_children(), [60.4, 60.5, 127.5]):
+            node.get_chord_factory().midis = midi
+        _, tracks = self._export_midi(layers=[1])
+        self.assertEqual(
+            [event[1] for _, event in tracks[1][1:] if event[0] & 0xF0 == 0x90][:3],
+            [60, 61, 127],
+        )
+
+    def test_export_midi_tempi_and_layers(self):
+        self.mt.get_children()[1].get_duration().metronome = Metronome(120)
+        ticks_per_quarter, tracks = self._export_midi(layers=[1])
+        self.assertEqual(len(tracks), 2)
+        self.assertEqual(tracks[1][0], (0, b"\xff\x03\x06part-2"))
+        second_start = (
+            self.mt.get_children()[0].get_duration().get_quarter_duration().value
+            * ticks_per_quarter
+        )
+        self.assertEqual(
+            tracks[0],
+            [
+                (0, b"\xff\x51\x03\x0f\x42\x40"),
+                (second_start, b"\xff\x51\x03\x07\xa1\x20"),
+                (
+                    second_start
+                    + self.mt.get_children()[1]
+                    .get_duration()
+                    .get_quarter_duration()
+                    .value
+                    * ticks_per_quarter,
+                    b"\xff\x51\x03\x0f\x42\x40",
+                ),
+            ],
+        )
+
+    def test_export_midi_tempi_of_deepest_layer(self):
+        self.mt.get_children()[2].get_duration().metronome = Metronome(120)
+        self.assertFalse(self.mt.get_children()[2].is_leaf)
+        _, tracks = self._export_midi()
+        self.assertEqual(tracks[0], [(0, b"\xff\x51\x03\x0f\x42\x40")])
+        _, tracks = self._export_midi(layers=[1, 2])
+        self.assertEqual(tracks[0], [(0, b"\xff\x51\x03\x0f\x42\x40")])
+
+    def test_export_midi_velocity(self):
+        _, tracks = self._export_midi(layers=[1], velocity=127)
+        self.assertEqual(tracks[1][1][1][2], 127)
+        with self.assertRaises(ValueError):
+            self.mt.export_midi("test.mid", velocity=128)
+        with self.assertRaises(TypeError):
+            self.mt.export_midi("test.mid", velocity=0)
+
+    def test_write_xml_layers_with_different_durations(self):
+        tree = MusicalTree(duration=TimelineDuration(8))
+        for _ in range(2):
+            tree.add_child(MusicalTree(duration=TimelineDuration(4)))
+        tree.get_children()[0].add_child(MusicalTree(duration=TimelineDuration(1)))
+        with self.assertRaises(ValueError):
+            tree.write_xml(io.StringIO())
+        file = io.StringIO()
+        tree.write_xml(file, layers=[1])
+        self.assertIn('<part id="part-2">', file.getvalue())
+
+    def test_export_score_layers(self):
+        score = self.mt.export_score(layers=[3, 1])
+        self.assertEqual([p.id_ for p in score.get_children()], ["part-2", "part-4"])
+        with self.assertRaises(ValueError):
+            self.mt.export_score(layers=[self.mt.get_number_of_layers() + 1])
+        with self.assertRaises(TypeError):
+            self.mt.export_score(layers=[0])
+
+
+class TestMusicalTreeWriteXML(XMLTestCase):
+    def setUp(self):
+        # 60 measures with tuplets, ties over barlines and accidentals
+        self.mt = MusicalTree(duration=TimelineDuration(240))
+        for duration in [7, 11, 13, 9] * 6:
+            child = self.mt.add_child(MusicalTree(duration=TimelineDuration(duration)))
+            for proportion in [1, 2, 3]:
+                child.add_child(
+                    MusicalTree(
+                        duration=TimelineDuration(Fraction(duration * proportion, 6))
+                    )
+                )
+        self.mt.get_chord_factory().show_metronome = True
+        MagicRandomTreeMidiGenerator(
+            self.mt, pool=list(range(55, 80)), seed=3, periodicity=5
+        ).set_musical_tree_midis()
+
+    def test_write_xml_many_measures(self):
+        score = self.mt.export_score()
+        score.get_quantized = True
+        expected = score.to_string()
+        self.assertEqual(expected.count("<measure "), 2 * 60)
+        file = io.StringIO()
+        self.mt.write_xml(file, get_quantized=True)
+        self.assertEqual(file.getvalue(), _XML_HEADER + expected)
+
+
+class TestMusicalTreeTiming(XMLTestCase):
+    def setUp(self):
+        self.mt = MusicalTree(duration=TimelineDuration(100))
+        for _ in range(10):
+            child = self.mt.add_child(MusicalTree(duration=TimelineDuration(10)))
+            for _ in range(100):
+                child.add_child(MusicalTree(duration=TimelineDuration(Fraction(1, 10))))
+
+    def test_create_layer_chords_timing(self):
+        duration = timeit.timeit(
+            lambda: [
+                self.mt.create_layer_chords(layer) for layer in self.mt.iterate_layers()
+            ],
+            number=1,
+        )
+        self.assertLess(duration, 2)
+
+    def test_export_midi_timing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            midi_path = Path(directory) / "test.mid"
+            duration = timeit.timeit(
+                lambda: self.mt.export_midi(midi_path),
+                number=1,
+            )
+        self.assertLess(duration, 1)
+
+    def test_write_xml_keeps_only_last_measures(self):
+        (layer,) = [layer for _, layer in self.mt._iterate_layers([2], "write_xml")]
+        streamed_part = _StreamedPart(io.StringIO(), "part-3", False)
+        max_number_of_measures = 0
+        for chord in self.mt.create_layer_chords(layer):
+            streamed_part.add_chord(chord)
+            max_number_of_measures = max(
+                max_number_of_measures, len(streamed_part.part.get_children())
+            )
+        streamed_part.close()
+        self.assertEqual(max_number_of_measures, 2)
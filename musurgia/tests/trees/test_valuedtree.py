@@ -1,6 +1,8 @@
 from unittest import TestCase
 
 from fractions import Fraction
+import inspect
+import sys
 import warnings
 
 from musurgia.tests.helpers.utils_for_tests import (
@@ -210,3 +212,47 @@ class WrongValueErrorTest(TestCase):
         with warnings.catch_warnings(record=True) as w:
             vt.get_children()
             assert len(w) == 1
+
+
+class ValuedTreeIterateLeavesTestCase(TestCase):
+    def test_iterate_leaves_with_key(self):
+        vt = create_test_valued_tree()
+        for key in [None, lambda leaf: leaf.get_value()]:
+            assert list(vt.iterate_leaves(key=key)) == flatten(vt.get_leaves(key=key))
+        leaf = list(vt.iterate_leaves())[0]
+        assert list(leaf.iterate_leaves(key=lambda node: node.get_value())) == [
+            leaf.get_value()
+        ]
+
+    def test_traverse_deep_tree(self):
+        root = node = DemoValuedTree(value=1)
+        for _ in range(500):
+            node = node.add_child(DemoValuedTree(value=1))
+        recursion_limit = sys.getrecursionlimit()
+        # traversing must not need a stack frame per layer
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        try:
+            assert len(list(root.traverse())) == 501
+            assert list(root.iterate_leaves(key=lambda leaf: leaf.get_value())) == [1]
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+    def test_traverse_order(self):
+        vt = create_test_valued_tree()
+        expected = []
+
+        def _traverse(node):
+            expected.append(node)
+            for child in node.get_children():
+                _traverse(child)
+
+        _traverse(vt)
+        assert list(vt.traverse()) == expected
+
+    def test_iterate_layers(self):
+        vt = create_test_valued_tree()
+        layers = list(vt.iterate_layers())
+        assert len(layers) == vt.get_number_of_layers()
+        for level, layer in enumerate(layers, start=1):
+            assert layer == vt.get_layer(level)
+        assert list(DemoValuedTree(value=1).iterate_layers()) == []
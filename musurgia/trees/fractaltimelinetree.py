@@ -1,6 +1,7 @@
 from musurgia.trees.timelinetree import TimelineDuration, TimelineTree
 import itertools
 from fractions import Fraction
+from functools import lru_cache
 from typing import Union, Optional, List, Callable, Any, cast, Sequence, TypeVar
 
 
@@ -40,6 +41,23 @@ def node_info(node: "FractalTimelineTree") -> str:
     return f"{node.get_fractal_order()}: {node.get_permutation_index()}: {round(float(node.get_value()), 2)}"
 
 
+@lru_cache(maxsize=None)
+def _get_sieve_selection(size: int, number_of_children: int) -> frozenset[int]:
+    """
+    Fractal orders kept by reduce mode ``sieve``: the rounded terms of the arithmetic progression from ``1`` to
+    ``size`` with ``number_of_children`` terms. The selection only depends on its two arguments and is cached.
+
+    >>> sorted(_get_sieve_selection(4, 3))
+    [1, 2, 4]
+    >>> sorted(_get_sieve_selection(7, 1))
+    [1]
+    """
+    if number_of_children == 1:
+        return frozenset([1])
+    ap = ArithmeticProgression(a1=1, an=size, n=number_of_children)
+    return frozenset(round(term) for term in ap.get_terms())
+
+
 class PermutationIndexCalculator:
     def __init__(
         self,
@@ -226,7 +244,7 @@ class FractalTimelineTree(TimelineTree):
             )
             self._permutation_order_matrix = PermutationOrderMatrixGenerator(
                 main_permutation_order=value
-            ).generate_permutation_order_matrix()
+            ).generate_permutation_order_matrix(lazy=True)
             self._pic = PermutationIndexCalculator(
                 self.get_permutation_order_matrix().get_size()
             )
@@ -606,17 +624,10 @@ class FractalTimelineTree(TimelineTree):
                     lambda child: child.get_fractal_order() > size
                 )
             elif mode == "sieve":
-                if size == 1:
-                    self.reduce_children_by_condition(
-                        condition=lambda child: child.get_fractal_order() not in [1]
-                    )
-                else:
-                    ap = ArithmeticProgression(a1=1, an=self.get_size(), n=size)
-                    selection = [int(round(x)) for x in ap]
-                    self.reduce_children_by_condition(
-                        condition=lambda child: child.get_fractal_order()
-                        not in selection
-                    )
+                selection = _get_sieve_selection(self.get_size(), size)
+                self.reduce_children_by_condition(
+                    condition=lambda child: child.get_fractal_order() not in selection
+                )
             elif mode == "merge":
                 if merge_index is None:
                     raise ValueError(
@@ -1,23 +1,193 @@
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from fractions import Fraction
 from itertools import cycle
-from typing import Any, Iterator, Optional, Type, TypeVar, cast
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO, Type, TypeVar, Union, cast
+from xml.etree import ElementTree
 
+from musicscore.chord import Chord
+from musicscore.measure import Measure
+from musicscore.metronome import Metronome
 from musicscore.midi import Midi
 from musicscore.score import Score
-from musurgia.chordfactory.chordfactory import AbstractChordFactory
+from musurgia.chordfactory.chordfactory import (
+    AbstractChordFactory,
+    create_chords,
+    iterate_chords,
+)
 from musurgia.magicrandom import MagicRandom
+from musurgia.midi_utils import (
+    TICKS_PER_QUARTER,
+    MidiTrack,
+    get_microseconds_per_quarter,
+    write_midi_file,
+)
 from musurgia.musurgia_exceptions import (
     RelativeTreeChordFactoryHasNoMidiValueRangeError,
 )
 from musurgia.trees.fractaltimelinetree import FractalTimelineTree
 from musurgia.trees.timelinetree import TimelineTree
-from musurgia.utils import RelativeValueGenerator
-from musurgia.musurgia_types import MidiValue, MidiValueMicroTone, DirectionValue
+from musurgia.utils import get_relative_values_batch
+from musurgia.musurgia_types import (
+    MidiValue,
+    MidiValueMicroTone,
+    DirectionValue,
+    check_type,
+)
 
 TCF = TypeVar("TCF", bound="TreeChordFactory")
 
 
+def _copy_midis(midis: Any) -> Any:
+    # Midi objects are mutable and get a parent chord, midi values (numbers) are immutable and need no copy.
+    if isinstance(midis, (list, tuple)):
+        return [deepcopy(midi) if isinstance(midi, Midi) else midi for midi in midis]
+    return deepcopy(midis) if isinstance(midis, Midi) else midis
+
+
+# compact, picklable representation of a chord: (quarter duration value, [(midi value, accidental mode, show
+# accidental), ...], (metronome per minute, metronome beat unit) or None)
+ChordData = tuple[
+    Fraction,
+    list[tuple[Union[float, int], Optional[str], Optional[bool]]],
+    Optional[tuple[Any, Any]],
+]
+
+_XML_HEADER = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<!DOCTYPE score-partwise PUBLIC
+    "-//Recordare//DTD MusicXML 4.0 Partwise//EN"
+    "http://www.musicxml.org/dtds/partwise.dtd">
+"""
+
+
+def _get_midi_data(
+    midi: Any,
+) -> tuple[Union[float, int], Optional[str], Optional[bool]]:
+    if isinstance(midi, Midi):
+        return midi.value, midi.accidental.mode, midi.accidental.show
+    return midi, None, None
+
+
+def _create_midi_from_data(
+    midi_data: tuple[Union[float, int], Optional[str], Optional[bool]],
+) -> Midi:
+    value, mode, show = midi_data
+    midi = Midi(value)
+    if mode is not None and mode != midi.accidental.mode:
+        midi.accidental.mode = mode
+    if show is not None:
+        midi.accidental.show = show
+    return midi
+
+
+def _create_chord_from_data(chord_data: ChordData) -> Chord:
+    quarter_duration, midis_data, metronome_data = chord_data
+    chord = Chord(
+        midis=[_create_midi_from_data(midi_data) for midi_data in midis_data],
+        quarter_duration=quarter_duration,
+    )
+    if metronome_data is not None:
+        chord.metronome = Metronome(*metronome_data)
+    return chord
+
+
+def _get_part_string(part_id: str, chords: list[Chord], get_quantized: bool) -> str:
+    score = Score()
+    part = score.add_part(part_id)
+    for chord in chords:
+        part.add_chord(chord)
+    score.get_quantized = get_quantized
+    return score.to_string()
+
+
+def _create_part_string_from_data(
+    part_id: str, list_of_chord_data: list[ChordData], get_quantized: bool
+) -> str:
+    return _get_part_string(
+        part_id,
+        [_create_chord_from_data(chord_data) for chord_data in list_of_chord_data],
+        get_quantized,
+    )
+
+
+def _merge_score_strings(score_strings: list[str]) -> str:
+    # Each string is a score with one part. Identification, defaults and part-list are taken from the first score,
+    # score-parts and parts of the other scores are appended in order. musicscore writes its scores with
+    # ElementTree indented by two spaces, so the merged score is written the same way.
+    score = ElementTree.fromstring(score_strings[0])
+    part_list = score.find("part-list")
+    for score_string in score_strings[1:]:
+        other_score = ElementTree.fromstring(score_string)
+        part_list.extend(other_score.find("part-list").findall("score-part"))  # type: ignore
+        score.extend(other_score.findall("part"))
+    ElementTree.indent(score, space="  ")
+    return ElementTree.tostring(score, encoding="unicode") + "\n"
+
+
+def _get_score_header(part_ids: list[str]) -> str:
+    # identification, defaults and part-list of a score with these parts
+    score = Score()
+    for part_id in part_ids:
+        score.add_part(part_id)
+    score_string = score.to_string()
+    return score_string[: score_string.index("  <part ")]
+
+
+class _StreamedPart:
+    """
+    Part of a score whose measures are written to a text file as soon as they are complete.
+
+    musicscore has no api for writing a score incrementally. This class is the only place which relies on how
+    musicscore (tested with version 2.6) builds and finalizes parts:
+
+    * After adding a chord to a part all its measures but the last one are complete.
+    * A measure can be finalized and converted to a string on its own (``Measure.finalize()``,
+      ``Measure.xml_object.to_string()``). Only its previous measure is needed (ties and accidentals), so that older
+      measures are removed from the part and its xml object.
+    * Quantizing beats, filling the last measure with rests and setting the final barline repeat what
+      ``Part.finalize()`` and ``Score.finalize()`` do.
+
+    Tests compare the output with the string of :obj:`MusicalTree.export_score` to catch changes of musicscore.
+    """
+
+    def __init__(self, file: TextIO, part_id: str, get_quantized: bool) -> None:
+        self._file = file
+        score = Score()
+        score.get_quantized = get_quantized
+        self.part = score.add_part(part_id)
+        self._last_written_measure: Optional[Measure] = None
+        file.write(f'  <part id="{part_id}">\n')
+
+    def _write_measure(self, measure: Measure) -> None:
+        for beat in measure.get_beats():
+            if beat.get_quantized:
+                beat.quantize_quarter_durations()
+        measure.finalize()
+        self._file.write("    " + measure.xml_object.to_string())
+        if self._last_written_measure is not None:
+            self.part.xml_object.remove(self._last_written_measure.xml_object)
+            self.part.remove(self._last_written_measure)
+        self._last_written_measure = measure
+
+    def add_chord(self, chord: Chord) -> None:
+        self.part.add_chord(chord)
+        measures = list(self.part.get_children())
+        first_index = 0 if self._last_written_measure is None else 1
+        for measure in measures[first_index:-1]:
+            self._write_measure(measure)
+
+    def close(self) -> None:
+        if not self.part.get_children():
+            self.part.add_measure()
+        last_measure = self.part.get_children()[-1]
+        last_measure.fill_with_rests()
+        last_measure.set_barline(style="light-heavy")
+        self._write_measure(last_measure)
+        self._file.write("  </part>\n")
+
+
 class TreeChordFactory(AbstractChordFactory):
     def __init__(
         self,
@@ -52,29 +222,64 @@ class TreeChordFactory(AbstractChordFactory):
     def get_musical_tree_node(self) -> "MusicalTree":
         return self._musical_tree_node
 
+    def _create_initial_chord(self) -> Chord:
+        # quarter duration and midis are always set by the first two update methods
+        return Chord(midis=None, quarter_duration=None)
+
     def update_chord_quarter_duration(self) -> None:
-        self._chord.quarter_duration = deepcopy(
-            self.get_musical_tree_node().get_duration().get_quarter_duration()
+        # the value of the quarter duration is immutable, chord creates its own QuarterDuration
+        self._chord.quarter_duration = (
+            self.get_musical_tree_node().get_duration().get_quarter_duration().value
         )
 
     def update_chord_midis(self) -> None:
-        self._chord.midis = deepcopy(self.get_midis())
+        self._chord.midis = _copy_midis(self.get_midis())
 
     def update_chord_metronome(self) -> None:
+        # the initial chord has no metronome
         if self.show_metronome:
             self._chord.metronome = (
                 self.get_musical_tree_node().get_duration().get_metronome()
             )
-        else:
-            self._chord._metronome = None
+
+    def get_chord_data(self) -> Optional[ChordData]:
+        """
+        :return: compact and picklable data of the chord which :obj:`create_chord` would create or ``None`` if the
+                 factory has its own (overridden or patched) update methods which cannot be represented by this data.
+        """
+        if self._CHORD_UPDATE_METHODS != tuple(_CHORD_DATA_UPDATE_FUNCTIONS):  # type: ignore
+            return None
+        for method_name, function in _CHORD_DATA_UPDATE_FUNCTIONS.items():
+            if getattr(getattr(self, method_name), "__func__", None) is not function:
+                return None
+        duration = self.get_musical_tree_node().get_duration()
+        midis = self.get_midis()
+        if not isinstance(midis, (list, tuple)):
+            midis = [midis]
+        metronome_data = None
+        if self.show_metronome:
+            metronome = duration.get_metronome()
+            metronome_data = (metronome.per_minute, metronome.beat_unit.value)
+        return (
+            duration.get_quarter_duration().value,
+            [_get_midi_data(midi) for midi in midis],
+            metronome_data,
+        )
 
     def create_copy(self: TCF, musical_tree_node: "MusicalTree") -> "TCF":
         new_instance = self.__class__(musical_tree_node=musical_tree_node)
         new_instance._show_metronome = self._show_metronome
-        new_instance.midis = deepcopy(self._midis)
+        new_instance.midis = _copy_midis(self._midis)
         return new_instance
 
 
+# update methods of TreeChordFactory as defined above, get_chord_data represents only chords created by them
+_CHORD_DATA_UPDATE_FUNCTIONS = {
+    method_name: getattr(TreeChordFactory, method_name)
+    for method_name in TreeChordFactory._CHORD_UPDATE_METHODS  # type: ignore
+}
+
+
 class TreeMidiGenerator:
     def __init__(self, musical_tree_node: "MusicalTree", *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
@@ -191,38 +396,50 @@ class RelativeTreeMidiGenerator(TreeMidiGenerator):
                     0,
                 )
 
-        for node in self.get_musical_tree_node().traverse():
-            if not node.is_leaf:
-                node_chord_factory = node.get_chord_factory()
-                children = node.get_children()
-                proportions = [ch.get_value() for ch in children]
-                directions = [
-                    next(node_chord_factory.direction_iterator)
-                    for _ in range(len(proportions))
-                ]
-                children_midi_value_ranges = list(
-                    RelativeValueGenerator(
-                        value_range=node_chord_factory.midi_value_range,
-                        directions=directions,
-                        proportions=proportions,
-                        value_grid=node_chord_factory.micro_tone.value,
-                        include_last_midi_in_range=node_chord_factory.include_last_midi_in_range,
-                    )
-                )
-
+        # children's midi value ranges depend on their parent's, hence the tree is processed layer by layer and all
+        # nodes of a layer are calculated in one batch. The batch is evaluated exactly (node by node with fractions),
+        # the vectorized floating point mode would change the midis.
+        nodes = [self.get_musical_tree_node()]
+        while nodes:
+            parents = [node for node in nodes if not node.is_leaf]
+            chord_factories = [
+                cast(RelativeTreeChordFactory, parent.get_chord_factory())
+                for parent in parents
+            ]
+            proportions = [
+                [child.get_value() for child in parent.get_children()]
+                for parent in parents
+            ]
+            directions = [
+                [next(chord_factory.direction_iterator) for _ in node_proportions]  # type: ignore
+                for chord_factory, node_proportions in zip(chord_factories, proportions)
+            ]
+            all_children_midi_value_ranges = get_relative_values_batch(
+                value_ranges=[cf.midi_value_range for cf in chord_factories],  # type: ignore
+                directions=directions,
+                proportions=proportions,
+                value_grids=[cf.micro_tone.value for cf in chord_factories],
+                include_last_in_range=[
+                    cf.include_last_midi_in_range for cf in chord_factories
+                ],
+            )
+            for parent, children_midi_value_ranges in zip(
+                parents, all_children_midi_value_ranges
+            ):
+                children = parent.get_children()
                 for index in range(len(children_midi_value_ranges) - 1):
-                    child = children[index]
-                    if child.get_chord_factory().midi_value_range is None:
+                    child_chord_factory = cast(
+                        RelativeTreeChordFactory, children[index].get_chord_factory()
+                    )
+                    if child_chord_factory.midi_value_range is None:
                         min_midi = float(children_midi_value_ranges[index])
                         max_midi = float(children_midi_value_ranges[index + 1])
-                        children[index].get_chord_factory().midi_value_range = (
-                            min_midi,
-                            max_midi,
-                        )
+                        child_chord_factory.midi_value_range = (min_midi, max_midi)
 
-                    min_midi, _ = child.get_chord_factory().midi_value_range
+                    min_midi, _ = child_chord_factory.midi_value_range
 
-                    children[index].get_chord_factory().midis = [Midi(min_midi)]
+                    child_chord_factory.midis = [Midi(min_midi)]
+            nodes = [child for parent in parents for child in parent.get_children()]
 
 
 class MusicalTree(TimelineTree):
@@ -239,15 +456,224 @@ class MusicalTree(TimelineTree):
     def get_chord_factory(self) -> TreeChordFactory:
         return self._tree_chord_factory
 
-    def export_score(self) -> Score:
+    def create_layer_chords(self, layer: list["MusicalTree"]) -> list[Chord]:
+        """
+        :param layer: list of nodes, e.g. an element of :obj:`iterate_layers`
+        :return: chords of all nodes created in one pass with :obj:`~musurgia.chordfactory.chordfactory.create_chords`
+        """
+        return create_chords(node.get_chord_factory() for node in layer)
+
+    def _iterate_layers(
+        self, layers: Optional[list[int]], method_name: str
+    ) -> Iterator[tuple[int, list["MusicalTree"]]]:
+        if layers is not None:
+            number_of_layers = self.get_number_of_layers()
+            for layer_number in layers:
+                check_type(
+                    layer_number,
+                    "PositiveInteger",
+                    class_name=self.__class__.__name__,
+                    method_name=method_name,
+                    argument_name="layers",
+                )
+                if layer_number > number_of_layers:
+                    raise ValueError(
+                        f"{self.__class__.__name__}:{method_name}: layer number {layer_number} must be less than or equal to {number_of_layers}"
+                    )
+        return (
+            (layer_number, layer)
+            for layer_number, layer in enumerate(self.iterate_layers(), start=1)
+            if layers is None or layer_number in layers
+        )
+
+    def export_score(self, layers: Optional[list[int]] = None) -> Score:
+        """
+        :param layers: optional list of layer numbers (1 to :obj:`get_number_of_layers`) to be exported. Default: all
+                       layers
+        :return: score with one part per layer
+        """
         score = Score()
-        for layer_number in range(1, self.get_number_of_layers() + 1):
+        for layer_number, layer in self._iterate_layers(layers, "export_score"):
             part = score.add_part(f"part-{layer_number + 1}")
-            layer = self.get_layer(level=layer_number)
-            for node in layer:
-                part.add_chord(node.get_chord_factory().create_chord())
+            for chord in self.create_layer_chords(layer):
+                part.add_chord(chord)
         return score
 
+    def export_xml(
+        self,
+        path: Union[str, Path],
+        layers: Optional[list[int]] = None,
+        max_workers: Optional[int] = None,
+        get_quantized: bool = False,
+    ) -> None:
+        """
+        Exports :obj:`export_score` as a musicxml file.
+
+        :param layers: see :obj:`export_score`
+        :param max_workers: if greater than 1 the part of each layer is built and converted to musicxml in a separate
+                            process. Workers get compact chord data (:obj:`TreeChordFactory.get_chord_data`) instead of
+                            the tree. Layers whose chord factories have their own update methods are built in the main
+                            process. The parts are merged into one musicxml document.
+        :param get_quantized: sets ``get_quantized`` of the score(s)
+        """
+        exported_layers = list(self._iterate_layers(layers, "export_xml"))
+        if max_workers is None or max_workers <= 1 or len(exported_layers) <= 1:
+            score = self.export_score(layers)
+            score.get_quantized = get_quantized
+            score.export_xml(path)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            part_strings: list[Any] = []
+            for layer_number, layer in exported_layers:
+                part_id = f"part-{layer_number + 1}"
+                list_of_chord_data = [
+                    node.get_chord_factory().get_chord_data() for node in layer
+                ]
+                if None in list_of_chord_data:
+                    part_strings.append(
+                        _get_part_string(
+                            part_id, self.create_layer_chords(layer), get_quantized
+                        )
+                    )
+                else:
+                    part_strings.append(
+                        executor.submit(
+                            _create_part_string_from_data,
+                            part_id,
+                            cast(list[ChordData], list_of_chord_data),
+                            get_quantized,
+                        )
+                    )
+            score_strings = [
+                part_string if isinstance(part_string, str) else part_string.result()
+                for part_string in part_strings
+            ]
+        with open(path, "w") as f:
+            f.write(_XML_HEADER)
+            f.write(_merge_score_strings(score_strings))
+
+    def write_xml(
+        self,
+        file: TextIO,
+        layers: Optional[list[int]] = None,
+        get_quantized: bool = False,
+    ) -> None:
+        """
+        Writes the musicxml of :obj:`export_score` to an open text file without building the whole score. Parts are
+        written one after another and their measures as soon as they are complete, so that apart from the tree itself
+        only a few measures are held in memory.
+
+        All exported layers must have the same quarter duration. Otherwise a ``ValueError`` is raised (:obj:`export_score`
+        fills the shorter parts with rests instead).
+
+        :param file: text file handle, e.g. ``open(path, "w")``
+        :param layers: see :obj:`export_score`
+        :param get_quantized: sets ``get_quantized`` of the score
+        """
+        exported_layers = list(self._iterate_layers(layers, "write_xml"))
+        quarter_durations = {
+            sum(node.get_duration().get_quarter_duration().value for node in layer)
+            for _, layer in exported_layers
+        }
+        if len(quarter_durations) > 1:
+            raise ValueError(
+                f"{self.__class__.__name__}:write_xml: all exported layers must have the same quarter duration: {sorted(quarter_durations)}"
+            )
+        file.write(_XML_HEADER)
+        file.write(
+            _get_score_header(
+                [f"part-{layer_number + 1}" for layer_number, _ in exported_layers]
+            )
+        )
+        for layer_number, layer in exported_layers:
+            streamed_part = _StreamedPart(
+                file, f"part-{layer_number + 1}", get_quantized
+            )
+            for chord in iterate_chords(node.get_chord_factory() for node in layer):
+                streamed_part.add_chord(chord)
+            streamed_part.close()
+        file.write("</score-partwise>\n")
+
+    def export_midi(
+        self,
+        path: Union[str, Path],
+        layers: Optional[list[int]] = None,
+        velocity: int = 80,
+    ) -> None:
+        """
+        Writes a Standard MIDI File directly from the tree without creating chords or a score. Each layer gets its own
+        track (and channel). Onsets are cumulative quarter durations of the nodes. The tempo track is taken from the
+        metronomes of the nodes of the deepest exported layer. Microtones are rounded to the nearest semitone (at most
+        127).
+
+        :param layers: see :obj:`export_score`
+        :param velocity: velocity of all notes (1 to 127)
+        """
+        check_type(
+            velocity,
+            "PositiveInteger",
+            class_name=self.__class__.__name__,
+            method_name="export_midi",
+            argument_name="velocity",
+        )
+        if velocity > 127:
+            raise ValueError(
+                f"{self.__class__.__name__}:export_midi: velocity {velocity} must be less than or equal to 127"
+            )
+        channels = [channel for channel in range(16) if channel != 9]
+        # (per minute, beat unit) -> microseconds per quarter
+        microseconds_per_quarter: dict[tuple[Any, Any], int] = {}
+        tempi: list[tuple[int, int]] = []
+        tracks = []
+        for index, (layer_number, layer) in enumerate(
+            self._iterate_layers(layers, "export_midi")
+        ):
+            track = MidiTrack(channel=channels[index % len(channels)])
+            track.add_track_name(0, f"part-{layer_number + 1}")
+            # layers are iterated from top to bottom, only the deepest layer keeps its tempi
+            tempi = []
+            position = Fraction(0)
+            tick = 0
+            tempo = None
+            keys: list[int] = []
+            for node in layer:
+                duration = node.get_duration()
+                metronome = duration.get_metronome()
+                metronome_key = (metronome.per_minute, metronome.beat_unit.value)
+                try:
+                    node_tempo = microseconds_per_quarter[metronome_key]
+                except KeyError:
+                    node_tempo = microseconds_per_quarter[metronome_key] = (
+                        get_microseconds_per_quarter(metronome)
+                    )
+                if node_tempo != tempo:
+                    tempo = node_tempo
+                    tempi.append((tick, tempo))
+                position += duration.get_quarter_duration().value
+                next_tick = round(position * TICKS_PER_QUARTER)
+                for key in keys:
+                    track.add_note_off(tick, key)
+                keys = []
+                if next_tick > tick:
+                    midis = node.get_chord_factory().get_midis()
+                    if not isinstance(midis, (list, tuple)):
+                        midis = [midis]
+                    for midi in midis:
+                        value = midi.value if isinstance(midi, Midi) else midi
+                        if value:
+                            key = min(int(value + 0.5), 127)
+                            track.add_note_on(tick, key, velocity)
+                            keys.append(key)
+                tick = next_tick
+            for key in keys:
+                track.add_note_off(tick, key)
+            tracks.append(track)
+        tempo_track = MidiTrack()
+        for tick, tempo in tempi:
+            tempo_track.add_tempo(tick, tempo)
+        write_midi_file(path, [tempo_track] + tracks)
+
 
 T = TypeVar("T", bound="FractalMusicalTree")
 
@@ -2,7 +2,7 @@ from abc import abstractmethod
 from fractions import Fraction
 import warnings
 from verysimpletree.tree import Tree
-from typing import Any, TypeVar, Union
+from typing import Any, Callable, Iterator, Optional, TypeVar, Union
 from musurgia.musurgia_exceptions import WrongTreeValueError, WrongTreeValueWarning
 from musurgia.musurgia_types import ConvertibleToFraction
 
@@ -30,6 +30,14 @@ class ValuedTree(Tree[Any]):
     def _get_children(self: T) -> list[T]:
         return super().get_children()
 
+    def _raw_traverse(self: T) -> Iterator[T]:
+        # preorder traversal with an explicit stack: deep trees do not hit the recursion limit
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._children))
+
     @abstractmethod
     def _set_value(self, val: ConvertibleToFraction) -> None:
         """_set_value must be defined."""
@@ -48,6 +56,41 @@ class ValuedTree(Tree[Any]):
     def get_value(self) -> Fraction:
         """get_value must be defined."""
 
+    def iterate_leaves(
+        self, key: Optional[Callable[[Any], Any]] = None
+    ) -> Iterator[Any]:
+        """
+        Flat counterpart of :obj:`get_leaves`: iterates over all leaves or values of key(leaf) in the order of
+        :obj:`traverse` without building nested lists.
+
+        :param key: An optional callable to be called on each leaf.
+        :return: iterator
+        """
+        leaves = super().iterate_leaves()
+        if key is None:
+            return leaves
+        return map(key, leaves)
+
+    def iterate_layers(self) -> Iterator[list[Any]]:
+        """
+        Iterates over all layers from 1 to :obj:`get_number_of_layers`. Each layer is equal to :obj:`get_layer` of
+        the same level, but is built from the previous one instead of starting again from the root.
+
+        :return: iterator of lists of nodes
+        """
+        layer = list(self._get_children())
+        while layer:
+            yield layer
+            if all(node.is_leaf for node in layer):
+                break
+            next_layer = []
+            for node in layer:
+                if node.is_leaf:
+                    next_layer.append(node)
+                else:
+                    next_layer.extend(node._get_children())
+            layer = next_layer
+
     def update_value(self, new_value: ConvertibleToFraction) -> None:
         if not isinstance(new_value, Fraction):
             new_value = Fraction(new_value)
@@ -1,7 +1,9 @@
 from fractions import Fraction
-from typing import Any, Iterator, Literal, Optional, Sequence
+from math import lcm
+from typing import Any, Iterator, Literal, Optional, Sequence, cast
 
 from musurgia.musurgia_types import ConvertibleToFraction, convert_to_fraction
+from musurgia.numpy_utils import import_numpy, is_ndarray
 from musurgia.quantize import get_quantized_positions
 
 
@@ -9,6 +11,30 @@ def dToX(
     input_list: Sequence[ConvertibleToFraction],
     first_element: ConvertibleToFraction = 0,
 ) -> list[Fraction]:
+    """
+    Converts distances (e.g. durations) to positions (e.g. onsets) starting with ``first_element``.
+
+    numpy arrays are accumulated in vectorized form and a numpy array is returned. Integer arrays (e.g. ticks, see
+    :obj:`convert_to_ticks`) stay integer and exact.
+
+    >>> dToX([Fraction(1, 2), 1, Fraction(1, 3)], first_element=1)
+    [Fraction(1, 1), Fraction(3, 2), Fraction(5, 2), Fraction(17, 6)]
+    """
+    if is_ndarray(input_list):
+        np = import_numpy("dToX")
+        if isinstance(first_element, Fraction):
+            first_element = (
+                first_element.numerator
+                if first_element.denominator == 1
+                else float(first_element)
+            )
+        output = np.empty(
+            len(input_list) + 1, dtype=np.result_type(input_list, first_element)
+        )
+        output[0] = first_element
+        np.cumsum(input_list, out=output[1:])
+        output[1:] += first_element
+        return output
     input = convert_to_fraction_list(input_list)
     output = [convert_to_fraction(first_element)]
     for i in range(len(input)):
@@ -17,6 +43,17 @@ def dToX(
 
 
 def xToD(input_list: Sequence[ConvertibleToFraction]) -> list[Fraction]:
+    """
+    Converts positions to distances between them.
+
+    numpy arrays are differenced in vectorized form and a numpy array is returned.
+
+    >>> xToD([1, Fraction(3, 2), Fraction(5, 2)])
+    [Fraction(1, 2), Fraction(1, 1)]
+    """
+    if is_ndarray(input_list):
+        np = import_numpy("xToD")
+        return np.diff(input_list)
     input = convert_to_fraction_list(input_list)
     result = []
     for i in range(1, len(input)):
@@ -24,6 +61,28 @@ def xToD(input_list: Sequence[ConvertibleToFraction]) -> list[Fraction]:
     return result
 
 
+def iterate_flatten(input: list[Any]) -> Iterator[Any]:
+    """
+    Lazily yields all non-list items of a nested list in order. Nesting is resolved with an explicit stack of
+    iterators, hence no intermediate lists are built and deep nesting does not hit the recursion limit.
+
+    >>> iterator = iterate_flatten([1, [2, [3, [4]]], 5])
+    >>> next(iterator)
+    1
+    >>> list(iterator)
+    [2, 3, 4, 5]
+    """
+    stack = [iter(input)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
+
+
 def flatten(input: list[Any]) -> list[Any]:
     """
     :param input:
@@ -37,19 +96,48 @@ def flatten(input: list[Any]) -> list[Any]:
     [1, 2, 3, 4, 5, 6, 7, 8, 9]
 
     """
-    output = []
-    for item in input:
-        if isinstance(item, list):
-            output.extend(flatten(item))
-        else:
-            output.append(item)
-    return output
+    return list(iterate_flatten(input))
 
 
 def convert_to_fraction_list(input: Sequence[ConvertibleToFraction]) -> list[Fraction]:
     return [convert_to_fraction(x) for x in input]
 
 
+def convert_to_ticks(values: Sequence[ConvertibleToFraction]) -> tuple[Any, int]:
+    """
+    Converts values to an int64 numpy array of numerators (ticks) over their smallest common denominator. Ticks can be
+    processed exactly by array functions like :obj:`dToX`, :obj:`xToD` and :obj:`Normalizer.get_normalized_values`.
+
+    :return: (ticks, denominator)
+    :raise: ``OverflowError`` if a numerator does not fit into int64
+
+    >>> ticks, denominator = convert_to_ticks([Fraction(1, 2), Fraction(1, 3), 1])
+    >>> ticks.tolist(), denominator
+    ([3, 2, 6], 6)
+    """
+    np = import_numpy("convert_to_ticks")
+    fractions = convert_to_fraction_list(values)
+    denominator = lcm(*(fraction.denominator for fraction in fractions))
+    ticks = np.array(
+        [
+            fraction.numerator * (denominator // fraction.denominator)
+            for fraction in fractions
+        ],
+        dtype=np.int64,
+    )
+    return ticks, denominator
+
+
+def convert_ticks_to_fractions(ticks: Any, denominator: int) -> list[Fraction]:
+    """
+    Converts ticks over denominator back to a list of Fractions (see :obj:`convert_to_ticks`).
+
+    >>> convert_ticks_to_fractions(dToX(convert_to_ticks([Fraction(1, 2), Fraction(1, 3)])[0]), 6)
+    [Fraction(0, 1), Fraction(1, 2), Fraction(5, 6)]
+    """
+    return [Fraction(tick, denominator) for tick in ticks.tolist()]
+
+
 def convert_to_fraction_tuplet(
     input: Sequence[ConvertibleToFraction],
 ) -> tuple[Fraction, Fraction]:
@@ -108,11 +196,77 @@ class Normalizer:
         )
         return convert_to_fraction(normalized_value)
 
+    def get_normalized_values(
+        self,
+        values: Sequence[ConvertibleToFraction],
+        denominator: Optional[int] = None,
+    ) -> Any:
+        """
+        Normalizes many values at once.
+
+        Lists are normalized exactly with :obj:`get_normalized_value` and a list of Fractions is returned. numpy arrays
+        are mapped in vectorized floating point form and a numpy array is returned. If ``denominator`` is set, values
+        must be an integer array of ticks over this denominator (see :obj:`convert_to_ticks`): the exact result is
+        returned as a tuple (ticks, denominator) of the normalized values.
+
+        :raise: ``OverflowError`` if the exact result does not fit into int64
+
+        >>> normalizer = Normalizer(input_value_range=(0, 3), normalization_range=(60, 72))
+        >>> normalizer.get_normalized_values([0, 1, Fraction(3, 2)])
+        [Fraction(60, 1), Fraction(64, 1), Fraction(66, 1)]
+        >>> ticks, denominator = normalizer.get_normalized_values(*convert_to_ticks([0, 1, Fraction(3, 2)]))
+        >>> convert_ticks_to_fractions(ticks, denominator)
+        [Fraction(60, 1), Fraction(64, 1), Fraction(66, 1)]
+        """
+        if not is_ndarray(values):
+            return [self.get_normalized_value(value) for value in values]
+        np = import_numpy(f"{self.__class__.__name__}.get_normalized_values")
+        norm_min, norm_max = cast(tuple[Fraction, Fraction], self.normalization_range)
+        value_min, value_max = cast(tuple[Fraction, Fraction], self.input_value_range)
+        factor = (norm_max - norm_min) / (value_max - value_min)
+        if denominator is None:
+            return float(norm_min) + (values - float(value_min)) * float(factor)  # type: ignore
+        # normalized value = offset + factor * tick / denominator
+        offset = norm_min - factor * value_min
+        tick_factor = factor / denominator
+        result_denominator = lcm(offset.denominator, tick_factor.denominator)
+        result_offset = offset.numerator * (result_denominator // offset.denominator)
+        result_factor = tick_factor.numerator * (
+            result_denominator // tick_factor.denominator
+        )
+        if len(values):
+            largest_tick = max(abs(int(values.min())), abs(int(values.max())))  # type: ignore
+            if abs(result_offset) + abs(result_factor) * largest_tick >= 2**63:
+                raise OverflowError(
+                    f"{self.__class__.__name__}.get_normalized_values: exact result does not fit into int64"
+                )
+        ticks = result_offset + result_factor * np.asarray(values, dtype=np.int64)
+        return ticks, result_denominator
+
 
 DirectionValueType = Literal[1, -1]
 
 
 class RelativeValueGenerator:
+    """
+    Values are calculated lazily in three stages, each cached until one of its inputs changes:
+
+    #. input values: positions of the intervals resulting from ``proportions`` and ``directions``
+    #. normalized values: input values moved into ``value_range``
+    #. calculated values: normalized values quantized to ``value_grid``
+
+    Setting a property only invalidates the stages depending on it, e.g. a new ``value_range`` re-normalizes the
+    cached input values. The stages are calculated on demand by :obj:`get_values` or iteration.
+
+    >>> generator = RelativeValueGenerator(value_range=(60, 72), directions=[1, -1], proportions=[1, 3])
+    >>> generator.get_values()
+    [Fraction(68, 1), Fraction(72, 1), Fraction(60, 1)]
+    >>> generator.value_range = (60, 66)
+    >>> generator.value_grid = 1
+    >>> generator.get_values()
+    [Fraction(64, 1), Fraction(66, 1), Fraction(60, 1)]
+    """
+
     def __init__(
         self,
         value_range: tuple[ConvertibleToFraction, ConvertibleToFraction],
@@ -124,7 +278,9 @@ class RelativeValueGenerator:
         **kwargs: Any,
     ):
         super().__init__(*args, **kwargs)
-        self._calculated_values: list[Fraction]
+        self._input_values: Optional[list[Fraction]] = None
+        self._normalized_values: Optional[list[Fraction]] = None
+        self._calculated_values: Optional[list[Fraction]] = None
         self._value_range: tuple[ConvertibleToFraction, ConvertibleToFraction] = (
             convert_to_fraction_tuplet(value_range)
         )
@@ -135,43 +291,56 @@ class RelativeValueGenerator:
         )
         self._include_last_midi_in_range: bool = include_last_midi_in_range
 
-        self._calculate_intervals()
-        self._normalizer: Normalizer
-        self._set_normalizer()
-        self._calculate_result_values()
-
-    def _calculate_intervals(self) -> None:
+    def _get_intervals(self) -> list[Fraction]:
         if self._include_last_midi_in_range:
             proportions = self.proportions[:-1] + [Fraction(0)]
         else:
             proportions = self.proportions
-        self._intervals = [
+        return [
             proportion * direction
             for proportion, direction in zip(proportions, self.directions)
         ]
 
-    def _calculate_result_values(self) -> None:
-        normalized_values = [
-            self._normalizer.get_normalized_value(value)
-            for value in self._get_input_values()
-        ]
-
-        if self.value_grid:
-            self._calculated_values = get_quantized_positions(
-                normalized_values, grid_size=self.value_grid
+    def _get_input_values(self) -> list[Fraction]:
+        if self._input_values is None:
+            self._input_values = dToX(self._get_intervals())
+        return self._input_values
+
+    def _get_normalized_values(self) -> list[Fraction]:
+        if self._normalized_values is None:
+            input_values = self._get_input_values()
+            # value range can be descending (e.g. with direction -1) and is not checked like in
+            # Normalizer.normalization_range setter
+            normalizer = Normalizer(
+                input_value_range=(min(input_values), max(input_values)),
+                normalization_range=self.value_range,
             )
-        else:
-            self._calculated_values = normalized_values
+            self._normalized_values = [
+                normalizer.get_normalized_value(value) for value in input_values
+            ]
+        return self._normalized_values
+
+    def _get_calculated_values(self) -> list[Fraction]:
+        if self._calculated_values is None:
+            normalized_values = self._get_normalized_values()
+            if self.value_grid:
+                self._calculated_values = get_quantized_positions(
+                    normalized_values, grid_size=self.value_grid, cache=True
+                )
+            else:
+                self._calculated_values = normalized_values
+        return self._calculated_values
 
-    def _get_input_values(self) -> list[Fraction]:
-        return dToX(self._intervals)
+    def _invalidate_input_values(self) -> None:
+        self._input_values = None
+        self._invalidate_normalized_values()
 
-    def _set_normalizer(self) -> None:
-        input_values = self._get_input_values()
-        self._normalizer = Normalizer(
-            input_value_range=(min(input_values), max(input_values)),
-            normalization_range=self.value_range,
-        )
+    def _invalidate_normalized_values(self) -> None:
+        self._normalized_values = None
+        self._invalidate_calculated_values()
+
+    def _invalidate_calculated_values(self) -> None:
+        self._calculated_values = None
 
     @property
     def value_range(self) -> tuple[ConvertibleToFraction, ConvertibleToFraction]:
@@ -182,8 +351,7 @@ class RelativeValueGenerator:
         self, value: tuple[ConvertibleToFraction, ConvertibleToFraction]
     ) -> None:
         self._value_range = convert_to_fraction_tuplet(value)
-        self._set_normalizer()
-        self._calculate_result_values()
+        self._invalidate_normalized_values()
 
     @property
     def directions(self) -> list[DirectionValueType]:
@@ -192,8 +360,7 @@ class RelativeValueGenerator:
     @directions.setter
     def directions(self, value: list[DirectionValueType]) -> None:
         self._directions = value
-        self._calculate_intervals()
-        self._calculate_result_values()
+        self._invalidate_input_values()
 
     @property
     def proportions(self) -> list[Fraction]:
@@ -202,9 +369,7 @@ class RelativeValueGenerator:
     @proportions.setter
     def proportions(self, value: Sequence[ConvertibleToFraction]) -> None:
         self._proportions = convert_to_fraction_list(value)
-        self._calculate_intervals()
-        self._set_normalizer()
-        self._calculate_result_values()
+        self._invalidate_input_values()
 
     @property
     def value_grid(self) -> Optional[ConvertibleToFraction]:
@@ -213,11 +378,174 @@ class RelativeValueGenerator:
     @value_grid.setter
     def value_grid(self, value: Optional[ConvertibleToFraction]) -> None:
         self._value_grid = value
-        self._calculate_result_values()
+        self._invalidate_calculated_values()
 
     def get_values(self) -> list[Fraction]:
-        return self._calculated_values
+        return self._get_calculated_values()
 
     def __iter__(self) -> Iterator[Fraction]:
         for val in self.get_values():
             yield val
+
+
+def _zip_relative_proportions(
+    directions: Sequence[DirectionValueType],
+    proportions: Sequence[ConvertibleToFraction],
+    include_last_in_range: bool,
+) -> Iterator[tuple[ConvertibleToFraction, DirectionValueType]]:
+    # same as RelativeValueGenerator._get_intervals: the last proportion is set to 0 before zipping
+    if include_last_in_range:
+        proportions = list(proportions[:-1]) + [Fraction(0)]
+    return zip(proportions, directions)
+
+
+def _get_relative_values(
+    value_range: tuple[ConvertibleToFraction, ConvertibleToFraction],
+    directions: Sequence[DirectionValueType],
+    proportions: Sequence[ConvertibleToFraction],
+    value_grid: Optional[ConvertibleToFraction],
+    include_last_in_range: bool,
+) -> list[Fraction]:
+    intervals = [
+        convert_to_fraction(proportion) * direction
+        for proportion, direction in _zip_relative_proportions(
+            directions, proportions, include_last_in_range
+        )
+    ]
+    positions = dToX(intervals)
+    value_min, value_max = min(positions), max(positions)
+    norm_min, norm_max = convert_to_fraction_tuplet(value_range)
+    factor = (norm_max - norm_min) / (value_max - value_min)
+    values = [norm_min + (position - value_min) * factor for position in positions]
+    if value_grid:
+        return get_quantized_positions(values, grid_size=value_grid)
+    return values
+
+
+def _get_relative_values_array(
+    value_ranges: Sequence[tuple[ConvertibleToFraction, ConvertibleToFraction]],
+    directions: Sequence[Sequence[DirectionValueType]],
+    proportions: Sequence[Sequence[ConvertibleToFraction]],
+    value_grids: Sequence[Optional[ConvertibleToFraction]],
+    include_last_in_range: Sequence[bool],
+) -> list[Any]:
+    np = import_numpy("get_relative_values_batch")
+    # all nodes are concatenated into one flat array: each segment starts with 0 followed by the node's intervals
+    lengths = np.array(
+        [
+            min(len(node_proportions), len(node_directions))
+            for node_proportions, node_directions in zip(proportions, directions)
+        ]
+    )
+    segment_lengths = lengths + 1
+    starts = np.concatenate(([0], np.cumsum(segment_lengths)[:-1]))
+    steps = np.zeros(segment_lengths.sum())
+    is_interval = np.ones(len(steps), dtype=bool)
+    is_interval[starts] = False
+    steps[is_interval] = np.fromiter(
+        (
+            float(proportion) * direction
+            for node_directions, node_proportions, node_include_last_in_range in zip(
+                directions, proportions, include_last_in_range
+            )
+            for proportion, direction in _zip_relative_proportions(
+                node_directions, node_proportions, node_include_last_in_range
+            )
+        ),
+        dtype=float,
+        count=int(lengths.sum()),
+    )
+    positions = np.cumsum(steps)
+    positions -= np.repeat(positions[starts], segment_lengths)
+    value_mins = np.minimum.reduceat(positions, starts)
+    value_maxs = np.maximum.reduceat(positions, starts)
+    if (value_mins == value_maxs).any():
+        raise ZeroDivisionError("relative values of a node cannot have equal extremes")
+    value_ranges_array = np.array(
+        [[float(limit) for limit in value_range] for value_range in value_ranges]
+    ).reshape(-1, 2)
+    norm_mins, norm_maxs = value_ranges_array[:, 0], value_ranges_array[:, 1]
+    factors = (norm_maxs - norm_mins) / (value_maxs - value_mins)
+    values = np.repeat(norm_mins, segment_lengths) + (
+        positions - np.repeat(value_mins, segment_lengths)
+    ) * np.repeat(factors, segment_lengths)
+    grids = np.array([float(grid) if grid else 0.0 for grid in value_grids])
+    if grids.any():
+        # same rules as quantize.get_quantized_positions: ties to the smaller location and limited to the value range
+        segment_grids = np.repeat(np.where(grids > 0, grids, 1.0), segment_lengths)
+        scaled_values = values / segment_grids
+        first_indices = np.ceil(np.minimum.reduceat(scaled_values, starts))
+        last_indices = np.maximum(
+            first_indices, np.floor(np.maximum.reduceat(scaled_values, starts))
+        )
+        quantized_values = (
+            np.clip(
+                np.ceil(scaled_values - 0.5),
+                np.repeat(first_indices, segment_lengths),
+                np.repeat(last_indices, segment_lengths),
+            )
+            * segment_grids
+        )
+        values = np.where(
+            np.repeat(grids > 0, segment_lengths), quantized_values, values
+        )
+    return np.split(values, starts[1:])
+
+
+def get_relative_values_batch(
+    value_ranges: Sequence[tuple[ConvertibleToFraction, ConvertibleToFraction]],
+    directions: Sequence[Sequence[DirectionValueType]],
+    proportions: Sequence[Sequence[ConvertibleToFraction]],
+    value_grids: Optional[Sequence[Optional[ConvertibleToFraction]]] = None,
+    include_last_in_range: Optional[Sequence[bool]] = None,
+    exact: bool = True,
+) -> list[Any]:
+    """
+    Calculates the values of many :obj:`RelativeValueGenerator` at once without creating generators. Each argument is a
+    sequence with one entry per generator.
+
+    If ``exact`` is ``True`` values are calculated with :obj:`~fractions.Fraction` generator by generator and a list of
+    lists is returned. Otherwise numpy must be installed: all generators are concatenated and calculated in one
+    vectorized pass in floating point and a list of numpy arrays is returned.
+    :obj:`~musurgia.trees.musicaltree.RelativeTreeMidiGenerator` uses the exact mode, so that the midis of a tree do not
+    depend on numpy and floating point rounding.
+
+    :param value_ranges: value ranges
+    :param directions: lists of directions
+    :param proportions: lists of proportions
+    :param value_grids: value grids (``None``: no quantization)
+    :param include_last_in_range: include_last_midi_in_range flags (``None``: all ``False``)
+    :param exact: see above
+    :return: one list of values per generator
+
+    >>> get_relative_values_batch(value_ranges=[(60, 72), (0, 10)], directions=[[1, -1], [1, 1, 1]],
+    ...                           proportions=[[1, 3], [1, 2, 2]], value_grids=[1, None])
+    [[Fraction(68, 1), Fraction(72, 1), Fraction(60, 1)], [Fraction(0, 1), Fraction(2, 1), Fraction(6, 1), Fraction(10, 1)]]
+    """
+    number_of_generators = len(value_ranges)
+    if value_grids is None:
+        value_grids = [None] * number_of_generators
+    if include_last_in_range is None:
+        include_last_in_range = [False] * number_of_generators
+    if not (
+        len(directions)
+        == len(proportions)
+        == len(value_grids)
+        == len(include_last_in_range)
+        == number_of_generators
+    ):
+        raise ValueError(
+            "get_relative_values_batch: all arguments must have the same length"
+        )
+    if not exact:
+        if not number_of_generators:
+            return []
+        return _get_relative_values_array(
+            value_ranges, directions, proportions, value_grids, include_last_in_range
+        )
+    return [
+        _get_relative_values(*arguments)
+        for arguments in zip(
+            value_ranges, directions, proportions, value_grids, include_last_in_range
+        )
+    ]